@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Fuzzy transliteration search over the cuneiform sign library.
+
+A trigram index over the sign-name tokens (``KA``, ``GA2``, ``LAGAB`` ...) is
+built once from ``data/raw/cuneiform_unicode_library.json``; queries collect
+candidates from shared trigrams and rerank them with an edit distance in which
+phonetically close letters (C/K/G/Q, P/B/F, I/J/Y ...) are cheap to swap.
+
+Usage:
+  python cuneiform-alphabet-table/scripts/cuneiform_search.py KA
+  python cuneiform-alphabet-table/scripts/cuneiform_search.py CHA --limit 5 --max-distance 1.5
+  python cuneiform-alphabet-table/scripts/cuneiform_search.py --letter C
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+from select_cuneiform import _extract_tokens
+
+# Letters that transliterate the same (or nearly the same) sound; swapping two
+# letters of one class costs PHONETIC_COST instead of a full substitution.
+PHONETIC_CLASSES = ("CKGQ", "PBF", "TD", "IJY", "UVW", "SZ")
+PHONETIC_COST = 0.5
+
+# Structural words of composite names (see the operator grammar) are not transliterations.
+STRUCTURAL_TOKENS = frozenset({
+    "TIMES", "PLUS", "OVER", "CROSSING", "OPPOSING", "INVERTED", "ROTATED", "NINETY",
+    "DEGREES", "GUNU", "TENU", "SHESHIG", "NUTILLU", "SQUARED", "VARIANT", "FORM",
+})
+
+VOWELS = "AEIU"
+
+_PHONETIC = {a: cls for cls in PHONETIC_CLASSES for a in cls}
+
+
+def sub_cost(a: str, b: str) -> float:
+    if a == b:
+        return 0.0
+    cls = _PHONETIC.get(a)
+    return PHONETIC_COST if cls is not None and b in cls else 1.0
+
+
+def distance(a: str, b: str, limit: float = float("inf")) -> float:
+    """Phonetic-weighted Levenshtein distance; stops early once every cell exceeds ``limit``."""
+    if len(a) < len(b):
+        a, b = b, a
+    prev = [float(j) for j in range(len(b) + 1)]
+    for i, ca in enumerate(a, 1):
+        cur = [float(i)]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + sub_cost(ca, cb)))
+        if min(cur) > limit:
+            return min(cur)
+        prev = cur
+    return prev[-1]
+
+
+def trigrams(token: str) -> set[str]:
+    padded = f"$${token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class Match:
+    token: str
+    distance: float
+    signs: tuple[dict, ...]
+
+
+class TokenIndex:
+    """Trigram index over sign-name tokens, built once per library."""
+
+    def __init__(self, signs: list[dict]) -> None:
+        by_token: dict[str, list[dict]] = defaultdict(list)
+        for sign in signs:
+            if not sign["name"].startswith("CUNEIFORM SIGN "):
+                continue
+            for tok in dict.fromkeys(_extract_tokens(sign["name"])):
+                if tok not in STRUCTURAL_TOKENS:
+                    by_token[tok].append(sign)
+
+        self.tokens = sorted(by_token)
+        self.signs_by_token = {t: tuple(sorted(v, key=lambda s: (len(s["name"]), s["name"])))
+                               for t, v in by_token.items()}
+        self.grams: dict[str, list[int]] = defaultdict(list)
+        self.by_length: dict[int, list[int]] = defaultdict(list)
+        for tid, tok in enumerate(self.tokens):
+            for g in trigrams(tok):
+                self.grams[g].append(tid)
+            self.by_length[len(tok)].append(tid)
+
+    def search(self, query: str, limit: int = 10, max_distance: float | None = None) -> list[Match]:
+        q = query.strip().upper()
+        if not q:
+            return []
+        if max_distance is None:
+            max_distance = 1.0 + len(q) // 4
+
+        overlap: Counter[int] = Counter()
+        for g in trigrams(q):
+            for tid in self.grams.get(g, ()):
+                overlap[tid] += 1
+        # Short queries share few trigrams with their neighbours ("C" vs "K" share none),
+        # so also consider every token of a reachable length.
+        if len(q) <= 3:
+            for n in range(max(1, len(q) - int(max_distance)), len(q) + int(max_distance) + 1):
+                for tid in self.by_length.get(n, ()):
+                    overlap.setdefault(tid, 0)
+
+        scored = []
+        for tid, shared in overlap.items():
+            tok = self.tokens[tid]
+            if abs(len(tok) - len(q)) > max_distance:
+                continue
+            d = distance(q, tok, limit=max_distance)
+            if d <= max_distance:
+                scored.append((d, -shared, len(tok), tok))
+        scored.sort()
+        return [Match(tok, d, self.signs_by_token[tok]) for d, _, _, tok in scored[:limit]]
+
+    def fallback_tokens(self, letter: str) -> tuple[str, ...]:
+        """Phonetic stand-ins for ``letter``: tokens one cheap swap away from letter(+vowel)."""
+        found: dict[str, float] = {}
+        for q in (letter, *(letter + v for v in VOWELS)):
+            for m in self.search(q, limit=50, max_distance=PHONETIC_COST):
+                if m.distance > 0 and m.token.isalpha():
+                    found[m.token] = min(found.get(m.token, m.distance), m.distance)
+        return tuple(sorted(found, key=lambda t: (found[t], len(t), t)))
+
+
+def load_index(library: Path) -> TokenIndex:
+    return TokenIndex(json.loads(library.read_text(encoding="utf-8")))
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fuzzy search over cuneiform sign-name tokens.")
+    parser.add_argument("query", nargs="*", help="Transliteration(s) to look up, e.g. KA SHA.")
+    parser.add_argument("--letter", help="Show the phonetic fallback tokens for a Latin letter.")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--max-distance", type=float, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    if not args.query and not args.letter:
+        raise SystemExit("Pass a query and/or --letter")
+
+    library = Path(__file__).resolve().parents[1] / "data" / "raw" / "cuneiform_unicode_library.json"
+    if not library.exists():
+        raise SystemExit("Library missing. Run select_cuneiform.py --build-library first.")
+
+    t0 = time.perf_counter()
+    index = load_index(library)
+    built = time.perf_counter() - t0
+    print(f"[ok] index: {len(index.tokens)} tokens, {len(index.grams)} trigrams ({built * 1000:.1f} ms)")
+
+    if args.letter:
+        print(f"{args.letter.upper()}: {' '.join(index.fallback_tokens(args.letter.upper()))}")
+
+    for query in args.query:
+        t0 = time.perf_counter()
+        matches = index.search(query, limit=args.limit, max_distance=args.max_distance)
+        took = time.perf_counter() - t0
+        print(f"\n# {query.upper()}  ({len(matches)} matches, {took * 1000:.2f} ms)")
+        for m in matches:
+            sign = m.signs[0]
+            more = f" (+{len(m.signs) - 1})" if len(m.signs) > 1 else ""
+            print(f"{m.distance:4.1f}  {m.token:<10} {sign['char']}  {sign['codepoint']}  {sign['name']}{more}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,12 @@ Usage:
   python cuneiform-alphabet-table/scripts/select_cuneiform.py --build-library
   python cuneiform-alphabet-table/scripts/select_cuneiform.py --select
   python cuneiform-alphabet-table/scripts/select_cuneiform.py --build-library --select
+  python miohalo-alpha/scripts/miohalo.py select-cuneiform --metrics -- --select   # + run metrics
+
+Timing spans and counters go through ``miohalo-alpha/scripts/instrument.py``
+when it is importable, i.e. when the stage runs through ``miohalo.py`` (or with
+``miohalo-alpha/scripts`` on ``PYTHONPATH``); they are no-ops unless metrics are
+switched on.  Standalone, the selector does not depend on the miohalo tree.
 """
 
 from __future__ import annotations
@@ -13,10 +19,26 @@ import argparse
 import csv
 import json
 import re
+import sys
 import unicodedata
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable
+
+try:
+    import instrument           # miohalo-alpha/scripts, on sys.path when run through miohalo.py
+except ImportError:             # standalone: the same calls, recording nothing
+    from contextlib import nullcontext
+    from types import SimpleNamespace
+
+    def _noop(*args, **kwargs) -> None:
+        return None
+
+    instrument = SimpleNamespace(
+        run=lambda name: nullcontext(), span=lambda name: nullcontext(),
+        count=_noop, file_read=_noop, file_written=_noop, watch_cache=_noop,
+    )
 
 
 # Unicode blocks that contain cuneiform signs.
@@ -47,6 +69,19 @@ DISPLAY_SAFE_OVERRIDES: dict[str, str] = {
 }
 
 
+# Match stages, tried in this order by default: exact token, token prefix,
+# token contains the letter, fallback hint.
+STAGE_ORDER: tuple[int, ...] = (0, 1, 2, 3)
+STAGE_REASONS: dict[int, str] = {
+    0: "Exact token match.",
+    1: "Token-prefix match.",
+    2: "Token-contains-letter match.",
+    3: "Phonetic fallback token hint match.",
+}
+OVERRIDE_REASON = "Manual override for display-safe glyph compatibility."
+FILL_REASON = "Fallback fill to complete 26/26 coverage."
+
+
 @dataclass
 class Sign:
     char: str
@@ -91,46 +126,152 @@ def _score(name: str, token: str) -> tuple[int, int, str]:
     return (exact, len(name), name)
 
 
-def _extract_tokens(name: str) -> list[str]:
+@lru_cache(maxsize=None)
+def _extract_tokens(name: str) -> tuple[str, ...]:
     body = name.removeprefix("CUNEIFORM SIGN ")
-    return [t for t in re.split(r"[^A-Z0-9]+", body) if t]
-
-
-def _rank_candidates(signs: list[dict], letter: str) -> list[tuple[int, int, str, dict]]:
-    hints = FALLBACK_TOKEN_HINTS.get(letter, ())
-    ranked: list[tuple[int, int, str, dict]] = []
-
+    return tuple(t for t in re.split(r"[^A-Z0-9]+", body) if t)
+
+
+@lru_cache(maxsize=None)
+def _token_views(name: str) -> tuple[tuple[str, ...], str, str]:
+    """Tokens, plus " "-prefixed joins of the alphabetic and of all tokens.
+
+    Letters and hints never contain a space, so "token starts with X" is
+    ``" " + X in joined`` and "token contains X" is ``X in joined``.
+    """
+    tokens = _extract_tokens(name)
+    return tokens, " " + " ".join(t for t in tokens if t.isalpha()), " " + " ".join(tokens)
+
+
+def _matched_stages(name: str, letter: str, hints: tuple[str, ...]) -> tuple[int, ...]:
+    """Every stage whose test ``name`` passes for ``letter``, in STAGE_ORDER."""
+    tokens, alpha, everything = _token_views(name)
+    matched = []
+    if letter in tokens:
+        matched.append(0)
+    if " " + letter in alpha:
+        matched.append(1)
+    if letter in alpha:
+        matched.append(2)
+    if any(" " + hint in everything for hint in hints):
+        matched.append(3)
+    return tuple(matched)
+
+
+def _stage_candidates(
+    signs: list[dict],
+    letter: str,
+    hints: tuple[str, ...] | None = None,
+    complexity: Callable[[str], int] | None = None,
+) -> list[tuple[tuple[int, ...], int, int, str, dict]]:
+    """Signs matching ``letter`` in any stage as (matched stages, complexity, name length, name, sign).
+
+    Sorted by (complexity, name length, name), the order within a stage.
+    """
+    if hints is None:
+        hints = FALLBACK_TOKEN_HINTS.get(letter, ())
+    out = []
     for sign in signs:
         name = sign["name"]
         if not name.startswith("CUNEIFORM SIGN "):
             continue
-
-        tokens = _extract_tokens(name)
-
-        stage = None
-        if any(tok == letter for tok in tokens):
-            stage = 0
-        elif any(tok.startswith(letter) and tok.isalpha() for tok in tokens):
-            stage = 1
-        elif any(letter in tok and tok.isalpha() for tok in tokens):
-            stage = 2
-        elif hints and any(tok.startswith(hint) for hint in hints for tok in tokens):
-            stage = 3
-
-        if stage is None:
+        # Every stage needs the letter or a hint inside some token, hence inside the name.
+        body = name[15:]
+        if letter not in body and not (hints and any(hint in body for hint in hints)):
             continue
-
-        ranked.append((stage, len(name), name, sign))
-
-    return sorted(ranked)
-
-
-def select_for_letters(signs: list[dict]) -> dict[str, dict]:
+        matched = _matched_stages(name, letter, hints)
+        if matched:
+            out.append((matched, complexity(sign["codepoint"]) if complexity else 0, len(name), name, sign))
+    # Key stops at the name: equal names (e.g. in cycled benchmark inputs) must not compare dicts.
+    return sorted(out, key=lambda item: item[1:4])
+
+
+def _order_candidates(
+    candidates: list[tuple[tuple[int, ...], int, int, str, dict]],
+    stage_order: tuple[int, ...] = STAGE_ORDER,
+) -> list[tuple[int, int, int, str, dict]]:
+    """Give each candidate the first stage of ``stage_order`` it matches, best stage first.
+
+    Bucketing keeps ``_stage_candidates``' order within a stage, so no re-sort is needed.
+    """
+    first = {m: next((st for st in stage_order if st in m), None) for m in {c[0] for c in candidates}}
+    buckets: dict[int, list] = {stage: [] for stage in stage_order}
+    for c in candidates:
+        stage = first[c[0]]
+        if stage is not None:
+            buckets[stage].append((stage,) + c[1:])
+    return [item for stage in stage_order for item in buckets[stage]]
+
+
+def _rank_candidates(
+    signs: list[dict],
+    letter: str,
+    hints: tuple[str, ...] | None = None,
+    complexity: Callable[[str], int] | None = None,
+    stage_order: tuple[int, ...] = STAGE_ORDER,
+) -> list[tuple[int, int, int, str, dict]]:
+    """Rank signs for ``letter`` by (stage, structural complexity, name length, name).
+
+    ``complexity`` maps a codepoint to its operator-tree size (sign_structure.py);
+    without it every sign counts as 0 and the order is the original staged heuristic.
+    ``stage_order`` lists the stages to try, most preferred first; a sign gets the
+    first stage it matches, and stages left out are not tried at all.
+    """
+    return _order_candidates(_stage_candidates(signs, letter, hints, complexity), stage_order)
+
+
+def select_for_letters(
+    signs: list[dict],
+    fuzzy_fallback: bool = False,
+    prefer_simple: bool = False,
+    hints: dict[str, tuple[str, ...]] | None = None,
+    overrides: dict[str, str] | None = None,
+    stage_order: tuple[int, ...] = STAGE_ORDER,
+) -> dict[str, dict]:
+    """Pick one sign per letter.
+
+    ``fuzzy_fallback`` derives the stage-3 hints from the phonetic token search
+    (cuneiform_search.py) instead of FALLBACK_TOKEN_HINTS; ``prefer_simple`` ranks
+    structurally simpler signs (sign_structure.py) first within each stage.
+    ``hints``, ``overrides`` and ``stage_order`` replace FALLBACK_TOKEN_HINTS,
+    DISPLAY_SAFE_OVERRIDES and STAGE_ORDER (selection_sweep.py evaluates variants).
+    """
+    hints_by_letter: dict[str, tuple[str, ...] | None] = dict.fromkeys(LATIN_26)
+    if fuzzy_fallback:
+        from cuneiform_search import TokenIndex
+
+        index = TokenIndex(signs)
+        hints_by_letter = {letter: index.fallback_tokens(letter) for letter in LATIN_26}
+    elif hints is not None:
+        hints_by_letter = {letter: tuple(hints.get(letter, ())) for letter in LATIN_26}
+
+    complexity = None
+    if prefer_simple:
+        from sign_structure import StructureIndex
+
+        complexity = StructureIndex(signs).complexity
+
+    def rank(letter: str) -> list[tuple[int, int, int, str, dict]]:
+        return _rank_candidates(signs, letter, hints_by_letter[letter], complexity, stage_order)
+
+    return assign_letters(signs, rank, DISPLAY_SAFE_OVERRIDES if overrides is None else overrides)
+
+
+def assign_letters(
+    signs: list[dict],
+    rank: Callable[[str], list[tuple[int, int, int, str, dict]]],
+    overrides: dict[str, str],
+) -> dict[str, dict]:
+    """Apply ``overrides``, then give each remaining letter its best unused ranked sign.
+
+    Letters with the fewest candidates pick first; ``rank(letter)`` is
+    ``_rank_candidates`` with the caller's hints, complexity and stage order.
+    """
     selections: dict[str, dict] = {}
     used_codepoints: set[str] = set()
     signs_by_codepoint = {s["codepoint"]: s for s in signs if s["name"].startswith("CUNEIFORM SIGN ")}
 
-    for letter, codepoint in DISPLAY_SAFE_OVERRIDES.items():
+    for letter, codepoint in overrides.items():
         sign = signs_by_codepoint.get(codepoint)
         if not sign:
             continue
@@ -140,20 +281,16 @@ def select_for_letters(signs: list[dict]) -> dict[str, dict]:
             "char": sign["char"],
             "codepoint": sign["codepoint"],
             "name": sign["name"],
-            "reason": "Manual override for display-safe glyph compatibility.",
+            "reason": OVERRIDE_REASON,
         }
         used_codepoints.add(sign["codepoint"])
 
-    ranked_by_letter = {
-        letter: _rank_candidates(signs, letter)
-        for letter in LATIN_26
-        if letter not in selections
-    }
+    ranked_by_letter = {letter: rank(letter) for letter in LATIN_26 if letter not in selections}
     letter_order = sorted(ranked_by_letter, key=lambda letter: len(ranked_by_letter[letter]))
 
     for letter in letter_order:
         ranked = ranked_by_letter[letter]
-        chosen = next((item for item in ranked if item[3]["codepoint"] not in used_codepoints), None)
+        chosen = next((item for item in ranked if item[-1]["codepoint"] not in used_codepoints), None)
         if chosen is None and ranked:
             chosen = ranked[0]
 
@@ -173,26 +310,19 @@ def select_for_letters(signs: list[dict]) -> dict[str, dict]:
                 "char": forced["char"],
                 "codepoint": forced["codepoint"],
                 "name": forced["name"],
-                "reason": "Fallback fill to complete 26/26 coverage.",
+                "reason": FILL_REASON,
             }
             used_codepoints.add(forced["codepoint"])
             continue
 
-        stage, _, _, sign = chosen
-        stage_reason = {
-            0: "Exact token match.",
-            1: "Token-prefix match.",
-            2: "Token-contains-letter match.",
-            3: "Phonetic fallback token hint match.",
-        }[stage]
-
+        stage, *_, sign = chosen
         selections[letter] = {
             "letter": letter,
             "status": "selected",
             "char": sign["char"],
             "codepoint": sign["codepoint"],
             "name": sign["name"],
-            "reason": f"Auto-picked by staged heuristic. {stage_reason}",
+            "reason": f"Auto-picked by staged heuristic. {STAGE_REASONS[stage]}",
         }
         used_codepoints.add(sign["codepoint"])
 
@@ -230,6 +360,16 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Build cuneiform library and select A-Z candidates.")
     parser.add_argument("--build-library", action="store_true", help="Extract Unicode cuneiform signs to data/raw.")
     parser.add_argument("--select", action="store_true", help="Generate A-Z candidate selections to data/processed.")
+    parser.add_argument(
+        "--fuzzy-fallback",
+        action="store_true",
+        help="Use phonetic fuzzy token search for the fallback stage instead of the fixed hint tuples.",
+    )
+    parser.add_argument(
+        "--prefer-simple",
+        action="store_true",
+        help="Within each match stage, prefer structurally simple (non-composite) signs.",
+    )
     return parser.parse_args()
 
 
@@ -237,27 +377,45 @@ def main() -> None:
     args = parse_args()
     if not args.build_library and not args.select:
         raise SystemExit("Please pass --build-library and/or --select")
+    with instrument.run("select-cuneiform"):
+        _main(args)
 
+
+def _main(args: argparse.Namespace) -> None:
     root = Path(__file__).resolve().parents[1]
     raw_json = root / "data" / "raw" / "cuneiform_unicode_library.json"
     raw_csv = root / "data" / "raw" / "cuneiform_unicode_library.csv"
 
     signs: list[dict]
     if args.build_library:
-        signs = build_library(raw_json=raw_json, raw_csv=raw_csv)
+        with instrument.span("library.build"):
+            signs = build_library(raw_json=raw_json, raw_csv=raw_csv)
+        for p in (raw_json, raw_csv):
+            instrument.file_written(p.name, p)
         print(f"[ok] library built: {len(signs)} signs")
     else:
         if not raw_json.exists():
             raise SystemExit("Library missing. Run with --build-library first.")
-        signs = json.loads(raw_json.read_text(encoding="utf-8"))
+        with instrument.span("library.load"):
+            signs = json.loads(raw_json.read_text(encoding="utf-8"))
+        instrument.file_read(raw_json.name, raw_json)
+    instrument.count("signs", len(signs))
 
     if args.select:
-        selection = select_for_letters(signs)
+        instrument.watch_cache("_extract_tokens", _extract_tokens)
+        with instrument.span("select"):
+            selection = select_for_letters(
+                signs, fuzzy_fallback=args.fuzzy_fallback, prefer_simple=args.prefer_simple
+            )
         out_json = root / "data" / "processed" / "az_cuneiform_selection.json"
         out_csv = root / "data" / "processed" / "az_cuneiform_selection.csv"
         out_md = root / "data" / "processed" / "az_cuneiform_selection.md"
-        write_selection_outputs(selection, out_json, out_csv, out_md)
+        with instrument.span("write"):
+            write_selection_outputs(selection, out_json, out_csv, out_md)
+        for p in (out_json, out_csv, out_md):
+            instrument.file_written(p.name, p)
         selected = sum(1 for v in selection.values() if v["status"] == "selected")
+        instrument.count("selected", selected)
         print(f"[ok] A-Z selection generated: {selected}/26 letters matched")
 
 
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""Evaluate many A-Z selector configurations at once (what-if sweeps).
+
+Trying another ``FALLBACK_TOKEN_HINTS``, ``DISPLAY_SAFE_OVERRIDES`` or stage
+order used to mean editing ``select_cuneiform.py`` and rerunning it.  Here each
+variant is one JSON object (a JSON list or JSON Lines file):
+
+  {"name": "c-as-ka",      "hints": {"C": ["KA"]}}
+  {"name": "no-x-override", "overrides": {"X": null}}
+  {"name": "hints-first",  "stage_order": [3, 0, 1, 2], "prefer_simple": true}
+
+``hints`` and ``overrides`` are merged into the selector's defaults (``null``
+drops a letter), ``stage_order`` lists the match stages to try (0 exact token,
+1 token prefix, 2 token contains, 3 fallback hint; left-out stages are not
+tried), ``prefer_simple`` / ``fuzzy_fallback`` are the selector's flags.
+
+Variants run across a process pool.  Each worker loads the library once and
+memoizes the selector's two ranking halves: which stages each sign matches,
+per (letter, hints, simple), and the ordering per stage order.  A variant that
+changes one letter's hints re-matches one letter, a new stage order only
+re-buckets, and just the greedy assignment (``assign_letters``) runs for every
+variant.  The report gives each variant's A-Z table, per-letter match stage,
+total cost and the letters that differ from ``az_cuneiform_selection.json``.
+
+Cost per letter: its match stage (0-3), 0 for an override, FILL_COST for the
+last-resort fill, plus DUPLICATE_COST when the sign is already used by another
+letter.
+
+Usage:
+  python cuneiform-alphabet-table/scripts/selection_sweep.py generate variants.jsonl
+  python cuneiform-alphabet-table/scripts/selection_sweep.py run variants.jsonl --workers 4 --out sweep.jsonl
+  python cuneiform-alphabet-table/scripts/selection_sweep.py run variants.jsonl --top 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+from select_cuneiform import (
+    DISPLAY_SAFE_OVERRIDES,
+    FALLBACK_TOKEN_HINTS,
+    FILL_REASON,
+    LATIN_26,
+    OVERRIDE_REASON,
+    STAGE_ORDER,
+    STAGE_REASONS,
+    _order_candidates,
+    _stage_candidates,
+    assign_letters,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+LIBRARY_JSON = ROOT / "data" / "raw" / "cuneiform_unicode_library.json"
+CURRENT_JSON = ROOT / "data" / "processed" / "az_cuneiform_selection.json"
+
+FILL_COST = 4
+DUPLICATE_COST = 5
+TOP = 20
+VARIANT_KEYS = {"name", "hints", "overrides", "stage_order", "prefer_simple", "fuzzy_fallback"}
+
+
+# ——— variants ———
+
+def _merge(base: dict, changes: dict | None, name: str, what: str) -> dict:
+    merged = dict(base)
+    for letter, value in (changes or {}).items():
+        if letter not in LATIN_26:
+            raise SystemExit(f"variant {name!r}: {what} key {letter!r} is not a letter A-Z")
+        if value is None:
+            merged.pop(letter, None)
+        else:
+            merged[letter] = value
+    return merged
+
+
+def normalize_variant(raw: dict, index: int, codepoints: set[str]) -> dict:
+    """Validate one variant and resolve it against the selector's defaults.
+
+    ``codepoints`` holds the library's ``U+XXXX`` strings that overrides may name.
+    """
+    name = str(raw.get("name") or f"variant-{index}")
+    unknown = set(raw) - VARIANT_KEYS
+    if unknown:
+        raise SystemExit(f"variant {name!r}: unknown keys {sorted(unknown)}")
+    order = tuple(raw.get("stage_order") or STAGE_ORDER)
+    if len(set(order)) != len(order) or not set(order) <= set(STAGE_REASONS):
+        raise SystemExit(f"variant {name!r}: stage_order must list distinct stages from {sorted(STAGE_REASONS)}")
+    for letter, tokens in (raw.get("hints") or {}).items():
+        # A bare string would otherwise be split into one-character tokens, an empty one match every sign.
+        if tokens is not None and not (isinstance(tokens, list)
+                                       and all(isinstance(t, str) and t.strip() for t in tokens)):
+            raise SystemExit(f"variant {name!r}: hints for {letter!r} must be a list of non-empty strings (or null)")
+    for letter, codepoint in (raw.get("overrides") or {}).items():
+        if codepoint is not None and not (isinstance(codepoint, str) and codepoint in codepoints):
+            raise SystemExit(f"variant {name!r}: override for {letter!r} must be a U+XXXX code point "
+                             f"in the library (or null), got {codepoint!r}")
+    hints = _merge(FALLBACK_TOKEN_HINTS, raw.get("hints"), name, "hints")
+    return {
+        "name": name,
+        "hints": {letter: tuple(h.upper() for h in tokens) for letter, tokens in hints.items()},
+        "overrides": _merge(DISPLAY_SAFE_OVERRIDES, raw.get("overrides"), name, "overrides"),
+        "stage_order": order,
+        "prefer_simple": bool(raw.get("prefer_simple", False)),
+        "fuzzy_fallback": bool(raw.get("fuzzy_fallback", False)),
+    }
+
+
+def load_variants(path: Path, codepoints: set[str]) -> list[dict]:
+    text = path.read_text(encoding="utf-8").strip()
+    if text.startswith("["):
+        raw = json.loads(text)
+    else:
+        raw = [json.loads(line) for line in text.splitlines() if line.strip() and not line.lstrip().startswith("#")]
+    return [normalize_variant(r, i, codepoints) for i, r in enumerate(raw)]
+
+
+def generate_variants() -> list[dict]:
+    """A standard sweep: every stage order, hint and override ablations, fuzzy hints."""
+    out: list[dict] = [{"name": "baseline"}]
+    for simple in (False, True):
+        for r in (3, 4):
+            for order in itertools.permutations(STAGE_ORDER, r):
+                out.append({"name": f"order-{''.join(map(str, order))}{'-simple' if simple else ''}",
+                            "stage_order": list(order), "prefer_simple": simple})
+    for letter in DISPLAY_SAFE_OVERRIDES:
+        out.append({"name": f"no-override-{letter}", "overrides": {letter: None}})
+    out.append({"name": "no-overrides", "overrides": dict.fromkeys(DISPLAY_SAFE_OVERRIDES)})
+    for letter, hints in FALLBACK_TOKEN_HINTS.items():
+        out.append({"name": f"no-hints-{letter}", "hints": {letter: None}})
+        for hint in hints:
+            for simple in (False, True):
+                out.append({"name": f"hint-{letter}-{hint}{'-simple' if simple else ''}",
+                            "hints": {letter: [hint]}, "prefer_simple": simple})
+    for simple in (False, True):
+        out.append({"name": f"fuzzy{'-simple' if simple else ''}", "fuzzy_fallback": True, "prefer_simple": simple})
+    return out
+
+
+# ——— worker ———
+
+_signs: list[dict] = []
+_complexity = None
+_fuzzy_hints: dict[str, tuple[str, ...]] | None = None
+_candidates: dict[tuple, list] = {}
+_ranks: dict[tuple, list] = {}
+
+
+def _init_worker(library: str) -> None:
+    global _complexity, _fuzzy_hints
+    _signs[:] = json.loads(Path(library).read_text(encoding="utf-8"))
+    _complexity = _fuzzy_hints = None
+    _candidates.clear()
+    _ranks.clear()
+
+
+def _structure_complexity():
+    global _complexity
+    if _complexity is None:
+        from sign_structure import StructureIndex
+
+        _complexity = StructureIndex(_signs).complexity
+    return _complexity
+
+
+def _fuzzy() -> dict[str, tuple[str, ...]]:
+    global _fuzzy_hints
+    if _fuzzy_hints is None:
+        from cuneiform_search import TokenIndex
+
+        index = TokenIndex(_signs)
+        _fuzzy_hints = {letter: tuple(index.fallback_tokens(letter)) for letter in LATIN_26}
+    return _fuzzy_hints
+
+
+def _rank(letter: str, hints: tuple[str, ...], order: tuple[int, ...], simple: bool) -> list:
+    """``_rank_candidates``, memoized: the stage matching is shared by every stage order."""
+    key = (letter, hints, simple)
+    ranked = _ranks.get((key, order))
+    if ranked is None:
+        candidates = _candidates.get(key)
+        if candidates is None:
+            complexity = _structure_complexity() if simple else None
+            candidates = _candidates[key] = _stage_candidates(_signs, letter, hints, complexity)
+        ranked = _ranks[(key, order)] = _order_candidates(candidates, order)
+    return ranked
+
+
+def _letter_stage(reason: str) -> int | str:
+    if reason == OVERRIDE_REASON:
+        return "override"
+    if reason == FILL_REASON:
+        return "fill"
+    return next(stage for stage, text in STAGE_REASONS.items() if reason.endswith(text))
+
+
+def evaluate(variant: dict) -> dict:
+    hints = _fuzzy() if variant["fuzzy_fallback"] else variant["hints"]
+    order, simple = variant["stage_order"], variant["prefer_simple"]
+    selection = assign_letters(
+        _signs, lambda letter: _rank(letter, tuple(hints.get(letter, ())), order, simple), variant["overrides"]
+    )
+    stages, cost, seen = {}, 0, set()
+    for letter in LATIN_26:
+        row = selection[letter]
+        stage = stages[letter] = _letter_stage(row["reason"])
+        cost += FILL_COST if stage == "fill" else 0 if stage == "override" else stage
+        if row["codepoint"] in seen:
+            cost += DUPLICATE_COST
+        seen.add(row["codepoint"])
+    return {
+        "name": variant["name"],
+        "cost": cost,
+        "glyphs": "".join(selection[letter]["char"] for letter in LATIN_26),
+        "table": {letter: selection[letter]["codepoint"] for letter in LATIN_26},
+        "stages": stages,
+        "duplicates": len(LATIN_26) - len(seen),
+    }
+
+
+# ——— sweep ———
+
+def sweep(variants: list[dict], workers: int, library: Path = LIBRARY_JSON) -> list[dict]:
+    if workers <= 1:
+        _init_worker(str(library))
+        return [evaluate(v) for v in variants]
+    chunk = max(1, math.ceil(len(variants) / (workers * 4)))
+    with Pool(workers, initializer=_init_worker, initargs=(str(library),)) as pool:
+        return pool.map(evaluate, variants, chunksize=chunk)
+
+
+def diff_rows(rows: list[dict], current: dict[str, str]) -> None:
+    for row in rows:
+        row["changed"] = {letter: [current.get(letter), cp] for letter, cp in row["table"].items()
+                          if current.get(letter) != cp}
+
+
+def report_lines(rows: list[dict], top: int) -> list[str]:
+    ranked = sorted(rows, key=lambda r: (r["cost"], len(r["changed"]), r["name"]))
+    lines = [f"{'cost':>4} {'diff':>4}  {'A-Z':<26}  variant / changes (letter: stage, new sign)"]
+    for row in ranked[:top]:
+        changes = " ".join(f"{letter}:{row['stages'][letter]}:{chr(int(cp[2:], 16))}"
+                           for letter, (_, cp) in row["changed"].items())
+        lines.append(f"{row['cost']:>4} {len(row['changed']):>4}  {row['glyphs']}  {row['name']}  {changes}".rstrip())
+    return lines
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Evaluate A-Z selector configuration variants in parallel.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("run", help="Evaluate a variants file (JSON list or JSON Lines).")
+    p.add_argument("variants", type=Path)
+    p.add_argument("--workers", type=int, default=0, help="Processes (0 = one per CPU).")
+    p.add_argument("--out", type=Path, help="Write every variant's full result as JSON Lines.")
+    p.add_argument("--top", type=int, default=TOP, help="Variants shown, cheapest first.")
+    p.add_argument("--current", type=Path, default=CURRENT_JSON, help="Selection the diffs are taken against.")
+    p = sub.add_parser("generate", help="Write the standard sweep (stage orders, hint/override ablations).")
+    p.add_argument("out", type=Path)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.command == "generate":
+        variants = generate_variants()
+        args.out.write_text("".join(json.dumps(v) + "\n" for v in variants), encoding="utf-8")
+        print(f"[ok] {len(variants)} variants → {args.out}")
+        return 0
+
+    if not LIBRARY_JSON.exists():
+        raise SystemExit("Library missing. Run select_cuneiform.py --build-library first.")
+    codepoints = {sign["codepoint"] for sign in json.loads(LIBRARY_JSON.read_text(encoding="utf-8"))}
+    variants = load_variants(args.variants, codepoints)
+    current = {}
+    if args.current.exists():
+        current = {r["letter"]: r["codepoint"] for r in json.loads(args.current.read_text(encoding="utf-8"))}
+
+    workers = args.workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    rows = sweep(variants, min(workers, len(variants)))
+    took = time.perf_counter() - t0
+    diff_rows(rows, current)
+
+    print("\n".join(report_lines(rows, args.top)))
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        with args.out.open("w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        print(f"[ok] results → {args.out}")
+    unchanged = sum(1 for r in rows if not r["changed"])
+    print(f"[ok] {len(rows)} variants in {took:.2f} s with {workers} worker(s) "
+          f"({len(rows) / took:.0f} variants/s); {unchanged} match the current selection")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""Parse composite cuneiform sign names into operator trees and index them.
+
+Unicode names encode how a sign is built: ``KA TIMES HI`` (HI written inside
+KA), ``BU CROSSING BU``, ``GAD OVER GAD``, ``TA GUNU``, ``NU11 ROTATED NINETY
+DEGREES`` ... ``_extract_tokens`` flattens these; here each name becomes a
+``SignNode`` tree.  Precedence, loosest first:
+
+  sequence   := opposing+                       # juxtaposition, e.g. "U GUD"
+  opposing   := over ((OPPOSING | CROSSING) over)*
+  over       := plus (OVER plus)*
+  plus       := times (PLUS times)*
+  times      := unary (TIMES plus)?             # "GA2 TIMES BAR PLUS RA" = GA2 x (BAR + RA)
+  unary      := INVERTED? SIGN postfix*         # GUNU, TENU, SHESHIG, SQUARED, ROTATED ... DEGREES
+
+Usage:
+  python cuneiform-alphabet-table/scripts/sign_structure.py parse "KA TIMES HI TIMES ASH2"
+  python cuneiform-alphabet-table/scripts/sign_structure.py query --component KA
+  python cuneiform-alphabet-table/scripts/sign_structure.py query --simple
+  python cuneiform-alphabet-table/scripts/sign_structure.py stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+BINARY_LEVELS = (("OPPOSING", "CROSSING"), ("OVER",), ("PLUS",))
+POSTFIX_MODIFIERS = ("GUNU", "TENU", "SHESHIG", "NUTILLU", "SQUARED", "INVERTED", "REVERSED",
+                     "ASTERISK", "ELAMITE")
+NUMBER_WORDS = {"ONE": 1, "TWO": 2, "THREE": 3, "FOUR": 4, "FIVE": 5, "SIX": 6,
+                "SEVEN": 7, "EIGHT": 8, "NINE": 9, "SEVENTY": 70, "EIGHTY": 80,
+                "NINETY": 90, "HUNDRED": 100}
+OPERATOR_WORDS = frozenset({"TIMES", "PLUS", "OVER", "OPPOSING", "CROSSING"})
+
+INDEXED_SIGN = re.compile(r"^([A-Z]+?)(\d+)$")
+
+
+@dataclass(frozen=True)
+class SignNode:
+    op: str                                   # SIGN (leaf) | TIMES | PLUS | OVER | OPPOSING | CROSSING | SEQ
+    token: str = ""                           # leaf token as written, e.g. NU11 or LAK-079
+    base: str = ""                            # leaf base without numeric index, e.g. NU
+    index: int | None = None                  # numeric index, e.g. 11
+    modifiers: tuple[str, ...] = ()           # GUNU, TENU, SQUARED, VARIANT FORM, THREE TIMES ...
+    rotation: int = 0                         # degrees
+    operands: tuple["SignNode", ...] = ()
+
+    @property
+    def is_simple(self) -> bool:
+        return self.op == "SIGN" and not self.modifiers and not self.rotation
+
+    def leaves(self):
+        if self.op == "SIGN":
+            yield self
+        for child in self.operands:
+            yield from child.leaves()
+
+    def complexity(self) -> int:
+        """Node count plus modifiers; 1 for a simple sign."""
+        own = 1 + len(self.modifiers) + (1 if self.rotation else 0)
+        return own + sum(child.complexity() for child in self.operands)
+
+    def render(self) -> str:
+        if self.op == "SIGN":
+            text = self.token
+            if self.modifiers:
+                text += " " + " ".join(self.modifiers)
+            if self.rotation:
+                text += f" @{self.rotation}"
+            return text
+        sep = " " if self.op == "SEQ" else f" {self.op} "
+        return "(" + sep.join(child.render() for child in self.operands) + ")"
+
+
+def _leaf(token: str) -> SignNode:
+    m = INDEXED_SIGN.match(token)
+    if m:
+        return SignNode("SIGN", token=token, base=m.group(1), index=int(m.group(2)))
+    return SignNode("SIGN", token=token, base=token)
+
+
+class _Parser:
+    def __init__(self, tokens: list[str]) -> None:
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self, offset: int = 0) -> str | None:
+        i = self.pos + offset
+        return self.tokens[i] if i < len(self.tokens) else None
+
+    def take(self) -> str:
+        tok = self.tokens[self.pos]
+        self.pos += 1
+        return tok
+
+    def parse(self) -> SignNode:
+        parts = [self.binary(0)]
+        while self.peek() is not None:
+            parts.append(self.binary(0))
+        return parts[0] if len(parts) == 1 else SignNode("SEQ", operands=tuple(parts))
+
+    def binary(self, level: int) -> SignNode:
+        if level == len(BINARY_LEVELS):
+            return self.times()
+        ops = BINARY_LEVELS[level]
+        left = self.binary(level + 1)
+        while self.peek() in ops:
+            op = self.take()
+            right = self.binary(level + 1)
+            left = SignNode(op, operands=(left, right))
+        return left
+
+    def times(self) -> SignNode:
+        left = self.unary()
+        if self.peek() == "TIMES":
+            self.take()
+            right = self.binary(len(BINARY_LEVELS) - 1)  # the content swallows a PLUS chain
+            return SignNode("TIMES", operands=(left, right))
+        return left
+
+    def unary(self) -> SignNode:
+        prefix = []
+        if self.peek() == "INVERTED":
+            prefix.append(self.take())
+        if self.peek() in NUMBER_WORDS and self.peek(1) not in (None, *OPERATOR_WORDS):
+            prefix.append(self.take())  # "TUM TIMES THREE DISH": a counted sign
+        tok = self.peek()
+        if tok is None or tok in OPERATOR_WORDS:
+            raise ValueError(f"expected a sign at position {self.pos}: {' '.join(self.tokens)}")
+        node = _leaf(self.take())
+        modifiers, rotation = list(prefix), 0
+        while True:
+            tok = self.peek()
+            if tok in POSTFIX_MODIFIERS:
+                modifiers.append(self.take())
+            elif tok == "ROTATED":
+                self.take()
+                degrees = 0
+                while self.peek() in NUMBER_WORDS:
+                    value = NUMBER_WORDS[self.take()]
+                    degrees = degrees * value if value == 100 else degrees + value
+                if self.peek() == "DEGREES":
+                    self.take()
+                rotation = degrees
+            elif (tok, self.peek(1)) in (("VARIANT", "FORM"), ("AT", "LEFT"), ("AT", "RIGHT")):
+                modifiers.append(f"{self.take()} {self.take()}")
+            elif tok in NUMBER_WORDS and self.peek(1) == "TIMES" and self.peek(2) in (None, *OPERATOR_WORDS):
+                # "AN THREE TIMES": the sign written three times, not an infix TIMES.
+                modifiers.append(f"{self.take()} {self.take()}")
+            else:
+                break
+        return SignNode("SIGN", token=node.token, base=node.base, index=node.index,
+                        modifiers=tuple(modifiers), rotation=rotation)
+
+
+def tokenize(name: str) -> list[str]:
+    body = name.removeprefix("CUNEIFORM SIGN ")
+    return [t for t in body.split() if t]
+
+
+def parse_name(name: str) -> SignNode:
+    tokens = tokenize(name)
+    if not tokens:
+        raise ValueError(f"empty sign name: {name!r}")
+    return _Parser(tokens).parse()
+
+
+class StructureIndex:
+    """Operator trees for every ``CUNEIFORM SIGN`` name with set-valued lookups.
+
+    All query methods are dictionary lookups returning precomputed frozensets of
+    code points (``U+xxxxx`` strings, matching the library).
+    """
+
+    def __init__(self, signs: list[dict]) -> None:
+        self.trees: dict[str, SignNode] = {}
+        self.unparsed: dict[str, str] = {}
+        by_component: dict[str, set[str]] = defaultdict(set)
+        by_operator: dict[str, set[str]] = defaultdict(set)
+        by_modifier: dict[str, set[str]] = defaultdict(set)
+        simple: set[str] = set()
+
+        for sign in signs:
+            name, cp = sign["name"], sign["codepoint"]
+            if not name.startswith("CUNEIFORM SIGN "):
+                continue
+            try:
+                tree = parse_name(name)
+            except ValueError as e:
+                self.unparsed[cp] = str(e)
+                continue
+            self.trees[cp] = tree
+            if tree.is_simple:
+                simple.add(cp)
+            stack = [tree]
+            while stack:
+                node = stack.pop()
+                if node.op == "SIGN":
+                    by_component[node.token].add(cp)
+                    by_component[node.base].add(cp)
+                    for mod in node.modifiers:
+                        by_modifier[mod].add(cp)
+                    if node.rotation:
+                        by_modifier["ROTATED"].add(cp)
+                else:
+                    by_operator[node.op].add(cp)
+                stack.extend(node.operands)
+
+        self._components = {k: frozenset(v) for k, v in by_component.items()}
+        self._operators = {k: frozenset(v) for k, v in by_operator.items()}
+        self._modifiers = {k: frozenset(v) for k, v in by_modifier.items()}
+        self._simple = frozenset(simple)
+        self._complexity = {cp: tree.complexity() for cp, tree in self.trees.items()}
+
+    def simple(self) -> frozenset[str]:
+        return self._simple
+
+    def built_from(self, component: str) -> frozenset[str]:
+        """Signs with ``component`` (token like KA2, or base like KA) anywhere in their tree."""
+        return self._components.get(component.upper(), frozenset())
+
+    def with_operator(self, op: str) -> frozenset[str]:
+        return self._operators.get(op.upper(), frozenset())
+
+    def with_modifier(self, modifier: str) -> frozenset[str]:
+        return self._modifiers.get(modifier.upper(), frozenset())
+
+    def complexity(self, codepoint: str) -> int:
+        return self._complexity.get(codepoint, 1)
+
+
+def load_index(library: Path) -> StructureIndex:
+    return StructureIndex(json.loads(library.read_text(encoding="utf-8")))
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Structural parser/index for cuneiform sign names.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("parse", help="Print the operator tree of one or more names.")
+    p.add_argument("names", nargs="+")
+
+    p = sub.add_parser("query", help="Look up signs by structure (filters intersect).")
+    p.add_argument("--component", action="append", default=[], help="Built from this sign (repeatable).")
+    p.add_argument("--operator", action="append", default=[], help="Uses this operator (TIMES, OVER ...).")
+    p.add_argument("--modifier", action="append", default=[], help="Carries this modifier (GUNU ...).")
+    p.add_argument("--simple", action="store_true", help="Only simple, non-composite signs.")
+
+    sub.add_parser("stats", help="Summarise the parsed library.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    if args.command == "parse":
+        for name in args.names:
+            try:
+                tree = parse_name(name)
+            except ValueError as e:
+                raise SystemExit(f"[error] {e}")
+            print(f"{name}\n  {tree.render()}  (complexity {tree.complexity()})")
+        return
+
+    library = Path(__file__).resolve().parents[1] / "data" / "raw" / "cuneiform_unicode_library.json"
+    if not library.exists():
+        raise SystemExit("Library missing. Run select_cuneiform.py --build-library first.")
+    signs = json.loads(library.read_text(encoding="utf-8"))
+    index = StructureIndex(signs)
+
+    if args.command == "stats":
+        ops = Counter({op: len(v) for op, v in index._operators.items()})
+        print(f"[ok] parsed {len(index.trees)} names, {len(index.unparsed)} unparsed, {len(index.simple())} simple")
+        print("operators:", ", ".join(f"{k}={v}" for k, v in ops.most_common()))
+        for cp, err in index.unparsed.items():
+            print(f"  ! {cp}: {err}")
+        return
+
+    result: frozenset[str] | None = index.simple() if args.simple else None
+    filters = [index.built_from(c) for c in args.component]
+    filters += [index.with_operator(o) for o in args.operator]
+    filters += [index.with_modifier(m) for m in args.modifier]
+    for f in filters:
+        result = f if result is None else result & f
+    if result is None:
+        raise SystemExit("Pass at least one filter")
+
+    by_cp = {s["codepoint"]: s for s in signs}
+    for cp in sorted(result):
+        print(f"{by_cp[cp]['char']}  {cp}  {by_cp[cp]['name']}  →  {index.trees[cp].render()}")
+    print(f"[ok] {len(result)} signs")
+
+
+if __name__ == "__main__":
+    main()
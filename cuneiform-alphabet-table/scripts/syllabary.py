@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""Syllabic compression alphabet: frequent Latin n-grams as single cuneiform signs.
+
+The A-Z table spends one astral-plane sign per Latin letter.  The library also
+has many CV/VC/CVC syllable signs (``BA``, ``KI``, ``SHA``, ``GAL`` ...), so this
+extension counts letter bigrams and trigrams in a local corpus, keeps those a
+sign matches by token (``_rank_candidates``, the selector's staged matching;
+exact tokens only by default, plain signs only -- no ``KA TIMES PA``
+composites), and assigns each the best-ranked sign not used yet, in order of
+letters saved (count x (n - 1)).  The result is the A-Z table
+plus up to ``--size`` syllables.
+
+Encoding folds case and is greedy longest-match: one regex pass replaces the
+syllables (trie-shaped alternation, so each position looks at most three
+letters ahead), then one ``str.translate`` pass writes the remaining letters.
+Every sign decodes to exactly one n-gram, so decoding is a single translate.
+
+Usage:
+  python cuneiform-alphabet-table/scripts/syllabary.py build                       # corpus: the repo's *.md and *.py
+  python cuneiform-alphabet-table/scripts/syllabary.py build --corpus notes/ --size 96 --max-stage 1
+  python cuneiform-alphabet-table/scripts/syllabary.py report --corpus README.md
+  echo "the shaman binds the rune" | python cuneiform-alphabet-table/scripts/syllabary.py encode
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import string
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from select_cuneiform import LATIN_26, _extract_tokens, _rank_candidates
+from sign_structure import StructureIndex
+
+ROOT = Path(__file__).resolve().parents[1]
+LIBRARY_JSON = ROOT / "data" / "raw" / "cuneiform_unicode_library.json"
+AZ_JSON = ROOT / "data" / "processed" / "az_cuneiform_selection.json"
+OUT_JSON = ROOT / "data" / "processed" / "syllabary.json"
+OUT_MD = ROOT / "data" / "processed" / "syllabary.md"
+
+NGRAM_SIZES = (2, 3)
+SIZE = 64
+MAX_STAGE = 0
+MIN_COUNT = 3
+MAX_COMPLEXITY = 1        # operator-tree size: 1 = a plain sign, not a composite like KA TIMES PA
+CORPUS_GLOBS = ("*.md", "*.py")
+SKIP_DIRS = {".git", "node_modules", "__pycache__", ".next", "data"}
+PASSTHROUGH = string.whitespace + string.digits + string.punctuation
+
+STAGE_REASONS = {
+    0: "Exact token match.",
+    1: "Token-prefix match.",
+    2: "Token-contains-syllable match.",
+}
+
+_WORD = re.compile(r"[A-Z]+")
+
+
+# ——— corpus ———
+
+def corpus_files(paths: list[Path], globs: tuple[str, ...] = CORPUS_GLOBS) -> list[Path]:
+    files = []
+    for path in paths:
+        if path.is_file():
+            files.append(path)
+            continue
+        for pattern in globs:
+            files += [p for p in path.rglob(pattern) if not SKIP_DIRS & set(p.relative_to(path).parts[:-1])]
+    return sorted(set(files))
+
+
+def normalize(text: str) -> str:
+    """Upper-case A-Z words separated by single spaces (everything else dropped)."""
+    return " ".join(_WORD.findall(text.upper()))
+
+
+def count_ngrams(words_text: str, sizes: tuple[int, ...] = NGRAM_SIZES) -> Counter:
+    counts: Counter = Counter()
+    for word in words_text.split():
+        for n in sizes:
+            for i in range(len(word) - n + 1):
+                counts[word[i:i + n]] += 1
+    return counts
+
+
+# ——— selection ———
+
+def select_syllables(
+    signs: list[dict],
+    counts: Counter,
+    used_codepoints: set[str],
+    size: int = SIZE,
+    max_stage: int = MAX_STAGE,
+    min_count: int = MIN_COUNT,
+    max_complexity: int = MAX_COMPLEXITY,
+) -> list[dict]:
+    """Assign signs to the n-grams that save the most letters; one sign per n-gram.
+
+    Within a match stage simpler signs rank first (``sign_structure`` complexity),
+    and signs above ``max_complexity`` are skipped.
+    """
+    used = set(used_codepoints)
+    complexity = StructureIndex(signs).complexity
+    # Cheap pre-check so only n-grams some sign token can match reach the full ranking.
+    tokens = {t for s in signs if s["name"].startswith("CUNEIFORM SIGN ") for t in _extract_tokens(s["name"])}
+    alpha_tokens = [t for t in tokens if t.isalpha()]
+    candidates = sorted(
+        ((c * (len(g) - 1), c, g) for g, c in counts.items() if c >= min_count),
+        key=lambda t: (-t[0], -t[1], t[2]),
+    )
+    rows = []
+    for saved, count, gram in candidates:
+        if len(rows) >= size:
+            break
+        if gram not in tokens and (max_stage == 0 or not any(gram in t for t in alpha_tokens)):
+            continue
+        ranked = [
+            item for item in _rank_candidates(signs, gram, hints=(), complexity=complexity)
+            if item[0] <= max_stage and item[1] <= max_complexity
+        ]
+        chosen = next((item for item in ranked if item[-1]["codepoint"] not in used), None)
+        if chosen is None:
+            continue
+        stage, *_, sign = chosen
+        used.add(sign["codepoint"])
+        rows.append({
+            "ngram": gram,
+            "count": count,
+            "saved": saved,
+            "char": sign["char"],
+            "codepoint": sign["codepoint"],
+            "name": sign["name"],
+            "stage": stage,
+            "reason": f"Auto-picked by staged heuristic. {STAGE_REASONS[stage]}",
+        })
+    return rows
+
+
+# ——— codec ———
+
+def _trie_alternation(grams: list[str]) -> str:
+    """Alternation shaped like a trie; longer continuations are tried before shorter ones."""
+    trie: dict = {}
+    for gram in grams:
+        node = trie
+        for c in gram:
+            node = node.setdefault(c, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        parts = []
+        for c in sorted(k for k in node if k):
+            child = node[c]
+            rest = {k: v for k, v in child.items() if k}
+            if not rest:
+                parts.append(re.escape(c))
+            else:
+                inner = build(rest)
+                parts.append(re.escape(c) + (f"(?:{inner})?" if "" in child else f"(?:{inner})"))
+        return "|".join(parts)
+
+    return build(trie)
+
+
+class Syllabary:
+    """A-Z signs plus syllable signs; greedy longest-match encoder, one-pass decoder."""
+
+    def __init__(self, letters: dict[str, str], syllables: dict[str, str], passthrough: str = PASSTHROUGH) -> None:
+        if sorted(letters) != LATIN_26:
+            raise ValueError("alphabet must map exactly A-Z")
+        signs = list(letters.values()) + list(syllables.values())
+        if len(set(signs)) != len(signs) or any(len(s) != 1 for s in signs):
+            raise ValueError("every letter and syllable needs its own single-codepoint sign")
+        if set(signs) & set(passthrough):
+            raise ValueError("signs collide with passthrough characters")
+        if any(len(g) < 2 or not set(g) <= set(LATIN_26) for g in syllables):
+            raise ValueError("syllables must be upper-case A-Z n-grams of two or more letters")
+
+        self.letters = dict(letters)
+        self.syllables = dict(syllables)
+        self._syllable_re = re.compile(_trie_alternation(list(syllables))) if syllables else None
+        self._letter_table = {ord(l): s for l, s in letters.items()}
+        self._letter_table.update({ord(l.lower()): s for l, s in letters.items()})
+        self._decode_table = {ord(s): g for g, s in syllables.items()}
+        self._decode_table.update({ord(s): l for l, s in letters.items()})
+        keep = re.escape(passthrough)
+        self._unmapped_latin = re.compile(f"[^A-Za-z{keep}]")
+        self._unmapped_decoded = re.compile(f"[^A-Z{keep}]")
+
+    @classmethod
+    def from_files(cls, az_json: Path = AZ_JSON, syllabary_json: Path = OUT_JSON) -> "Syllabary":
+        az = json.loads(az_json.read_text(encoding="utf-8"))
+        letters = {r["letter"]: r["char"] for r in az if r.get("status") == "selected" and r.get("char")}
+        rows = json.loads(syllabary_json.read_text(encoding="utf-8"))
+        return cls(letters, {r["ngram"]: r["char"] for r in rows})
+
+    def encode(self, text: str) -> str:
+        bad = self._unmapped_latin.search(text)
+        if bad:
+            raise ValueError(f"unmapped character {bad.group()!r} at offset {bad.start()}")
+        text = text.upper()
+        if self._syllable_re is not None:
+            syllables = self.syllables
+            text = self._syllable_re.sub(lambda m: syllables[m[0]], text)
+        return text.translate(self._letter_table)
+
+    def decode(self, text: str) -> str:
+        out = text.translate(self._decode_table)
+        bad = self._unmapped_decoded.search(out)
+        if bad:
+            raise ValueError(f"unmapped character {bad.group()!r} in decoded text")
+        return out
+
+
+# ——— report ———
+
+def measure(syllabary: Syllabary, text: str, bench_mb: float) -> dict:
+    encoded = syllabary.encode(text)
+    decoded = syllabary.decode(encoded)
+    letters = sum(1 for c in text if c.isalpha())
+    signs = sum(1 for c in encoded if c not in PASSTHROUGH)
+    big = text * max(1, int(bench_mb * 1e6 / max(1, len(text))))
+    t0 = time.perf_counter()
+    big_encoded = syllabary.encode(big)
+    t1 = time.perf_counter()
+    syllabary.decode(big_encoded)
+    t2 = time.perf_counter()
+    big_mb = len(big) / 1e6                  # normalized corpus is ASCII: chars == bytes
+    return {
+        "letters": letters,
+        "az_signs": letters,
+        "syllabary_signs": signs,
+        "sign_reduction": round(1 - signs / letters, 4) if letters else None,
+        "az_bytes": len(text.translate({ord(c): "XXXX" for c in LATIN_26}).encode("utf-8")),
+        "syllabary_bytes": len(encoded.encode("utf-8")),
+        "round_trip": decoded == text,
+        "encode_mb_per_s": round(big_mb / (t1 - t0), 1),
+        "decode_mb_per_s": round(len(big_encoded.encode("utf-8")) / 1e6 / (t2 - t1), 1),
+    }
+
+
+def write_outputs(rows: list[dict], out_json: Path = OUT_JSON, out_md: Path = OUT_MD) -> None:
+    out_json.parent.mkdir(parents=True, exist_ok=True)
+    with out_json.open("w", encoding="utf-8") as f:
+        json.dump(rows, f, ensure_ascii=False, indent=2)
+    with out_md.open("w", encoding="utf-8") as f:
+        f.write("# Cuneiform Syllabary Extension (auto)\n\n")
+        f.write("| N-gram | Count | Letters saved | Sign | Codepoint | Unicode Name | Reason |\n")
+        f.write("|---|---|---|---|---|---|---|\n")
+        for r in rows:
+            f.write(f"| {r['ngram']} | {r['count']} | {r['saved']} | {r['char']} | {r['codepoint']} "
+                    f"| {r['name']} | {r['reason']} |\n")
+
+
+def load_corpora(paths: list[Path] | None) -> dict[str, str]:
+    """Normalized text per corpus; by default the repo's documentation and its code, separately."""
+    if paths:
+        groups = {str(p): corpus_files([p]) for p in paths}
+    else:
+        repo = ROOT.parent
+        groups = {f"repo {g}": corpus_files([repo], (g,)) for g in CORPUS_GLOBS}
+    return {
+        name: normalize("\n".join(f.read_text(encoding="utf-8", errors="ignore") for f in files))
+        for name, files in groups.items()
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Syllabic compression alphabet over the cuneiform library.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("build", "Count n-grams, pick syllable signs and write data/processed/syllabary.*"),
+                            ("report", "Size reduction and throughput of the current syllabary.")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("--corpus", type=Path, nargs="+", default=None,
+                       help="Files or directories (*.md, *.py). Default: the repo's docs and code.")
+        p.add_argument("--bench-mb", type=float, default=4.0, help="Text size for throughput timing.")
+        if name == "build":
+            p.add_argument("--size", type=int, default=SIZE, help="Maximum number of syllable signs.")
+            p.add_argument("--max-stage", type=int, choices=sorted(STAGE_REASONS), default=MAX_STAGE,
+                           help="Loosest match stage accepted (0 exact token, 1 prefix, 2 contains).")
+            p.add_argument("--min-count", type=int, default=MIN_COUNT)
+            p.add_argument("--max-complexity", type=int, default=MAX_COMPLEXITY,
+                           help="Largest sign operator tree accepted (1 = plain signs only).")
+    for name in ("encode", "decode"):
+        p = sub.add_parser(name, help=f"{name.title()} stdin to stdout.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+
+    if args.command in ("encode", "decode"):
+        if not OUT_JSON.exists():
+            raise SystemExit("Syllabary missing. Run syllabary.py build first.")
+        syllabary = Syllabary.from_files()
+        convert = syllabary.encode if args.command == "encode" else syllabary.decode
+        try:
+            sys.stdout.write(convert(sys.stdin.read()))
+        except ValueError as e:
+            raise SystemExit(f"[error] {e}")
+        return
+
+    corpora = load_corpora(args.corpus)
+    if args.command == "build":
+        if not LIBRARY_JSON.exists():
+            raise SystemExit("Library missing. Run select_cuneiform.py --build-library first.")
+        signs = json.loads(LIBRARY_JSON.read_text(encoding="utf-8"))
+        az = json.loads(AZ_JSON.read_text(encoding="utf-8"))
+        t0 = time.perf_counter()
+        counts = count_ngrams(" ".join(corpora.values()))
+        rows = select_syllables(signs, counts, {r["codepoint"] for r in az if r.get("codepoint")},
+                                args.size, args.max_stage, args.min_count, args.max_complexity)
+        write_outputs(rows)
+        print(f"[ok] {len(rows)} syllable signs from {len(counts)} distinct n-grams "
+              f"({(time.perf_counter() - t0) * 1000:.0f} ms) → {OUT_JSON}")
+    elif not OUT_JSON.exists():
+        raise SystemExit("Syllabary missing. Run syllabary.py build first.")
+
+    syllabary = Syllabary.from_files()
+    for name, text in corpora.items():
+        print(f"# {name}")
+        print(json.dumps(measure(syllabary, text, args.bench_mb), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""Reproducible benchmarks for the pipeline hot paths, with regression baselines.
+
+Cases (``--only`` filters by prefix):
+
+  collect.scan              full 0..0x10FFFF scan of ``collect_latin.collect_letters``
+  group.letters@N           ``e8_family_grouper.group_letters`` (cold name cache)
+  rank.features@N           ``e8_family_rank_sample.letter_features`` per letter
+  rank.select@N             rank + family table + ``suggest_selection``
+  cuneiform.rank@N          ``_rank_candidates`` for A–Z over N signs
+  cuneiform.select@N        ``select_for_letters`` over N signs
+  fonts.charmap             charmap loading for every audit font (needs matplotlib)
+  fonts.subset_charmap      the same over ``font_subset`` subsets (built untimed in a temp dir, needs fontTools)
+  fonts.font_for@N          ``audit_font_coverage.font_for`` over N code points
+  preview.group@N           ``preview_miohalo_selection.group_by_skeleton``
+  preview.render@N          full preview render (smallest scale only; needs matplotlib)
+
+Synthetic inputs of N candidates are deterministic: real Latin letter records
+first, then letters of other scripts (and, for cuneiform, the sign library
+cycled with fresh code points) until N is reached.  Every case is timed
+``--repeat`` times after input preparation; the best time is what baselines
+store and compare, the median is reported for context.
+
+Usage:
+  python miohalo-alpha/scripts/bench_pipeline.py run                     # → data/bench/last.json
+  python miohalo-alpha/scripts/bench_pipeline.py run --save-baseline     # → data/bench/baseline.json
+  python miohalo-alpha/scripts/bench_pipeline.py check --threshold 0.25  # exit 1 on regression
+  python miohalo-alpha/scripts/bench_pipeline.py run --scales 1000 --only rank,cuneiform
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import paths
+
+sys.path.insert(0, str(paths.CUNEIFORM_SCRIPTS))
+
+import audit_font_coverage as audit  # noqa: E402
+import collect_latin  # noqa: E402
+import e8_family_grouper as grouper  # noqa: E402
+import e8_family_rank_sample as ranker  # noqa: E402
+import preview_miohalo_selection as preview  # noqa: E402
+import select_cuneiform  # noqa: E402
+
+SCALES = (1_000, 10_000, 100_000)
+REPEAT = 3
+THRESHOLD = 0.25          # fail when best time grows by more than 25 % ...
+MIN_DELTA_MS = 1.0        # ... and by more than this, so sub-ms jitter never fails a check
+PREVIEW_MAX = 1_000       # rendering more glyphs than this is not a realistic preview
+
+BASELINE_JSON = paths.BENCH / "baseline.json"
+LAST_JSON = paths.BENCH / "last.json"
+
+
+class Skip(Exception):
+    """Raised by a case's setup when an optional dependency or input is missing."""
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    setup: Callable[[int], Callable[[], object]]   # n -> timed callable
+    scaled: bool = True
+    max_n: int | None = None
+
+
+# ——— synthetic inputs ———
+
+_letters: list[dict] = []
+_signs: list[dict] = []
+
+
+def all_letters() -> list[dict]:
+    """Every Unicode letter as a ``collect_latin`` record, Latin first (computed once)."""
+    if not _letters:
+        latin = collect_latin.collect_letters()
+        others = collect_latin.collect_letters(
+            accept=lambda name, cat: cat.startswith("L") and not collect_latin.is_latin_letter(name, cat)
+        )
+        _letters.extend(latin + others)
+    return _letters
+
+
+def letters(n: int) -> list[dict]:
+    pool = all_letters()
+    return [pool[i % len(pool)] for i in range(n)]
+
+
+def signs(n: int) -> list[dict]:
+    """``n`` cuneiform library entries; past the real library, cycled with fresh code points."""
+    if not _signs:
+        _signs.extend(s.__dict__ for s in select_cuneiform.iter_cuneiform_signs())
+    out = _signs[:n]
+    i = len(out)
+    while i < n:
+        src = _signs[i % len(_signs)]
+        out.append({**src, "codepoint": f"U+{0x100000 + i:06X}"})
+        i += 1
+    return out
+
+
+_scratch: list[tempfile.TemporaryDirectory] = []
+
+
+def scratch_dir() -> Path:
+    """A temporary directory that is removed once the current case has been timed."""
+    tmp = tempfile.TemporaryDirectory(prefix="miohalo-bench-")
+    _scratch.append(tmp)
+    return Path(tmp.name)
+
+
+def _require_matplotlib() -> None:
+    try:
+        import matplotlib  # noqa: F401
+    except ImportError:
+        raise Skip("matplotlib not installed") from None
+
+
+def _font_covers():
+    _require_matplotlib()
+    font_paths = paths.font_paths()
+    if not font_paths:
+        raise Skip("no audit fonts found")
+    return font_paths, audit.load_covers(font_paths)
+
+
+# ——— cases ———
+
+def setup_collect(_n: int):
+    return collect_latin.collect_letters
+
+
+def setup_group(n: int):
+    records = letters(n)
+
+    def run():
+        grouper.u_name.cache_clear()
+        return grouper.group_letters(records)
+    return run
+
+
+def setup_features(n: int):
+    pairs = [(e["char"], e["name"]) for e in letters(n)]
+    return lambda: [ranker.letter_features(ch, name) for ch, name in pairs]
+
+
+def setup_select(n: int):
+    records = letters(n)
+    return lambda: ranker.suggest_selection(ranker.family_table(ranker.rank_letters(records)))
+
+
+def setup_cuneiform_rank(n: int):
+    pool = signs(n)
+    return lambda: [select_cuneiform._rank_candidates(pool, letter) for letter in select_cuneiform.LATIN_26]
+
+
+def setup_cuneiform_select(n: int):
+    pool = signs(n)
+    return lambda: select_cuneiform.select_for_letters(pool)
+
+
+def setup_charmap(_n: int):
+    font_paths, _ = _font_covers()
+    return lambda: audit.load_covers(font_paths)
+
+
+def setup_subset_charmap(_n: int):
+    font_paths, _ = _font_covers()
+    try:
+        import font_subset
+        # Built into a scratch dir: the bench must not touch (or prune) the real subset cache.
+        subset_paths = font_subset.ensure_subsets(font_paths, subset_dir=scratch_dir())
+    except ImportError:
+        raise Skip("fontTools not installed") from None
+    return lambda: audit.load_covers(subset_paths)
+
+
+def setup_font_for(n: int):
+    _, covers = _font_covers()
+    cps = [ord(e["char"]) for e in letters(n)]
+    return lambda: [audit.font_for(cp, covers) for cp in cps]
+
+
+def setup_preview_group(n: int):
+    chars = [e["char"] for e in letters(n)]
+    return lambda: preview.group_by_skeleton(chars, verbose=False)
+
+
+def setup_preview_render(n: int):
+    _require_matplotlib()
+    font_paths = paths.font_paths()
+    if not font_paths:
+        raise Skip("no preview fonts found")
+    preview.use_cover_maps(preview.load_cover_maps(font_paths))
+    chars = preview.group_by_skeleton([e["char"] for e in letters(n)], verbose=False)
+    tmp = scratch_dir()
+    return lambda: preview.render_preview(chars, font_paths, tmp / "preview.png", tmp / "list.txt",
+                                          tmp / "groups.csv", verbose=False)
+
+
+CASES = (
+    Case("collect.scan", setup_collect, scaled=False),
+    Case("group.letters", setup_group),
+    Case("rank.features", setup_features),
+    Case("rank.select", setup_select),
+    Case("cuneiform.rank", setup_cuneiform_rank),
+    Case("cuneiform.select", setup_cuneiform_select),
+    Case("fonts.charmap", setup_charmap, scaled=False),
+    Case("fonts.subset_charmap", setup_subset_charmap, scaled=False),
+    Case("fonts.font_for", setup_font_for),
+    Case("preview.group", setup_preview_group),
+    Case("preview.render", setup_preview_render, max_n=PREVIEW_MAX),
+)
+
+
+# ——— runner ———
+
+def time_case(fn: Callable[[], object], repeat: int) -> list[float]:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def run(scales: tuple[int, ...], repeat: int, only: tuple[str, ...] = ()) -> dict:
+    results: dict[str, dict] = {}
+    skipped: dict[str, str] = {}
+    for case in CASES:
+        if only and not case.name.startswith(only):
+            continue
+        if not case.scaled:
+            sizes = [0]
+        else:
+            sizes = [n for n in scales if case.max_n is None or n <= case.max_n] or [case.max_n]
+        for n in sizes:
+            key = f"{case.name}@{n}" if case.scaled else case.name
+            try:
+                fn = case.setup(n)
+                times = time_case(fn, repeat)
+            except Skip as e:
+                skipped[key] = str(e)
+                print(f"[skip] {key}: {e}")
+                continue
+            finally:
+                while _scratch:
+                    _scratch.pop().cleanup()
+            best = min(times)
+            results[key] = {
+                "n": n,
+                "best_s": round(best, 6),
+                "median_s": round(statistics.median(times), 6),
+                "per_item_us": round(best / n * 1e6, 3) if n else None,
+            }
+            print(f"[ok] {key:<28} best {best * 1000:10.2f} ms   median {statistics.median(times) * 1000:10.2f} ms")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "scales": list(scales),
+            "repeat": repeat,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float, min_delta_ms: float) -> list[str]:
+    """Regressions of ``current`` against ``baseline`` (cases missing from either are ignored)."""
+    regressions = []
+    for key, now in current["results"].items():
+        then = baseline["results"].get(key)
+        if then is None:
+            continue
+        delta = now["best_s"] - then["best_s"]
+        if delta > then["best_s"] * threshold and delta * 1000 > min_delta_ms:
+            regressions.append(
+                f"{key}: {then['best_s'] * 1000:.2f} ms → {now['best_s'] * 1000:.2f} ms "
+                f"(+{delta / then['best_s']:.0%})"
+            )
+    return regressions
+
+
+def write_json(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the Miohalo pipeline hot paths.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("run", "Run the suite and write data/bench/last.json."),
+                            ("check", "Run the suite and fail on regressions against the baseline.")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("--scales", type=int, nargs="+", default=list(SCALES))
+        p.add_argument("--repeat", type=int, default=REPEAT)
+        p.add_argument("--only", default="", help="Comma-separated case-name prefixes.")
+        p.add_argument("--baseline", type=Path, default=BASELINE_JSON)
+        if name == "run":
+            p.add_argument("--save-baseline", action="store_true", help="Also store the run as the baseline.")
+        else:
+            p.add_argument("--threshold", type=float, default=THRESHOLD, help="Allowed relative slowdown.")
+            p.add_argument("--min-delta-ms", type=float, default=MIN_DELTA_MS)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    baseline = None
+    if args.command == "check":
+        if not args.baseline.exists():
+            raise SystemExit(f"No baseline at {args.baseline}. Run `bench_pipeline.py run --save-baseline` first.")
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+
+    only = tuple(p.strip() for p in args.only.split(",") if p.strip())
+    report = run(tuple(sorted(args.scales)), max(1, args.repeat), only)
+    write_json(LAST_JSON, report)
+    print(f"[ok] results → {LAST_JSON}")
+
+    if args.command == "run":
+        if args.save_baseline:
+            write_json(args.baseline, report)
+            print(f"[ok] baseline → {args.baseline}")
+        return 0
+
+    regressions = compare(baseline, report, args.threshold, args.min_delta_ms)
+    for line in regressions:
+        print(f"[regression] {line}")
+    if regressions:
+        return 1
+    print(f"[ok] no regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""Indexed SQLite catalog shared by every pipeline stage.
+
+Letters, cuneiform signs, name tokens, families/features, scores, selection
+status and per-font coverage live in one database (``data/catalog.sqlite3``),
+so cross-stage questions are a single indexed query instead of a hand join of
+JSON/CSV files.  Stages write through bulk ``INSERT ... ON CONFLICT`` upserts,
+one transaction per batch.
+
+Read-only commands (``missing``, ``query``) open the database with
+``mode=ro`` and never write to it.  Per-font coverage has no file on disk; it
+is written by ``audit_font_coverage.py --catalog`` (the ``miohalo.py audit``
+stage passes it unless ``--no-catalog``).
+
+Usage:
+  python scripts/catalog.py ingest                 # load every stage output found on disk
+  python scripts/catalog.py ingest --stage rank
+  python scripts/catalog.py missing --feature HOOK --font NotoSans-Regular.ttf
+  python scripts/catalog.py query "SELECT feature, COUNT(*) FROM family GROUP BY feature"
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import re
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import paths
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS glyph (
+    codepoint INTEGER PRIMARY KEY,
+    char      TEXT NOT NULL,
+    name      TEXT NOT NULL,
+    script    TEXT NOT NULL,           -- latin | cuneiform
+    category  TEXT,
+    block     TEXT
+);
+CREATE INDEX IF NOT EXISTS glyph_script ON glyph(script);
+
+CREATE TABLE IF NOT EXISTS token (
+    token     TEXT NOT NULL,
+    codepoint INTEGER NOT NULL,
+    PRIMARY KEY (token, codepoint)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS family (
+    codepoint INTEGER PRIMARY KEY,
+    family    TEXT NOT NULL,
+    feature   TEXT
+);
+CREATE INDEX IF NOT EXISTS family_family ON family(family);
+CREATE INDEX IF NOT EXISTS family_feature ON family(feature);
+
+CREATE TABLE IF NOT EXISTS score (
+    codepoint INTEGER PRIMARY KEY,
+    score     REAL NOT NULL,
+    features  TEXT                     -- JSON feature vector, when known
+);
+CREATE INDEX IF NOT EXISTS score_score ON score(score);
+
+CREATE TABLE IF NOT EXISTS selection (
+    source    TEXT NOT NULL,           -- latin | cuneiform-az
+    codepoint INTEGER NOT NULL,
+    letter    TEXT,
+    status    TEXT NOT NULL,
+    PRIMARY KEY (source, codepoint)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS selection_codepoint ON selection(codepoint);
+
+CREATE TABLE IF NOT EXISTS coverage (
+    font      TEXT NOT NULL,           -- font file name
+    codepoint INTEGER NOT NULL,
+    covered   INTEGER NOT NULL,
+    PRIMARY KEY (font, codepoint)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS coverage_codepoint ON coverage(codepoint);
+"""
+
+TOKEN_SPLIT = re.compile(r"[^A-Z0-9]+")
+
+
+def connect(db: Path = paths.CATALOG_DB) -> sqlite3.Connection:
+    db.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def connect_readonly(db: Path = paths.CATALOG_DB) -> sqlite3.Connection:
+    """Open an existing catalog without creating, migrating or writing to it."""
+    return sqlite3.connect(f"{db.resolve().as_uri()}?mode=ro", uri=True)
+
+
+def upsert(conn: sqlite3.Connection, table: str, columns: Sequence[str], key: Sequence[str],
+           rows: Iterable[Sequence]) -> int:
+    """Bulk upsert ``rows`` in one transaction; returns the number of rows sent."""
+    cols = ", ".join(columns)
+    marks = ", ".join("?" for _ in columns)
+    updates = ", ".join(f"{c}=excluded.{c}" for c in columns if c not in key)
+    conflict = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+    sql = f"INSERT INTO {table} ({cols}) VALUES ({marks}) ON CONFLICT ({', '.join(key)}) {conflict}"
+    rows = list(rows)
+    with conn:
+        conn.executemany(sql, rows)
+    return len(rows)
+
+
+def _cp(value: str) -> int:
+    return int(value.removeprefix("U+"), 16)
+
+
+def _tokens(cp: int, name: str, prefix: str = "") -> list[tuple[str, int]]:
+    body = name.removeprefix(prefix)
+    return [(t, cp) for t in dict.fromkeys(TOKEN_SPLIT.split(body)) if t]
+
+
+# ——— per-stage writers ———
+
+def ingest_letters(conn: sqlite3.Connection, entries: list[dict]) -> int:
+    glyphs, tokens = [], []
+    for e in entries:
+        cp = ord(e["char"])
+        glyphs.append((cp, e["char"], e["name"], "latin", e.get("category"), None))
+        tokens.extend(_tokens(cp, e["name"]))
+    upsert(conn, "token", ("token", "codepoint"), ("token", "codepoint"), tokens)
+    return upsert(conn, "glyph", ("codepoint", "char", "name", "script", "category", "block"),
+                  ("codepoint",), glyphs)
+
+
+def ingest_signs(conn: sqlite3.Connection, signs: list[dict]) -> int:
+    glyphs, tokens = [], []
+    for s in signs:
+        cp = _cp(s["codepoint"])
+        glyphs.append((cp, s["char"], s["name"], "cuneiform", None, s.get("block")))
+        tokens.extend(_tokens(cp, s["name"], prefix="CUNEIFORM SIGN "))
+    upsert(conn, "token", ("token", "codepoint"), ("token", "codepoint"), tokens)
+    return upsert(conn, "glyph", ("codepoint", "char", "name", "script", "category", "block"),
+                  ("codepoint",), glyphs)
+
+
+def ingest_families(conn: sqlite3.Connection, families: list[dict]) -> int:
+    """Accept both ``families.json`` shapes (grouper: base→features, ranker: base→members)."""
+    fam_rows, score_rows = [], []
+    for fam in families:
+        if "features" in fam:
+            for feat in fam["features"]:
+                for m in feat["members"]:
+                    fam_rows.append((ord(m["char"]), fam["base"], feat["feature"]))
+        else:
+            for m in fam["members"]:
+                score_rows.append((ord(m["char"]), m["score"], json.dumps(m.get("features"), ensure_ascii=False)))
+    if score_rows:
+        return upsert(conn, "score", ("codepoint", "score", "features"), ("codepoint",), score_rows)
+    return upsert(conn, "family", ("codepoint", "family", "feature"), ("codepoint",), fam_rows)
+
+
+def ingest_group_families(conn: sqlite3.Connection, families: list[dict]) -> int:
+    """Grouper's base → feature → members view of ``families.json``.
+
+    Returns 0 when the ranker has rewritten the file since (base → members; the rank
+    stage ingests that); any other shape is an error.
+    """
+    shapes = {("features" in fam, "members" in fam) if isinstance(fam, dict) and "base" in fam else None
+              for fam in families}
+    if shapes == {(False, True)}:
+        return 0
+    if shapes - {(True, False)}:
+        raise ValueError(f"{paths.FAMILIES_JSON.name}: expected grouper families (base → features) "
+                         f"or ranker families (base → members), not a mix or anything else")
+    return ingest_families(conn, families)
+
+
+def ingest_ranked_csv(conn: sqlite3.Connection, path: Path) -> int:
+    with path.open(newline="", encoding="utf-8") as f:
+        rows = [(ord(r["char"]), float(r["score"]), None) for r in csv.DictReader(f)]
+    with conn:
+        conn.executemany(
+            "INSERT INTO score (codepoint, score, features) VALUES (?, ?, ?) "
+            "ON CONFLICT (codepoint) DO UPDATE SET score=excluded.score",
+            rows,
+        )
+    return len(rows)
+
+
+def ingest_selection(conn: sqlite3.Connection, source: str, rows: list[dict]) -> int:
+    """Replace the whole selection of ``source`` (a rerun may drop glyphs)."""
+    data = [
+        (source, ord(r["char"]), r.get("letter"), r.get("status", "selected"))
+        for r in rows
+        if r.get("char")
+    ]
+    with conn:
+        conn.execute("DELETE FROM selection WHERE source = ?", (source,))
+        conn.executemany("INSERT INTO selection (source, codepoint, letter, status) VALUES (?, ?, ?, ?)", data)
+    return len(data)
+
+
+def ingest_coverage(conn: sqlite3.Connection, covers: Iterable[tuple[str, set[int]]],
+                    codepoints: Iterable[int]) -> int:
+    """Record, for each (font path, charmap) pair, whether each code point is covered."""
+    cps = sorted(set(codepoints))
+    rows = [(Path(fp).name, cp, int(cp in cmap)) for fp, cmap in covers for cp in cps]
+    return upsert(conn, "coverage", ("font", "codepoint", "covered"), ("font", "codepoint"), rows)
+
+
+def _load_json(path: Path):
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+
+
+def ingest_stage(conn: sqlite3.Connection, stage: str) -> int:
+    """Load one stage's on-disk outputs; coverage comes from ``audit_font_coverage.py --catalog``."""
+    n = 0
+    if stage == "collect" and (data := _load_json(paths.LATIN_ALL_JSON)) is not None:
+        n += ingest_letters(conn, data)
+    elif stage == "group" and (data := _load_json(paths.FAMILIES_JSON)) is not None:
+        n += ingest_group_families(conn, data)
+    elif stage == "rank":
+        if (paths.OUT / "ranked_candidates.csv").exists():
+            n += ingest_ranked_csv(conn, paths.OUT / "ranked_candidates.csv")
+        if (data := _load_json(paths.FAMILIES_JSON)) is not None:
+            n += ingest_families(conn, data)
+        if (sel := _load_json(paths.SELECTION_JSON)) is not None:
+            n += ingest_selection(conn, "latin", sel)
+    elif stage == "select-cuneiform":
+        if (signs := _load_json(paths.CUNEIFORM_LIBRARY_JSON)) is not None:
+            n += ingest_signs(conn, signs)
+        if (sel := _load_json(paths.AZ_SELECTION_JSON)) is not None:
+            n += ingest_selection(conn, "cuneiform-az", sel)
+    return n
+
+
+INGEST_ORDER = ("collect", "group", "rank", "select-cuneiform")
+
+MISSING_SQL = """
+SELECT g.char, printf('U+%04X', g.codepoint) AS codepoint, g.name, f.family, f.feature
+FROM selection s
+JOIN glyph g        ON g.codepoint = s.codepoint
+LEFT JOIN family f  ON f.codepoint = s.codepoint
+LEFT JOIN coverage c ON c.codepoint = s.codepoint AND c.font = :font
+WHERE (:source IS NULL OR s.source = :source)
+  AND (:feature IS NULL OR f.feature = :feature)
+  AND COALESCE(c.covered, 0) = 0
+ORDER BY g.codepoint
+"""
+
+
+def known_fonts(conn: sqlite3.Connection) -> list[str]:
+    return [row[0] for row in conn.execute("SELECT DISTINCT font FROM coverage ORDER BY font")]
+
+
+def _print_rows(cur: sqlite3.Cursor) -> None:
+    if cur.description:
+        print("\t".join(d[0] for d in cur.description))
+    for row in cur:
+        print("\t".join("" if v is None else str(v) for v in row))
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Miohalo SQLite catalog.")
+    parser.add_argument("--db", type=Path, default=paths.CATALOG_DB, help="Catalog database path.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("ingest", help="Load stage outputs from disk into the catalog.")
+    p.add_argument("--stage", choices=INGEST_ORDER, action="append",
+                   help="Only these stages (repeatable); default: all.")
+
+    p = sub.add_parser("missing", help="Selected glyphs lacking coverage in a font.")
+    p.add_argument("--font", required=True, help="Font file name, e.g. NotoSans-Regular.ttf.")
+    p.add_argument("--feature", help="Restrict to a family feature, e.g. HOOK.")
+    p.add_argument("--source", default="latin", help="Selection source (latin | cuneiform-az).")
+
+    p = sub.add_parser("query", help="Run a read-only SQL query.")
+    p.add_argument("sql")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.command != "ingest" and not args.db.exists():
+        print(f"[error] no catalog at {args.db}; run `catalog.py ingest` first", file=sys.stderr)
+        return 1
+    conn = connect(args.db) if args.command == "ingest" else connect_readonly(args.db)
+    try:
+        if args.command == "ingest":
+            for stage in args.stage or INGEST_ORDER:
+                print(f"[ok] {stage}: {ingest_stage(conn, stage)} rows")
+        elif args.command == "missing":
+            fonts = known_fonts(conn)
+            if args.font not in fonts:
+                print(f"[error] no coverage recorded for font {args.font!r}; known fonts: "
+                      f"{', '.join(fonts) or '(none — run `miohalo.py audit`)'}", file=sys.stderr)
+                return 1
+            _print_rows(conn.execute(MISSING_SQL, {"font": args.font, "feature": args.feature, "source": args.source}))
+        else:
+            _print_rows(conn.execute(args.sql))
+    except (sqlite3.Error, ValueError) as e:
+        print(f"[error] {e}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""CJK/Kana character mutation: glyph classes and a Miohalo symbolic layer.
+
+Direction 1 of the project remaps Chinese/Japanese text into a symbolic layer.
+Like ``family_graph.py`` for Latin, this stage only follows data ``unicodedata``
+already carries, joined with the same union-find:
+
+* ``nfkc``  — a character whose NFKC form is one other character joins it:
+  Kangxi radicals (⼀ → 一), the CJK radical supplement forms that decompose
+  (⺟ → 母), compatibility ideographs (豈 → 豈), circled ideographs (㊀ → 一),
+  half/full-width forms (ｶ → カ, Ａ → A, 　 → space);
+* ``voicing`` — a character whose NFD is a base plus combining marks joins the
+  base (が → か, パ → ハ, ヷ → ワ);
+* ``kana``  — hiragana and katakana letters with the same name, small forms
+  included, join each other (か ↔ カ, ぁ ↔ あ).
+
+Each class gets a representative (the NFKC-stable, full-size, hiragana, unvoiced
+member with the lowest code point: か for {か が カ ガ ｶ ヵ ゕ}).  Classes whose
+representative is a CJK/Kana character also get a symbol in the supplementary
+private use planes (from U+F0000, in class order, skipping the plane-end
+noncharacters); classes represented by ASCII only fold.  The classes are
+compiled into flat ``uint32`` lookup tables over all of Unicode, so mapping a
+chunk is one UTF-32 view and one NumPy gather:
+
+* ``fold``   — every member → its class representative;
+* ``class``  — every member → its class symbol (the Miohalo layer), or its
+  representative when the class has none;
+* ``decode`` — class symbol → representative.
+
+Characters outside the inventory map to themselves.  ``map`` splits a UTF-8
+corpus into byte ranges aligned to character starts and maps them across a
+process pool (``--workers``, 0 = one per CPU), writing the parts in order.
+Invalid UTF-8 stops the run with its byte offset; ``-o`` is only replaced
+once the whole corpus has mapped.
+
+Usage:
+  python miohalo-alpha/scripts/cjk_mapper.py build               # → data/out/cjk_classes.json
+  python miohalo-alpha/scripts/cjk_mapper.py show か ⼀ ｶﾞ
+  python miohalo-alpha/scripts/cjk_mapper.py map -i corpus.txt -o corpus.mio --to class --workers 0
+  python miohalo-alpha/scripts/cjk_mapper.py bench --mchars 32 --workers 0   # Mchars/s
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import unicodedata
+from collections import Counter
+from multiprocessing import Pool
+from pathlib import Path
+
+import numpy as np
+
+import paths
+from family_graph import DisjointSet
+
+CJK_BLOCKS = (
+    (0x2E80, 0x2EFF, "CJK Radicals Supplement"),
+    (0x2F00, 0x2FDF, "Kangxi Radicals"),
+    (0x3000, 0x303F, "CJK Symbols and Punctuation"),
+    (0x3040, 0x309F, "Hiragana"),
+    (0x30A0, 0x30FF, "Katakana"),
+    (0x31F0, 0x31FF, "Katakana Phonetic Extensions"),
+    (0x3200, 0x32FF, "Enclosed CJK Letters and Months"),
+    (0x3300, 0x33FF, "CJK Compatibility"),
+    (0x3400, 0x4DBF, "CJK Unified Ideographs Extension A"),
+    (0x4E00, 0x9FFF, "CJK Unified Ideographs"),
+    (0xF900, 0xFAFF, "CJK Compatibility Ideographs"),
+    (0xFF00, 0xFFEF, "Halfwidth and Fullwidth Forms"),
+    (0x1AFF0, 0x1B16F, "Kana Extended-B, Kana Supplement, Kana Extended-A, Small Kana Extension"),
+    (0x20000, 0x2FA1F, "CJK Unified Ideographs Extensions B-F, Compatibility Ideographs Supplement"),
+    (0x30000, 0x323AF, "CJK Unified Ideographs Extensions G-H"),
+)
+RELATIONS = ("nfkc", "voicing", "kana")
+KANA_PREFIXES = ("HIRAGANA LETTER ", "KATAKANA LETTER ")
+MODES = ("fold", "class", "decode")
+
+SYMBOL_BASE = (0xF0000, 0x100000)   # supplementary private use planes 15 and 16
+SYMBOL_PLANE = 0xFFFE               # usable code points per plane (U+xFFFE/xFFFF are noncharacters)
+UNICODE_SIZE = 0x110000
+CHUNK_MB = 8.0
+
+OUT = paths.ALPHA_ROOT / "data" / "out"
+CLASSES_JSON = OUT / "cjk_classes.json"
+
+
+def symbol_for(index: int) -> int:
+    plane, offset = divmod(index, SYMBOL_PLANE)
+    if plane >= len(SYMBOL_BASE):
+        raise ValueError(f"layer index {index} does not fit the private use planes")
+    return SYMBOL_BASE[plane] + offset
+
+
+def in_blocks(ch: str) -> bool:
+    return any(lo <= ord(ch) <= hi for lo, hi, _ in CJK_BLOCKS)
+
+
+def inventory() -> list[str]:
+    """Every assigned character of the CJK/Kana blocks, in code point order."""
+    return [chr(cp) for lo, hi, _ in CJK_BLOCKS for cp in range(lo, hi + 1)
+            if unicodedata.category(chr(cp)) != "Cn"]
+
+
+def links(ch: str) -> list[tuple[str, str]]:
+    """(relation, target) pairs of ``ch``; targets may lie outside the inventory."""
+    out = []
+    nfkc = unicodedata.normalize("NFKC", ch)
+    if len(nfkc) == 1 and nfkc != ch:
+        out.append(("nfkc", nfkc))
+    nfd = unicodedata.normalize("NFD", ch)
+    if len(nfd) > 1 and all(unicodedata.category(m) == "Mn" for m in nfd[1:]):
+        out.append(("voicing", nfd[0]))
+    return out
+
+
+def _kana_key(ch: str) -> str | None:
+    name = unicodedata.name(ch, "")
+    for prefix in KANA_PREFIXES:
+        if name.startswith(prefix):
+            return name[len(prefix):].removeprefix("SMALL ")
+    return None
+
+
+def _rep_key(ch: str) -> tuple:
+    name = unicodedata.name(ch, "")
+    return (unicodedata.normalize("NFKC", ch) != ch, "SMALL" in name, "KATAKANA" in name,
+            len(unicodedata.normalize("NFD", ch)), ord(ch))
+
+
+class CharClasses:
+    """Glyph classes over the CJK/Kana inventory, compiled into flat lookup tables."""
+
+    def __init__(self, classes: list[list[str]], edges: Counter) -> None:
+        self.classes = classes            # class id → members, representative first
+        self.edges = edges                # relation → number of links
+        # Only classes represented by a CJK/Kana character get a layer symbol; the rest
+        # (ASCII behind the full-width forms) are folded but stay plain text.
+        self.symbols: list[int | None] = []
+        layer = 0
+        for members in classes:
+            if in_blocks(members[0]):
+                self.symbols.append(symbol_for(layer))
+                layer += 1
+            else:
+                self.symbols.append(None)
+        self.class_of = {ch: class_id for class_id, members in enumerate(classes) for ch in members}
+        self._tables: dict[str, np.ndarray] = {}
+
+    @classmethod
+    def build(cls, relations: tuple[str, ...] = RELATIONS) -> "CharClasses":
+        chars = inventory()
+        index = {ch: i for i, ch in enumerate(chars)}
+        pairs: list[tuple[str, str]] = []
+        edges: Counter = Counter()
+        kana: dict[str, str] = {}
+        for ch in chars:
+            found = links(ch)
+            key = _kana_key(ch)
+            if key is not None:
+                if key in kana:
+                    found.append(("kana", kana[key]))
+                else:
+                    kana[key] = ch
+            for relation, target in found:
+                if relation in relations:
+                    pairs.append((ch, target))
+                    edges[relation] += 1
+        for _, target in pairs:
+            if target not in index:          # e.g. ASCII behind a full-width form
+                index[target] = len(chars)
+                chars.append(target)
+
+        dsu = DisjointSet(len(chars))
+        for a, b in pairs:
+            dsu.union(index[a], index[b])
+
+        groups: dict[int, list[str]] = {}
+        for i, ch in enumerate(chars):
+            groups.setdefault(dsu.find(i), []).append(ch)
+        classes = [sorted(members, key=_rep_key) for members in groups.values()]
+        classes.sort(key=lambda members: ord(members[0]))
+        return cls(classes, edges)
+
+    def pairs(self, mode: str) -> tuple[np.ndarray, np.ndarray]:
+        """Sparse (source, target) code points of one table; everything else is identity."""
+        src, dst = [], []
+        for members, symbol in zip(self.classes, self.symbols):
+            rep = ord(members[0])
+            if mode == "decode":
+                if symbol is not None:
+                    src.append(symbol)
+                    dst.append(rep)
+                continue
+            target = rep if mode == "fold" or symbol is None else symbol
+            for ch in members:
+                if ord(ch) != target:
+                    src.append(ord(ch))
+                    dst.append(target)
+        return np.array(src, dtype="<u4"), np.array(dst, dtype="<u4")
+
+    def table(self, mode: str) -> np.ndarray:
+        if mode not in self._tables:
+            self._tables[mode] = compile_table(*self.pairs(mode))
+        return self._tables[mode]
+
+
+def compile_table(src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """Flat code point → code point table over all of Unicode."""
+    table = np.arange(UNICODE_SIZE, dtype="<u4")
+    table[src] = dst
+    return table
+
+
+def map_text(text: str, table: np.ndarray) -> str:
+    """Map every character of ``text`` through ``table`` (one gather over its UTF-32 view)."""
+    cps = np.frombuffer(text.encode("utf-32-le"), dtype="<u4")
+    return table[cps].tobytes().decode("utf-32-le")
+
+
+# ——— corpora ———
+
+def char_ranges(path: Path, chunk_bytes: int) -> list[tuple[int, int]]:
+    """Byte ranges of about ``chunk_bytes`` whose bounds fall on UTF-8 character starts."""
+    size = path.stat().st_size
+    bounds = [0]
+    with path.open("rb") as f:
+        for start in range(chunk_bytes, size, chunk_bytes):
+            f.seek(start)
+            head = f.read(4)
+            skip = next((i for i, b in enumerate(head) if b & 0xC0 != 0x80), len(head))
+            if start + skip > bounds[-1]:
+                bounds.append(start + skip)
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a] or [(0, 0)]
+
+
+_worker: dict = {}
+
+
+def _init_worker(src: np.ndarray, dst: np.ndarray) -> None:
+    _worker["table"] = compile_table(src, dst)
+
+
+def _map_range(job: tuple[Path, int, int]) -> tuple[int, bytes]:
+    path, start, end = job
+    with path.open("rb") as f:
+        f.seek(start)
+        try:
+            text = f.read(end - start).decode("utf-8")
+        except UnicodeDecodeError as e:
+            # Plain ValueError with the absolute offset: it pickles back from a pool worker.
+            raise ValueError(f"{path}: invalid UTF-8 at byte {start + e.start}") from None
+    return len(text), map_text(text, _worker["table"]).encode("utf-8")
+
+
+def map_file(classes: CharClasses, mode: str, src: Path, dst, workers: int = 1,
+             chunk_mb: float = CHUNK_MB) -> dict:
+    """Map a UTF-8 file into the binary stream ``dst``; returns throughput figures."""
+    t0 = time.perf_counter()
+    pairs = classes.pairs(mode)
+    jobs = [(src, a, b) for a, b in char_ranges(src, max(1, int(chunk_mb * 1e6)))]
+    chars = written = 0
+    if workers <= 1:
+        _init_worker(*pairs)
+        for n, data in map(_map_range, jobs):
+            chars += n
+            written += dst.write(data)
+    else:
+        with Pool(min(workers, len(jobs)), initializer=_init_worker, initargs=pairs) as pool:
+            for n, data in pool.imap(_map_range, jobs):
+                chars += n
+                written += dst.write(data)
+    took = time.perf_counter() - t0
+    return {
+        "mode": mode,
+        "workers": workers,
+        "chunks": len(jobs),
+        "chars": chars,
+        "bytes_in": src.stat().st_size,
+        "bytes_out": written,
+        "seconds": round(took, 3),
+        "mchars_per_s": round(chars / took / 1e6, 1) if took else None,
+    }
+
+
+# ——— bench ———
+
+def synthetic_corpus(mchars: float, seed: int = 5) -> str:
+    """Japanese/Chinese-like text: ideographs, kana, half-width kana, compatibility forms, ASCII."""
+    rng = np.random.default_rng(seed)
+    pools = [
+        (0.55, range(0x4E00, 0xA000)),
+        (0.25, [cp for cp in range(0x3041, 0x30FB) if unicodedata.category(chr(cp)) == "Lo"]),
+        (0.05, range(0xFF66, 0xFF9E)),
+        (0.03, list(range(0x2F00, 0x2FD6)) + list(range(0xF900, 0xFA6E))),
+        (0.05, range(0xFF01, 0xFF5F)),
+        (0.07, range(0x20, 0x7F)),
+    ]
+    n = int(mchars * 1e6)
+    which = rng.choice(len(pools), size=n, p=[w for w, _ in pools])
+    cps = np.empty(n, dtype="<u4")
+    for i, (_, pool) in enumerate(pools):
+        pool = np.array(pool, dtype="<u4")
+        mask = which == i
+        cps[mask] = pool[rng.integers(0, len(pool), int(mask.sum()))]
+    cps[79::80] = ord("\n")
+    return cps.tobytes().decode("utf-32-le")
+
+
+def bench(classes: CharClasses, mchars: float, workers: int) -> dict:
+    text = synthetic_corpus(mchars)
+    result: dict = {"chars": len(text), "in_memory": {}}
+    mapped = {}
+    for mode, source in (("fold", text), ("class", text), ("decode", None)):
+        source = mapped["class"] if source is None else source
+        table = classes.table(mode)
+        t0 = time.perf_counter()
+        mapped[mode] = map_text(source, table)
+        took = time.perf_counter() - t0
+        result["in_memory"][mode] = round(len(source) / took / 1e6, 1)
+    assert mapped["decode"] == mapped["fold"], "class symbols do not decode to the folded text"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = Path(tmp) / "corpus.txt"
+        corpus.write_text(text, encoding="utf-8")
+        with open(os.devnull, "wb") as sink:
+            result["file"] = map_file(classes, "class", corpus, sink, workers)
+    return result
+
+
+# ——— CLI ———
+
+def _u(cp: int | None) -> str | None:
+    return None if cp is None else f"U+{cp:04X}"
+
+
+def summary(classes: CharClasses, min_size: int) -> dict:
+    families = [m for m in classes.classes if len(m) >= min_size]
+    return {
+        "unidata_version": unicodedata.unidata_version,
+        "characters": sum(len(m) for m in classes.classes),
+        "classes": len(classes.classes),
+        "layer_symbols": sum(s is not None for s in classes.symbols),
+        "multi_member_classes": sum(len(m) > 1 for m in classes.classes),
+        "links": dict(classes.edges),
+        "largest": [" ".join(m) for m in sorted(families, key=len, reverse=True)[:10]],
+        "families": [
+            {"id": class_id, "rep": m[0], "symbol": _u(symbol), "members": "".join(m)}
+            for class_id, (m, symbol) in enumerate(zip(classes.classes, classes.symbols)) if len(m) >= min_size
+        ],
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="CJK/Kana glyph classes and the Miohalo symbolic layer.")
+    parser.add_argument("--relations", default=",".join(RELATIONS),
+                        help=f"Comma-separated links to follow (default: {','.join(RELATIONS)}).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("build", help="Build the classes and write their summary.")
+    p.add_argument("--min-size", type=int, default=2, help="Smallest class listed under 'families'.")
+    p.add_argument("--out", type=Path, default=CLASSES_JSON)
+    p = sub.add_parser("show", help="Show the class of each character.")
+    p.add_argument("text", nargs="+")
+    p = sub.add_parser("map", help="Map a UTF-8 corpus.")
+    p.add_argument("-i", "--input", type=Path, required=True)
+    p.add_argument("-o", "--output", type=Path, help="Output file (default stdout).")
+    p.add_argument("--to", choices=MODES, default="class")
+    p.add_argument("--workers", type=int, default=1, help="Processes (0 = one per CPU).")
+    p.add_argument("--chunk-mb", type=float, default=CHUNK_MB, help="Bytes per worker job.")
+    p = sub.add_parser("bench", help="Measure Mchars/s on a synthetic corpus.")
+    p.add_argument("--mchars", type=float, default=16.0, help="Corpus size in millions of characters.")
+    p.add_argument("--workers", type=int, default=1, help="Processes for the file pass (0 = one per CPU).")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    relations = tuple(r for r in args.relations.split(",") if r)
+    unknown = set(relations) - set(RELATIONS)
+    if unknown:
+        raise SystemExit(f"Unknown relations: {', '.join(sorted(unknown))} (choose from {', '.join(RELATIONS)})")
+    t0 = time.perf_counter()
+    classes = CharClasses.build(relations)
+    built = time.perf_counter() - t0
+
+    if args.command == "build":
+        report = summary(classes, args.min_size)
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[ok] {report['characters']} characters → {report['classes']} classes "
+              f"({report['multi_member_classes']} with several members) in {built:.2f} s")
+        print(f"[ok] links: {report['links']}")
+        for line in report["largest"][:5]:
+            print(f"    {line}")
+        print(f"[ok] → {args.out}")
+        return 0
+
+    if args.command == "show":
+        for ch in "".join(args.text):
+            class_id = classes.class_of.get(ch)
+            if class_id is None:
+                print(f"{ch}  U+{ord(ch):04X}  (no class)")
+                continue
+            members = classes.classes[class_id]
+            print(f"{ch}  U+{ord(ch):04X}  class {class_id}  rep {members[0]}  "
+                  f"symbol {_u(classes.symbols[class_id]) or '-'}  members {' '.join(members)}")
+        return 0
+
+    workers = args.workers or os.cpu_count() or 1
+    if args.command == "bench":
+        print(json.dumps({"build_seconds": round(built, 3), **bench(classes, args.mchars, workers)}, indent=2))
+        return 0
+
+    if not args.input.exists():
+        raise SystemExit(f"No corpus at {args.input}")
+    try:
+        if args.output is None:
+            report = map_file(classes, args.to, args.input, sys.stdout.buffer, workers, args.chunk_mb)
+            sys.stdout.flush()
+        else:
+            # Written next to the target and renamed only once the whole corpus mapped.
+            args.output.parent.mkdir(parents=True, exist_ok=True)
+            tmp = args.output.with_name(args.output.name + ".tmp")
+            try:
+                with tmp.open("wb") as dst:
+                    report = map_file(classes, args.to, args.input, dst, workers, args.chunk_mb)
+                tmp.replace(args.output)
+            finally:
+                tmp.unlink(missing_ok=True)
+    except ValueError as e:
+        raise SystemExit(f"[error] {e}") from None
+    print(f"[ok] {json.dumps(report)}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
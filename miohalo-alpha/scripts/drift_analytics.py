@@ -0,0 +1,614 @@
+#!/usr/bin/env python3
+"""Bounded-memory drift analytics over spell-packet glyph logs (roadmap Phase D).
+
+Reads the one-packet-per-line logs written by ``spell_relay.py simulate --log``
+and keeps only mergeable summaries, so memory depends on the settings below and
+not on the length of the log:
+
+* ``CountMin``     — symbol frequencies (verbs are a fixed set of five and are counted exactly);
+* ``HyperLogLog``  — distinct symbols and distinct agents;
+* ``Reservoir``    — a uniform sample of raw lines;
+* ``MisraGries``   — heavy hitters: global top symbols, and one small summary per
+  agent per window.
+
+Packets are grouped into windows of ``--window`` consecutive ``seq`` numbers
+(every hop of one chain shares its seq).  A window stays open until packets
+``--lag`` windows newer arrive; it is then closed into one row: each agent's
+Jensen–Shannon divergence (bits, 0..1) from the window's pooled symbol
+distribution, and the pooled distribution's drift from the previous window.
+Lines for an already closed window are counted as ``late`` and left out of the
+window rows.  Rows are streamed to ``--rows`` as JSON lines.
+
+With ``--workers N`` the file is split into newline-aligned byte ranges that are
+analysed in a process pool.  Windows at the edges of a range may continue in
+the neighbouring range; workers return those still open, each with its
+packets' (agent, symbols) in arrival order, and the parent replays them in
+file order before closing them, so window rows are identical to a
+single-process run.  Interior windows come back as rows.  Run totals merge as
+sketches: verbs, count-min and HyperLogLog exactly, while the global heavy
+hitter counts and the line sample may differ from a single-process run.
+
+Usage:
+  python miohalo-alpha/scripts/spell_relay.py simulate --packets 20000 --drift 0.05 --log data/out/relay.log
+  python miohalo-alpha/scripts/drift_analytics.py analyze data/out/relay.log --window 500 --rows data/out/drift_rows.jsonl
+  python miohalo-alpha/scripts/drift_analytics.py generate data/out/big.log --packets 2000000 --drift 0.3
+  python miohalo-alpha/scripts/drift_analytics.py analyze data/out/big.log --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import time
+from array import array
+from collections import Counter
+from functools import lru_cache
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Callable
+
+from spell_packet import VERBS, GlyphCodec, SpellPacket, load_alphabet
+
+WINDOW = 1000             # seq numbers per window
+LAG = 2                   # windows kept open behind the newest one
+AGENT_K = 16              # Misra–Gries counters per agent per window
+POOLED_K = 64             # ... for the window's pooled distribution
+TOP_K = 256               # ... for the global heavy hitters
+MIN_SYMBOLS = 8           # agents with fewer symbols in a window are not scored
+CMS_WIDTH = 2048
+CMS_DEPTH = 4
+HLL_P = 12                # 4096 registers, ~1.6 % standard error
+SAMPLE = 10
+TOP_AGENTS = 3            # most divergent agents listed per window
+CHUNK_MB = 8.0
+
+
+@lru_cache(maxsize=1 << 16)
+def hash64(s: str) -> int:
+    """Stable 64-bit hash (``hash()`` is salted per process, which would break merging)."""
+    return int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+@lru_cache(maxsize=1 << 16)
+def _cms_slots(key: str, width: int, depth: int) -> tuple[int, ...]:
+    h = hash64(key)
+    h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1          # Kirsch–Mitzenmacher double hashing
+    return tuple((h1 + i * h2) % width for i in range(depth))
+
+
+@lru_cache(maxsize=1 << 16)
+def _hll_cell(key: str, p: int) -> tuple[int, int]:
+    h = hash64(key)
+    rest = h & ((1 << (64 - p)) - 1)
+    return h >> (64 - p), 64 - p - rest.bit_length() + 1
+
+
+# ——— sketches ———
+
+class CountMin:
+    """Count-min sketch; merge by adding tables of the same shape."""
+
+    def __init__(self, width: int = CMS_WIDTH, depth: int = CMS_DEPTH) -> None:
+        self.width = width
+        self.depth = depth
+        self.rows = [array("Q", bytes(8 * width)) for _ in range(depth)]
+        self.total = 0
+
+    def add(self, key: str, n: int = 1) -> None:
+        self.total += n
+        for row, slot in zip(self.rows, _cms_slots(key, self.width, self.depth)):
+            row[slot] += n
+
+    def estimate(self, key: str) -> int:
+        return min(row[slot] for row, slot in zip(self.rows, _cms_slots(key, self.width, self.depth)))
+
+    def merge(self, other: "CountMin") -> None:
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("count-min sketches differ in shape")
+        for mine, theirs in zip(self.rows, other.rows):
+            for i, v in enumerate(theirs):
+                if v:
+                    mine[i] += v
+        self.total += other.total
+
+
+class HyperLogLog:
+    """HyperLogLog cardinality estimate; merge by register-wise max."""
+
+    def __init__(self, p: int = HLL_P) -> None:
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+
+    def add(self, key: str) -> None:
+        idx, rank = _hll_cell(key, self.p)
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def estimate(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return round(m * math.log(m / zeros))       # linear counting for small sets
+        return round(raw)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if self.p != other.p:
+            raise ValueError("HyperLogLog precisions differ")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+
+class Reservoir:
+    """Uniform sample of ``k`` items (Algorithm R); merge draws from both sides by stream size."""
+
+    def __init__(self, k: int = SAMPLE, seed: int | str = 0) -> None:
+        self.k = k
+        self.items: list = []
+        self.seen = 0
+        self.rng = random.Random(seed)
+
+    def add(self, item) -> None:
+        self.seen += 1
+        if len(self.items) < self.k:
+            self.items.append(item)
+        else:
+            j = self.rng.randrange(self.seen)
+            if j < self.k:
+                self.items[j] = item
+
+    def merge(self, other: "Reservoir") -> None:
+        # Each kept item stands for seen / len(items) stream items; weighted sampling without
+        # replacement (Efraimidis–Spirakis keys) keeps the merged sample uniform over both streams.
+        keyed = []
+        for side in (self, other):
+            if side.items:
+                weight = side.seen / len(side.items)
+                keyed += [(self.rng.random() ** (1 / weight), i, item) for i, item in enumerate(side.items)]
+        keyed.sort(key=lambda t: t[:2], reverse=True)
+        self.items = [item for _, _, item in keyed[: self.k]]
+        self.seen += other.seen
+
+
+class MisraGries:
+    """At most ``k`` counters; every count is under-estimated by at most total / (k + 1)."""
+
+    __slots__ = ("k", "counters", "total")
+
+    def __init__(self, k: int) -> None:
+        self.k = k
+        self.counters: dict[str, int] = {}
+        self.total = 0
+
+    def add(self, item: str) -> None:
+        self.total += 1
+        c = self.counters
+        if item in c:
+            c[item] += 1
+        elif len(c) < self.k:
+            c[item] = 1
+        else:
+            for key in list(c):
+                if c[key] == 1:
+                    del c[key]
+                else:
+                    c[key] -= 1
+
+    def merge(self, other: "MisraGries") -> None:
+        c = self.counters
+        for key, n in other.counters.items():
+            c[key] = c.get(key, 0) + n
+        self.total += other.total
+        if len(c) > self.k:
+            cut = sorted(c.values(), reverse=True)[self.k]
+            self.counters = {key: n - cut for key, n in c.items() if n > cut}
+
+    def top(self, n: int | None = None) -> list[tuple[str, int]]:
+        return sorted(self.counters.items(), key=lambda kv: (-kv[1], kv[0]))[:n]
+
+
+# ——— divergence ———
+
+def _distribution(counters: dict[str, int], total: int) -> dict:
+    """Probabilities over the tracked symbols plus one bucket (None) for everything else."""
+    dist = {k: n / total for k, n in counters.items()}
+    other = 1.0 - sum(dist.values())
+    if other > 1e-12:
+        dist[None] = other
+    return dist
+
+
+def _entropy(dist) -> float:
+    return -sum(p * math.log2(p) for p in dist if p > 0)
+
+
+def jensen_shannon(p: dict, q: dict) -> float:
+    mix = [(p.get(k, 0.0) + q.get(k, 0.0)) / 2 for k in p.keys() | q.keys()]
+    return max(0.0, _entropy(mix) - (_entropy(p.values()) + _entropy(q.values())) / 2)
+
+
+# ——— windows ———
+
+class Window:
+    __slots__ = ("agents", "pooled", "packets", "events")
+
+    def __init__(self, record: bool = False) -> None:
+        self.agents: dict[str, MisraGries] = {}
+        self.pooled = MisraGries(POOLED_K)
+        self.packets = 0
+        # (agent, symbols) in arrival order, kept in worker mode: Misra–Gries summaries do not
+        # merge exactly, so edge windows are merged by replaying the other side's packets.
+        self.events: list[tuple[str, tuple[str, ...]]] | None = [] if record else None
+
+    def add(self, agent: str, symbols: tuple[str, ...]) -> None:
+        self.packets += 1
+        if self.events is not None:
+            self.events.append((agent, symbols))
+        summary = self.agents.get(agent)
+        if summary is None:
+            summary = self.agents[agent] = MisraGries(AGENT_K)
+        for sym in symbols:
+            summary.add(sym)
+            self.pooled.add(sym)
+
+    def merge(self, other: "Window") -> None:
+        """Add ``other``'s packets as if they arrived after this window's own."""
+        if other.events is None:
+            raise ValueError("only windows that record their packets can be merged")
+        for agent, symbols in other.events:
+            self.add(agent, symbols)
+
+    def close(self, index: int, window: int, min_symbols: int) -> dict:
+        pooled = self.pooled
+        scores = []
+        if pooled.total:
+            reference = _distribution(pooled.counters, pooled.total)
+            for agent, summary in self.agents.items():
+                if summary.total >= min_symbols:
+                    scores.append((jensen_shannon(_distribution(summary.counters, summary.total), reference), agent))
+        scores.sort(reverse=True)
+        values = [s for s, _ in scores]
+        return {
+            "window": index,
+            "seq": [index * window, (index + 1) * window - 1],
+            "packets": self.packets,
+            "symbols": pooled.total,
+            "agents": len(self.agents),
+            "scored_agents": len(scores),
+            "divergence_mean": round(sum(values) / len(values), 6) if values else None,
+            "divergence_max": round(values[0], 6) if values else None,
+            "most_divergent": [[agent, round(score, 6)] for score, agent in scores[:TOP_AGENTS]],
+            "top": pooled.top(),
+        }
+
+
+class Analyzer:
+    """Consumes decoded packets; mergeable with other analyzers over the same settings."""
+
+    def __init__(self, window: int = WINDOW, lag: int = LAG, min_symbols: int = MIN_SYMBOLS,
+                 sample: int = SAMPLE, seed: int | str = 0, hold_until: int | None = None,
+                 emit: Callable[[dict], None] | None = None, record: bool = False) -> None:
+        self.window = window
+        self.lag = lag
+        self.min_symbols = min_symbols
+        self.hold_until = hold_until            # windows <= this stay open (chunk heads in worker mode)
+        self.record = record                    # windows keep their packets for exact merging (workers)
+        self.open: dict[int, Window] = {}
+        self.newest = -1
+        self.closed_upto = -1
+        self.rows: list[dict] = []
+        # Closed-window rows go to ``emit`` as they close; without it (workers) they collect in
+        # ``rows``, bounded by one byte range.
+        self.emit = self.rows.append if emit is None else emit
+
+        self.lines = self.bad_lines = self.late = 0
+        self.verbs: Counter = Counter()
+        self.symbols = CountMin()
+        self.distinct_symbols = HyperLogLog()
+        self.distinct_agents = HyperLogLog()
+        self.heavy = MisraGries(TOP_K)
+        self.sample = Reservoir(sample, seed)
+
+    def add(self, packet: SpellPacket, line: str) -> None:
+        self.lines += 1
+        self.verbs[packet.verb] += 1
+        self.distinct_agents.add(packet.source)
+        for sym in packet.symbols:
+            self.symbols.add(sym)
+            self.distinct_symbols.add(sym)
+            self.heavy.add(sym)
+        self.sample.add(line)
+
+        w = packet.seq // self.window
+        if w <= self.closed_upto:
+            self.late += 1
+            return
+        win = self.open.get(w)
+        if win is None:
+            win = self.open[w] = Window(self.record)
+        win.add(packet.source, packet.symbols)
+        if w > self.newest:
+            self.newest = w
+            self._close_before(w - self.lag)
+
+    def _close_before(self, limit: int) -> None:
+        for w in sorted(k for k in self.open if k < limit):
+            if self.hold_until is not None and w <= self.hold_until:
+                continue
+            self.emit(self.open.pop(w).close(w, self.window, self.min_symbols))
+            self.closed_upto = max(self.closed_upto, w)
+
+    def close_all(self) -> None:
+        self.hold_until = None
+        self._close_before(self.newest + 1)
+
+    def merge_totals(self, other: "Analyzer") -> None:
+        self.lines += other.lines
+        self.bad_lines += other.bad_lines
+        self.late += other.late
+        self.verbs.update(other.verbs)
+        self.symbols.merge(other.symbols)
+        self.distinct_symbols.merge(other.distinct_symbols)
+        self.distinct_agents.merge(other.distinct_agents)
+        self.heavy.merge(other.heavy)
+        self.sample.merge(other.sample)
+
+
+def consume(analyzer: Analyzer, lines, codec: GlyphCodec) -> None:
+    decode = codec.decode
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            packet = decode(line)
+        except ValueError:
+            analyzer.bad_lines += 1
+            continue
+        analyzer.add(packet, line.rstrip("\n"))
+
+
+class RowWriter:
+    """Writes closed windows in order and adds each one's drift from the previous window."""
+
+    def __init__(self, out) -> None:
+        self.out = out
+        self.previous: dict | None = None
+        self.last_window = -1
+        self.windows = 0
+        self.divergence_sum = 0.0
+        self.divergence_max = (0.0, None)
+        self.drift_sum = 0.0
+        self.drift_max = (0.0, None)
+        self.drift_n = 0
+
+    def write(self, row: dict) -> None:
+        dist = _distribution(dict(row["top"]), row["symbols"]) if row["symbols"] else None
+        row["drift"] = None
+        if dist is not None and self.previous is not None:
+            row["drift"] = round(jensen_shannon(self.previous, dist), 6)
+            self.drift_sum += row["drift"]
+            self.drift_n += 1
+            self.drift_max = max(self.drift_max, (row["drift"], row["window"]))
+        if dist is not None:
+            self.previous = dist
+        self.windows += 1
+        self.last_window = row["window"]
+        if row["divergence_mean"] is not None:
+            self.divergence_sum += row["divergence_mean"]
+            self.divergence_max = max(self.divergence_max, (row["divergence_max"], row["window"]))
+        if self.out is not None:
+            self.out.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def summary(self) -> dict:
+        return {
+            "windows": self.windows,
+            "divergence_mean": round(self.divergence_sum / self.windows, 6) if self.windows else None,
+            "divergence_max": {"value": self.divergence_max[0], "window": self.divergence_max[1]},
+            "drift_mean": round(self.drift_sum / self.drift_n, 6) if self.drift_n else None,
+            "drift_max": {"value": self.drift_max[0], "window": self.drift_max[1]},
+        }
+
+
+# ——— single process / process pool ———
+
+def byte_ranges(path: Path, chunk_bytes: int) -> list[tuple[int, int]]:
+    size = path.stat().st_size
+    return [(start, min(size, start + chunk_bytes)) for start in range(0, size, chunk_bytes)] or [(0, 0)]
+
+
+def _range_lines(path: Path, start: int, end: int):
+    """Lines that *start* inside [start, end): the line straddling ``start`` belongs to the previous range."""
+    with path.open("rb") as f:
+        f.seek(start)
+        if start:
+            f.seek(start - 1)
+            if f.read(1) != b"\n":
+                f.readline()
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            yield line.decode("utf-8")
+
+
+_worker: dict = {}
+
+
+def _init_worker(settings: dict) -> None:
+    _worker["codec"] = GlyphCodec(load_alphabet())
+    _worker["settings"] = settings
+
+
+def _analyze_range(job: tuple[int, Path, int, int]) -> Analyzer:
+    index, path, start, end = job
+    settings = _worker["settings"]
+    analyzer = Analyzer(seed=f"chunk:{index}", record=True, **settings)
+    lines = _range_lines(path, start, end)
+    codec = _worker["codec"]
+    # The first windows of a range may have started in the previous range: hold them open.
+    for line in lines:
+        if line.strip():
+            try:
+                first = codec.decode(line)
+            except ValueError:
+                analyzer.bad_lines += 1
+                continue
+            analyzer.hold_until = first.seq // analyzer.window + analyzer.lag
+            analyzer.add(first, line.rstrip("\n"))
+            break
+    consume(analyzer, lines, codec)
+    return analyzer
+
+
+def analyze(path: Path, rows_out=None, workers: int = 1, chunk_mb: float = CHUNK_MB, **settings) -> dict:
+    t0 = time.perf_counter()
+    writer = RowWriter(rows_out)
+    if workers <= 1:
+        total = Analyzer(emit=writer.write, **settings)
+        with path.open("r", encoding="utf-8") as f:
+            consume(total, f, GlyphCodec(load_alphabet()))
+        total.close_all()
+    else:
+        total = Analyzer(**settings)
+        pending: dict[int, Window] = {}
+
+        def keep(w: int, win: Window) -> None:
+            if w <= writer.last_window:
+                total.late += win.packets            # its window was already written
+            elif w in pending:
+                pending[w].merge(win)
+            else:
+                pending[w] = win
+
+        jobs = [(i, path, s, e) for i, (s, e) in enumerate(byte_ranges(path, int(chunk_mb * 1e6)))]
+        with Pool(workers, initializer=_init_worker, initargs=(settings,)) as pool:
+            for part in pool.imap(_analyze_range, jobs):
+                total.merge_totals(part)
+                # Edge windows of this range: merge with what earlier ranges left open.
+                head = sorted(part.open)
+                first_row = part.rows[0]["window"] if part.rows else None
+                for w in head:
+                    if first_row is None or w < first_row:
+                        keep(w, part.open.pop(w))
+                # Everything pending before this range's first closed window is complete now.
+                if first_row is not None:
+                    for w in sorted(k for k in pending if k < first_row):
+                        writer.write(pending.pop(w).close(w, total.window, total.min_symbols))
+                for row in part.rows:
+                    stale = pending.pop(row["window"], None)
+                    if stale is not None:
+                        total.late += stale.packets      # out of order by more than --lag
+                    writer.write(row)
+                for w, win in part.open.items():
+                    keep(w, win)
+        for w in sorted(pending):
+            writer.write(pending.pop(w).close(w, total.window, total.min_symbols))
+
+    took = time.perf_counter() - t0
+    size_mb = path.stat().st_size / 1e6
+    return {
+        "log": str(path),
+        "lines": total.lines,
+        "bad_lines": total.bad_lines,
+        "late": total.late,
+        "seconds": round(took, 3),
+        "lines_per_s": round(total.lines / took) if took else None,
+        "mb_per_s": round(size_mb / took, 2) if took else None,
+        "verbs": {v: total.verbs.get(v, 0) for v in VERBS},
+        "distinct_symbols": total.distinct_symbols.estimate(),
+        "distinct_agents": total.distinct_agents.estimate(),
+        "top_symbols": [
+            {"symbol": sym, "count_min": total.symbols.estimate(sym), "misra_gries": n}
+            for sym, n in total.heavy.top(20)
+        ],
+        **writer.summary(),
+        "sample": total.sample.items,
+    }
+
+
+# ——— synthetic logs ———
+
+def generate(path: Path, packets: int, agents: int, vocabulary: int, drift: float, seed: int) -> int:
+    """Write a glyph log where a quarter of the agents drift toward fresh symbols as seq grows."""
+    rng = random.Random(seed)
+    codec = GlyphCodec(load_alphabet())
+    words = ["".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(rng.randint(3, 8)))
+             for _ in range(vocabulary * 2)]
+    common, fresh = words[:vocabulary], words[vocabulary:]
+    weights = [1 / (i + 1) for i in range(vocabulary)]
+    names = [f"AGENT-{i}" for i in range(agents)]
+    drifters = set(names[: max(1, agents // 4)])
+    with path.open("w", encoding="utf-8") as f:
+        for seq in range(packets):
+            source = rng.choice(names)
+            symbols = rng.choices(common, weights, k=rng.randint(1, 4))
+            if source in drifters and rng.random() < drift * seq / packets:
+                symbols[rng.randrange(len(symbols))] = rng.choice(fresh)
+            packet = SpellPacket(rng.choice(VERBS), source, rng.choice(names), seq, tuple(symbols))
+            f.write(codec.encode(packet) + "\n")
+    return packets
+
+
+# ——— CLI ———
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Streaming drift analytics over spell-packet logs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("analyze", help="Summarise a glyph log and score per-window divergence.")
+    p.add_argument("log", type=Path)
+    p.add_argument("--window", type=int, default=WINDOW, help="Seq numbers per window.")
+    p.add_argument("--lag", type=int, default=LAG, help="Windows kept open behind the newest one.")
+    p.add_argument("--min-symbols", type=int, default=MIN_SYMBOLS, help="Symbols an agent needs to be scored.")
+    p.add_argument("--sample", type=int, default=SAMPLE, help="Reservoir size for raw lines.")
+    p.add_argument("--workers", type=int, default=1, help="Processes (0 = one per CPU).")
+    p.add_argument("--chunk-mb", type=float, default=CHUNK_MB, help="Bytes per worker job.")
+    p.add_argument("--rows", type=Path, help="Write one JSON line per closed window.")
+    p.add_argument("--json", type=Path, help="Also write the summary here.")
+    p = sub.add_parser("generate", help="Write a synthetic drifting log.")
+    p.add_argument("log", type=Path)
+    p.add_argument("--packets", type=int, default=200_000)
+    p.add_argument("--agents", type=int, default=64)
+    p.add_argument("--vocabulary", type=int, default=512)
+    p.add_argument("--drift", type=float, default=0.3, help="Replacement probability reached by the last seq.")
+    p.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.command == "generate":
+        args.log.parent.mkdir(parents=True, exist_ok=True)
+        t0 = time.perf_counter()
+        n = generate(args.log, args.packets, args.agents, args.vocabulary, args.drift, args.seed)
+        print(f"[ok] {n} packets → {args.log} in {time.perf_counter() - t0:.1f} s")
+        return 0
+
+    if not args.log.exists():
+        raise SystemExit(f"No log at {args.log}. Run `spell_relay.py simulate --log ...` first.")
+    settings = {"window": args.window, "lag": args.lag, "min_symbols": args.min_symbols, "sample": args.sample}
+    workers = args.workers or os.cpu_count() or 1
+    rows_out = None
+    if args.rows:
+        args.rows.parent.mkdir(parents=True, exist_ok=True)
+        rows_out = args.rows.open("w", encoding="utf-8")
+    try:
+        summary = analyze(args.log, rows_out, workers, args.chunk_mb, **settings)
+    finally:
+        if rows_out is not None:
+            rows_out.close()
+    text = json.dumps(summary, ensure_ascii=False, indent=2)
+    print(text)
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(text, encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,16 +6,15 @@
 
 import json, csv, pathlib, unicodedata, re
 from collections import defaultdict
+from functools import lru_cache
+
+import instrument
 
 ROOT = pathlib.Path(__file__).resolve().parent.parent
 RAW  = ROOT / "data" / "raw"
 OUT  = ROOT / "data" / "out"
-OUT.mkdir(parents=True, exist_ok=True)
-
-# ——— 1) 读取现有 latin_all.json ———
-latin = json.loads((RAW / "latin_all.json").read_text(encoding="utf-8"))
 
-# ——— 2) 工具：基字母（去组合符）+ 主特征抽取 ———
+# ——— 1) 工具：基字母（去组合符）+ 主特征抽取 ———
 MN = {"Mn", "Me"}
 
 FEATURE_PRIORITY = [
@@ -33,15 +32,10 @@ FEATURE_PRIORITY = [
 # 可按需在这里把某些名字直接映射到 ASCII 基字母（完全可空，不算“写死”，只是钩子）
 ASCII_HINT = {}
 
-name_cache = {}
-
+# 名字缓存：不设上限（字母总数有限），用 lru_cache 是为了能数命中率
+@lru_cache(maxsize=None)
 def u_name(ch:str) -> str:
-    if ch in name_cache: return name_cache[ch]
-    try:
-        name_cache[ch] = unicodedata.name(ch)
-    except ValueError:
-        name_cache[ch] = ""
-    return name_cache[ch]
+    return unicodedata.name(ch, "")
 
 
 def base_letter(ch: str) -> str:
@@ -66,68 +60,99 @@ def primary_feature(name: str) -> str:
     m = re.search(r"WITH ([A-Z ]+)", name)
     return m.group(1) if m else "NONE"
 
-# ——— 3) 建族（base → feature → members）———
-Families: dict[str, dict[str, list[dict]]] = defaultdict(lambda: defaultdict(list))
-
-for e in latin:
-    ch   = e["char"]
-    name = e.get("name") or u_name(ch)
-    base = base_letter(ch)
-    feat = primary_feature(name)
-    item = {
-        "char": ch,
-        "codepoint": e.get("codepoint"),
-        "name": name,
-        "case": ("U" if ch.isupper() else ("L" if ch.islower() else "?")),
-    }
-    Families[base][feat].append(item)
-
-# ——— 4) 导出：不排序、不打分 ———
-# 4.1 families.json（层级：base → feature → members[]）
-
-families_out = []
-for base in sorted(Families.keys()):
-    features = []
-    for feat, members in sorted(Families[base].items()):
-        # 成员保持原始输入顺序；不排序
-        features.append({
-            "feature": feat,
-            "size": len(members),
-            "members": members,
-        })
-    families_out.append({
-        "base": base,
-        "size": sum(len(v) for v in Families[base].values()),
-        "features": features,
-    })
-
-(OUT / "families.json").write_text(
-    json.dumps(families_out, ensure_ascii=False, indent=2), encoding="utf-8"
-)
-
-# 4.2 char_groups.csv（扁平视图：便于筛选/打印）
-with open(OUT / "char_groups.csv", "w", newline="", encoding="utf-8") as f:
-    w = csv.writer(f)
-    w.writerow(["base", "feature", "size", "chars", "codepoints"])
+# ——— 2) 建族（base → feature → members）———
+def group_letters(latin: list[dict]) -> dict[str, dict[str, list[dict]]]:
+    Families: dict[str, dict[str, list[dict]]] = defaultdict(lambda: defaultdict(list))
+
+    for e in latin:
+        ch   = e["char"]
+        name = e.get("name") or u_name(ch)
+        base = base_letter(ch)
+        feat = primary_feature(name)
+        item = {
+            "char": ch,
+            "codepoint": e.get("codepoint"),
+            "name": name,
+            "case": ("U" if ch.isupper() else ("L" if ch.islower() else "?")),
+        }
+        Families[base][feat].append(item)
+    return Families
+
+
+# ——— 3) 导出：不排序、不打分 ———
+# 3.1 families.json（层级：base → feature → members[]）
+def families_json(Families) -> list[dict]:
+    families_out = []
     for base in sorted(Families.keys()):
+        features = []
         for feat, members in sorted(Families[base].items()):
-            w.writerow([
-                base,
-                feat,
-                len(members),
-                "".join(m["char"] for m in members),
-                " ".join(m.get("codepoint","?") for m in members)
-            ])
-
-# 4.3 char_list.txt（全量清单，供人工视检）
-with open(OUT / "char_list.txt", "w", encoding="utf-8") as f:
-    for base in sorted(Families.keys()):
-        f.write(f"# BASE {base}\n")
-        for feat, members in sorted(Families[base].items()):
-            f.write(f"## {feat} ({len(members)})\n")
-            for m in members:
-                f.write(f"{m['char']}\t{m.get('codepoint','?')}\t{m['name']}\t{m['case']}\n")
-            f.write("\n")
-
-print("✓ 分组完成（无排序/无打分）：families.json, char_groups.csv, char_list.txt → data/out/")
-print("千夏：我拿纸来印。\n夜弦：每个家都有自己的窗子，慢慢挑，慢慢亮。")
\ No newline at end of file
+            # 成员保持原始输入顺序；不排序
+            features.append({
+                "feature": feat,
+                "size": len(members),
+                "members": members,
+            })
+        families_out.append({
+            "base": base,
+            "size": sum(len(v) for v in Families[base].values()),
+            "features": features,
+        })
+    return families_out
+
+
+def write_outputs(Families, out: pathlib.Path = OUT) -> None:
+    out.mkdir(parents=True, exist_ok=True)
+    with instrument.span("families.json"):
+        (out / "families.json").write_text(
+            json.dumps(families_json(Families), ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+    instrument.file_written("families.json", out / "families.json")
+
+    # 3.2 char_groups.csv（扁平视图：便于筛选/打印）
+    with open(out / "char_groups.csv", "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["base", "feature", "size", "chars", "codepoints"])
+        for base in sorted(Families.keys()):
+            for feat, members in sorted(Families[base].items()):
+                w.writerow([
+                    base,
+                    feat,
+                    len(members),
+                    "".join(m["char"] for m in members),
+                    " ".join(m.get("codepoint","?") for m in members)
+                ])
+    instrument.file_written("char_groups.csv", out / "char_groups.csv")
+
+    # 3.3 char_list.txt（全量清单，供人工视检）
+    with open(out / "char_list.txt", "w", encoding="utf-8") as f:
+        for base in sorted(Families.keys()):
+            f.write(f"# BASE {base}\n")
+            for feat, members in sorted(Families[base].items()):
+                f.write(f"## {feat} ({len(members)})\n")
+                for m in members:
+                    f.write(f"{m['char']}\t{m.get('codepoint','?')}\t{m['name']}\t{m['case']}\n")
+                f.write("\n")
+    instrument.file_written("char_list.txt", out / "char_list.txt")
+
+
+def main() -> None:
+    with instrument.run("group"):
+        # 读取现有 latin_all.json
+        with instrument.span("load"):
+            latin = json.loads((RAW / "latin_all.json").read_text(encoding="utf-8"))
+        instrument.file_read("latin_all.json", RAW / "latin_all.json")
+        instrument.watch_cache("u_name", u_name)
+
+        with instrument.span("group"):
+            Families = group_letters(latin)
+        instrument.count("letters", len(latin))
+        instrument.count("families", len(Families))
+        with instrument.span("write"):
+            write_outputs(Families)
+
+    print("✓ 分组完成（无排序/无打分）：families.json, char_groups.csv, char_list.txt → data/out/")
+    print("千夏：我拿纸来印。\n夜弦：每个家都有自己的窗子，慢慢挑，慢慢亮。")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,29 +2,31 @@
 # 千夏: 哥哥，我把 1252 个孩子都拉回来了，怎么分房间呢？
 # 夜弦: 先按“基字母”分族，再听一耳朵谁更合 E8 的和声。
 
-import json, csv, pathlib, unicodedata, re
+import argparse, json, csv, pathlib, unicodedata, re
 from collections import defaultdict, Counter
 
+import instrument
+
 ROOT = pathlib.Path(__file__).resolve().parent.parent
 RAW  = ROOT / "data" / "raw"
 OUT  = ROOT / "data" / "out"
-OUT.mkdir(parents=True, exist_ok=True)
 
-# ——— 1) 加载原始 latin 列表 ———
-latin = json.loads((RAW / "latin_all.json").read_text(encoding="utf-8"))
+TARGET = 216         # 你可改成 144 / 192 / 288 …
+PER_FAMILY = 4       # 每族最多选多少（先大小写各1，再两枚附加符代表）
 
-# ——— 2) 工具：去掉组合符，得到“基字母”（NFD 再剔除 Mn）
+# ——— 1) 工具：去掉组合符，得到“基字母”（NFD 再剔除 Mn）
 def base_letter(ch: str) -> str:
     nfd = unicodedata.normalize("NFD", ch)
     return "".join(c for c in nfd if unicodedata.category(c) != "Mn")
 
-# ——— 3) 特征模板（8维 E8 影子）———
+# ——— 2) 特征模板（8维 E8 影子）———
 V_SYM_SET_U = set("AHIMOTUVWXY")
 V_SYM_SET_L = set("ahimotuvwx y".replace(" ", "")) | set("io")
 H_SYM_SET   = set("oOxX")
 ASC_SET     = set("bdfhklt")
 DES_SET     = set("gjpqy")
 LOOP_SET    = set("abdegopqABDOPQR")
+RASTER_SYM_MIN = 0.95   # --raster：镜像相关 ≥ 这个才算对称（H≈1.00，b≈0.76）
 
 DIACRITIC_KEYS = {
     "ACUTE": "acute", "GRAVE":"grave", "CIRCUMFLEX":"circumflex", "CARON":"caron",
@@ -33,7 +35,7 @@ DIACRITIC_KEYS = {
     "DIAERESIS":"diaeresis"
 }
 
-def letter_features(ch: str, name: str):
+def letter_features(ch: str, name: str, raster: dict | None = None):
     base = base_letter(ch)
     base0 = base.lower()[:1] if base else ch.lower()
     is_upper = ch.isupper()
@@ -47,6 +49,20 @@ def letter_features(ch: str, name: str):
     des = 1 if base0 in DES_SET else 0
     loop = 1 if base0 in set(c.lower() for c in LOOP_SET) else 0
 
+    # 千夏: 集合是猜的呀～  夜弦: 有栅格就信像素（glyph_raster.py），没字体覆盖的还用猜的。
+    measured = {}
+    if raster is not None:
+        v_sym = 1 if raster["v_sym"] >= RASTER_SYM_MIN else 0
+        h_sym = 1 if raster["h_sym"] >= RASTER_SYM_MIN else 0
+        asc, des = raster["asc"], raster["des"]
+        loop = 1 if raster["holes"] else 0
+        measured = {
+            "v_sym_score": raster["v_sym"],
+            "h_sym_score": raster["h_sym"],
+            "holes": raster["holes"],
+            "density": raster["density"],
+        }
+
     # 结构改动：STROKE/BAR/HOOK 等
     structural = 1 if re.search(r"\b(STROKE|BAR|HOOK)\b", name) else 0
 
@@ -73,10 +89,11 @@ def letter_features(ch: str, name: str):
         "structural": structural,
         "dia_count": dia_count,
         "dia_complex": float(dia_complex),
-        "base": base0
+        "base": base0,
+        **measured
     }
 
-# ——— 4) 权重（可调）———
+# ——— 3) 权重（可调）———
 W = {
     "v_sym": 0.30,
     "h_sym": 0.10,
@@ -91,79 +108,137 @@ W = {
 def score(feat):
     return sum(W[k] * feat[k] for k in W)
 
-# ——— 5) 建族 + 打分 ———
-families = defaultdict(list)
-
-for e in latin:
-    ch   = e["char"]
-    name = e["name"]
-    f = letter_features(ch, name)
-    s = score(f)
-    item = {
-        "char": ch,
-        "codepoint": e["codepoint"],
-        "name": name,
-        "is_upper": ch.isupper(),
-        "features": f,
-        "score": round(s, 6)
-    }
-    families[f["base"]].append(item)
-
-# ——— 6) 导出家族与候选清单 ———
-# families.json
-fam_out = []
-for base, members in sorted(families.items()):
-    fam_out.append({
-        "base": base,
-        "size": len(members),
-        "members": sorted(members, key=lambda x: x["score"], reverse=True)
-    })
-(OUT / "families.json").write_text(json.dumps(fam_out, ensure_ascii=False, indent=2), encoding="utf-8")
-
-# ranked_candidates.csv（全体按分数降序）
-flat = []
-for base, members in families.items():
-    for m in members:
-        flat.append({
+# ——— 4) 建族 + 打分 ———
+def rank_letters(latin: list[dict], raster: dict[str, dict] | None = None) -> dict[str, list[dict]]:
+    families = defaultdict(list)
+    raster = raster or {}
+
+    for e in latin:
+        ch   = e["char"]
+        name = e["name"]
+        f = letter_features(ch, name, raster.get(ch))
+        s = score(f)
+        item = {
+            "char": ch,
+            "codepoint": e["codepoint"],
+            "name": name,
+            "is_upper": ch.isupper(),
+            "features": f,
+            "score": round(s, 6)
+        }
+        families[f["base"]].append(item)
+    return families
+
+
+# ——— 5) 家族表与候选清单 ———
+def family_table(families) -> list[dict]:
+    fam_out = []
+    for base, members in sorted(families.items()):
+        fam_out.append({
             "base": base,
-            "char": m["char"],
-            "codepoint": m["codepoint"],
-            "name": m["name"],
-            "score": m["score"]
+            "size": len(members),
+            "members": sorted(members, key=lambda x: x["score"], reverse=True)
         })
-flat.sort(key=lambda x: x["score"], reverse=True)
-
-with open(OUT / "ranked_candidates.csv", "w", newline="", encoding="utf-8") as f:
-    w = csv.DictWriter(f, fieldnames=list(flat[0].keys()))
-    w.writeheader(); w.writerows(flat)
+    return fam_out
+
+
+def ranked_rows(families) -> list[dict]:
+    # 全体按分数降序
+    flat = []
+    for base, members in families.items():
+        for m in members:
+            flat.append({
+                "base": base,
+                "char": m["char"],
+                "codepoint": m["codepoint"],
+                "name": m["name"],
+                "score": m["score"]
+            })
+    flat.sort(key=lambda x: x["score"], reverse=True)
+    return flat
+
+
+# ——— 6) 给一个“选型建议”——按目标规模挑代表 ———
+def suggest_selection(fam_out, target: int = TARGET, per_family: int = PER_FAMILY) -> list[dict]:
+    selection = []
+    for fam in fam_out:
+        picks = []
+        uppers = [m for m in fam["members"] if m["is_upper"]]
+        lowers = [m for m in fam["members"] if not m["is_upper"]]
+        if uppers: picks.append(uppers[0])
+        if lowers: picks.append(lowers[0])
+        # 继续从剩余里选高分者到 per_family
+        remain = [m for m in fam["members"] if m not in picks]
+        remain.sort(key=lambda x: x["score"], reverse=True)
+        for m in remain[:max(0, per_family - len(picks))]:
+            picks.append(m)
+        selection.extend(picks)
+
+    # 全体限额到 target
+    selection.sort(key=lambda x: x["score"], reverse=True)
+    return selection[:target]
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rank Latin letters into E8 families.")
+    parser.add_argument("--raster", action="store_true",
+                        help="Measure symmetry/ascender/descender/loop on rendered glyphs (glyph_raster.py).")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    with instrument.run("rank"):
+        _main(raster=args.raster)
+
+
+def _main(raster: bool = False) -> None:
+    OUT.mkdir(parents=True, exist_ok=True)
+    # 加载原始 latin 列表
+    with instrument.span("load"):
+        latin = json.loads((RAW / "latin_all.json").read_text(encoding="utf-8"))
+    instrument.file_read("latin_all.json", RAW / "latin_all.json")
+    measured = None
+    if raster:
+        import glyph_raster  # numpy + matplotlib，只有 --raster 才需要
+        with instrument.span("raster"):
+            measured = glyph_raster.raster_features([e["char"] for e in latin])
+        instrument.count("raster_measured", len(measured))
+        print(f"✓ Raster features: {len(measured)}/{len(latin)} glyphs (the rest keep the letter-set guesses)")
+    with instrument.span("features"):
+        families = rank_letters(latin, measured)
+    instrument.count("letters", len(latin))
+    instrument.count("families", len(families))
+
+    # families.json
+    with instrument.span("write.families"):
+        fam_out = family_table(families)
+        (OUT / "families.json").write_text(json.dumps(fam_out, ensure_ascii=False, indent=2), encoding="utf-8")
+    instrument.file_written("families.json", OUT / "families.json")
+
+    # ranked_candidates.csv
+    with instrument.span("write.ranked"):
+        flat = ranked_rows(families)
+        with open(OUT / "ranked_candidates.csv", "w", newline="", encoding="utf-8") as f:
+            w = csv.DictWriter(f, fieldnames=list(flat[0].keys()))
+            w.writeheader(); w.writerows(flat)
+    instrument.file_written("ranked_candidates.csv", OUT / "ranked_candidates.csv")
+
+    with instrument.span("select"):
+        selection = suggest_selection(fam_out)
+        (OUT / "selection_suggestion.json").write_text(
+            json.dumps(selection, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+    instrument.count("selected", len(selection))
+    instrument.file_written("selection_suggestion.json", OUT / "selection_suggestion.json")
+
+    print(f"✓ Families: {len(families)} bases")
+    print(f"✓ Ranked list → {OUT/'ranked_candidates.csv'}")
+    print(f"✓ Suggestion ({TARGET}) → {OUT/'selection_suggestion.json'}")
+    print("千夏: 先听一版和声吧！")
+    print("夜弦: 权重在脚本 W 里，随时调，直到它会发光。")
+
+
+if __name__ == "__main__":
+    main()
 
-# ——— 7) 给一个“选型建议”——按目标规模挑代表 ———
-TARGET = 216         # 你可改成 144 / 192 / 288 …
-PER_FAMILY = 4       # 每族最多选多少（先大小写各1，再两枚附加符代表）
-selection = []
-for fam in fam_out:
-    picks = []
-    uppers = [m for m in fam["members"] if m["is_upper"]]
-    lowers = [m for m in fam["members"] if not m["is_upper"]]
-    if uppers: picks.append(uppers[0])
-    if lowers: picks.append(lowers[0])
-    # 继续从剩余里选高分者到 PER_FAMILY
-    remain = [m for m in fam["members"] if m not in picks]
-    remain.sort(key=lambda x: x["score"], reverse=True)
-    for m in remain[:max(0, PER_FAMILY - len(picks))]:
-        picks.append(m)
-    selection.extend(picks)
-
-# 全体限额到 TARGET
-selection.sort(key=lambda x: x["score"], reverse=True)
-selection = selection[:TARGET]
-
-(OUT / "selection_suggestion.json").write_text(
-    json.dumps(selection, ensure_ascii=False, indent=2), encoding="utf-8"
-)
-
-print(f"✓ Families: {len(families)} bases")
-print(f"✓ Ranked list → {OUT/'ranked_candidates.csv'}")
-print(f"✓ Suggestion ({TARGET}) → {OUT/'selection_suggestion.json'}")
-print("千夏: 先听一版和声吧！")
-print("夜弦: 权重在脚本 W 里，随时调，直到它会发光。")
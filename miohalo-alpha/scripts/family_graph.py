@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Link letters into families through decomposition and case mappings.
+
+Unlike ``e8_family_grouper.py`` (first-letter heuristic + name regex), this
+builder follows the data ``collect_latin.py`` already records: every letter is
+joined to the first code point of its canonical/compatibility decomposition and
+to its single-character upper/lower case partners.  A union-find structure keeps
+the whole pass near-linear, so the full Unicode letter inventory is as cheap as
+the Latin subset.
+
+Usage:
+  python scripts/family_graph.py                   # data/raw/latin_all.json
+  python scripts/family_graph.py --scope all       # every Unicode letter (L*)
+  python scripts/family_graph.py --min-size 2 --out data/out/family_graph.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass
+
+from collect_latin import collect_letters
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+RAW = ROOT / "data" / "raw"
+OUT = ROOT / "data" / "out"
+
+
+class DisjointSet:
+    """Union-find over dense integer ids (union by size + path halving)."""
+
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> int:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return ra
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+        return ra
+
+
+@dataclass(frozen=True)
+class Edge:
+    src: str
+    dst: str
+    relation: str  # canonical | compat:<tag> | component:<tag> | upper | lower
+
+
+def relation_edges(entry: dict) -> list[Edge]:
+    """Relations recorded for one letter entry (``collect_latin`` record shape)."""
+    ch = entry["char"]
+    edges: list[Edge] = []
+
+    decomp = entry.get("decomposition")
+    if decomp is None:
+        decomp = unicodedata.decomposition(ch)
+    if decomp:
+        parts = decomp.split()
+        tag = ""
+        if parts[0].startswith("<"):
+            tag = parts.pop(0).strip("<>")
+        targets = [chr(int(p, 16)) for p in parts]
+        if targets:
+            # Only the leading code point carries the letter identity; later ones are
+            # combining marks (canonical) or further ligature parts (compatibility).
+            edges.append(Edge(ch, targets[0], f"compat:{tag}" if tag else "canonical"))
+            if tag:
+                for t in targets[1:]:
+                    edges.append(Edge(ch, t, f"component:{tag}"))
+
+    for field in ("uppercase", "lowercase"):
+        other = entry.get(field)
+        if other is None:
+            other = ch.upper() if field == "uppercase" else ch.lower()
+        if len(other) == 1 and other != ch:
+            edges.append(Edge(ch, other, field.removesuffix("case")))
+    return edges
+
+
+# Relations that merge families; ``component`` edges are reported but do not merge,
+# otherwise ligatures such as U+01C6 (dž) would fuse the D and Z families.
+UNION_RELATIONS = ("canonical", "compat:", "upper", "lower")
+
+
+def build_families(entries: list[dict], min_size: int = 1) -> list[dict]:
+    index = {e["char"]: i for i, e in enumerate(entries)}
+    dsu = DisjointSet(len(entries))
+    edges_by_node: list[list[Edge]] = [[] for _ in entries]
+
+    for i, entry in enumerate(entries):
+        for edge in relation_edges(entry):
+            j = index.get(edge.dst)
+            if j is None:
+                continue
+            edges_by_node[i].append(edge)
+            if edge.relation.startswith(UNION_RELATIONS):
+                dsu.union(i, j)
+
+    groups: dict[int, list[int]] = defaultdict(list)
+    for i in range(len(entries)):
+        groups[dsu.find(i)].append(i)
+
+    families = []
+    for members in groups.values():
+        if len(members) < min_size:
+            continue
+        members.sort(key=lambda i: ord(entries[i]["char"]))
+        # Representative: the member with no decomposition of its own, lowest code point.
+        rep = next(
+            (i for i in members if not (entries[i].get("decomposition") or "").strip()),
+            members[0],
+        )
+        families.append({
+            "root": entries[rep]["char"],
+            "root_codepoint": f"U+{ord(entries[rep]['char']):04X}",
+            "size": len(members),
+            "members": [
+                {
+                    "char": entries[i]["char"],
+                    "codepoint": f"U+{ord(entries[i]['char']):04X}",
+                    "name": entries[i].get("name") or unicodedata.name(entries[i]["char"], ""),
+                }
+                for i in members
+            ],
+            "edges": [
+                {"src": e.src, "dst": e.dst, "relation": e.relation}
+                for i in members
+                for e in edges_by_node[i]
+            ],
+        })
+
+    families.sort(key=lambda f: (-f["size"], f["root_codepoint"]))
+    return families
+
+
+def load_entries(scope: str) -> list[dict]:
+    if scope == "all":
+        return collect_letters(lambda name, cat: cat.startswith("L"))
+    src = RAW / "latin_all.json"
+    if not src.exists():
+        raise SystemExit("latin_all.json missing. Run scripts/collect_latin.py first.")
+    return json.loads(src.read_text(encoding="utf-8"))
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build letter families from decomposition and case links.")
+    parser.add_argument("--scope", choices=("latin", "all"), default="latin",
+                        help="latin = data/raw/latin_all.json, all = every Unicode letter.")
+    parser.add_argument("--min-size", type=int, default=1, help="Drop families smaller than this.")
+    parser.add_argument("--out", type=pathlib.Path, default=None,
+                        help="Output JSON (default data/out/family_graph[_all].json).")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    entries = load_entries(args.scope)
+    families = build_families(entries, min_size=args.min_size)
+
+    out = args.out or OUT / ("family_graph.json" if args.scope == "latin" else "family_graph_all.json")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(families, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    edges = sum(len(f["edges"]) for f in families)
+    print(f"[ok] {len(entries)} letters → {len(families)} families, {edges} relation edges → {out}")
+
+
+if __name__ == "__main__":
+    main()
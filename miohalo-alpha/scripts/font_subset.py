@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Per-selection font subsets for the audit, preview and homepage.
+
+The audit and the preview read every fallback font in full (a whole Noto Sans
+or Noto Sans SC) to use a few hundred of its glyphs.  This stage cuts each
+fallback font down, with ``fontTools.subset``, to the code points the active
+selections need:
+
+* every code point, and every NFD code point, of ``selection_suggestion.json``
+  (so combining marks stay covered);
+* the 26 signs of ``az_cuneiform_selection.json``.
+
+Subsets keep all OpenType layout features (mark positioning for the combining
+sequences) and are written as TTF/OTF, plus WOFF2 when ``brotli`` is installed.
+They live in ``data/cache/subsets/<selection hash>/`` with a ``manifest.json``;
+each file name also carries a key of its source font (name, size, mtime), so a
+changed selection or font only rebuilds what it has to.  This stage prunes
+the directories of older selections; ``audit_font_coverage.py --subsets`` and
+``preview_miohalo_selection.py --subsets`` build what they miss but never
+delete subsets another checkout or run may still use.
+
+Usage:
+  python miohalo-alpha/scripts/font_subset.py               # build/refresh subsets for the current selections
+  python miohalo-alpha/scripts/font_subset.py --force
+  python miohalo-alpha/scripts/preview_miohalo_selection.py --subsets
+  python miohalo-alpha/scripts/miohalo.py audit -- --subsets
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+import paths
+
+SUBSET_VERSION = 1
+SUBSET_DIR = paths.ALPHA_ROOT / "data" / "cache" / "subsets"
+MANIFEST = "manifest.json"
+
+
+def has_woff2() -> bool:
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def selection_codepoints(selection_json: Path = paths.SELECTION_JSON,
+                         az_json: Path = paths.AZ_SELECTION_JSON) -> list[int]:
+    """Sorted code points the Latin selection and the A–Z cuneiform table need."""
+    cps: set[int] = set()
+    if selection_json.exists():
+        for it in json.loads(selection_json.read_text(encoding="utf-8")):
+            ch = it.get("char", "") if isinstance(it, dict) else str(it)
+            cps.update(map(ord, ch))
+            cps.update(map(ord, unicodedata.normalize("NFD", ch)))
+    if az_json.exists():
+        for r in json.loads(az_json.read_text(encoding="utf-8")):
+            cps.update(map(ord, r.get("char") or ""))
+    return sorted(cps)
+
+
+def selection_hash(codepoints: list[int]) -> str:
+    blob = json.dumps([SUBSET_VERSION, codepoints]).encode()
+    return hashlib.sha256(blob).hexdigest()[:16]
+
+
+def font_key(path: str) -> str:
+    st = os.stat(path)
+    return hashlib.sha256(f"{Path(path).name}:{st.st_size}:{st.st_mtime_ns}".encode()).hexdigest()[:10]
+
+
+def subset_font(src: str, codepoints: list[int], out_dir: Path, woff2: bool) -> dict:
+    """Write the subset of ``src`` restricted to ``codepoints``; returns its manifest entry."""
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+
+    options = subset.Options()
+    options.layout_features = ["*"]
+    options.name_IDs = ["*"]
+    options.notdef_outline = True
+    options.recalc_bounds = True
+    options.drop_tables += ["DSIG", "FFTM"]
+
+    collection = Path(src).suffix.lower() in (".ttc", ".otc")
+    font = TTFont(src, fontNumber=0 if collection else -1, lazy=False)
+    covered = sorted(set(font.getBestCmap()).intersection(codepoints))
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=covered)
+    subsetter.subset(font)
+
+    suffix = ".otf" if ("CFF " in font or "CFF2" in font) else ".ttf"
+    stem = f"{Path(src).stem}.{font_key(src)}"
+    out = out_dir / f"{stem}{suffix}"
+    font.save(out)
+    entry = {"file": out.name, "woff2": None, "covered": len(covered),
+             "bytes_in": os.path.getsize(src), "bytes_out": out.stat().st_size}
+    if woff2:
+        font.flavor = "woff2"
+        font.save(out_dir / f"{stem}.woff2")
+        entry["woff2"] = f"{stem}.woff2"
+    font.close()
+    return entry
+
+
+def _load_manifest(d: Path, digest: str) -> dict:
+    path = d / MANIFEST
+    if path.exists():
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+        if manifest.get("selection_hash") == digest:
+            return manifest
+    return {"selection_hash": digest, "codepoints": 0, "fonts": {}}
+
+
+def _fresh(d: Path, src: str, entry: dict | None, woff2: bool) -> bool:
+    return (entry is not None
+            and entry["file"].startswith(f"{Path(src).stem}.{font_key(src)}.")
+            and (d / entry["file"]).exists()
+            and (not woff2 or (entry["woff2"] is not None and (d / entry["woff2"]).exists())))
+
+
+def ensure_subsets(font_paths: list[str], codepoints: list[int] | None = None,
+                   force: bool = False, verbose: bool = False,
+                   prune: bool = False, subset_dir: Path | None = None) -> list[str]:
+    """Subset paths for ``font_paths`` (same order), building only what is missing or stale.
+
+    ``prune`` removes the directories of other selections under ``subset_dir``
+    (default ``SUBSET_DIR``) once something was built.
+    """
+    codepoints = selection_codepoints() if codepoints is None else codepoints
+    subset_dir = SUBSET_DIR if subset_dir is None else subset_dir
+    digest = selection_hash(codepoints)
+    d = subset_dir / digest
+    d.mkdir(parents=True, exist_ok=True)
+    manifest = _load_manifest(d, digest)
+    manifest["codepoints"] = len(codepoints)
+    woff2 = has_woff2()
+
+    out, built = [], 0
+    for src in font_paths:
+        entry = manifest["fonts"].get(src)
+        if force or not _fresh(d, src, entry, woff2):
+            t0 = time.perf_counter()
+            entry = manifest["fonts"][src] = subset_font(src, codepoints, d, woff2)
+            built += 1
+            if verbose:
+                print(f"[ok] {Path(src).name}: {entry['covered']} glyphs, "
+                      f"{entry['bytes_in'] / 1024:.0f} KiB → {entry['bytes_out'] / 1024:.1f} KiB "
+                      f"({time.perf_counter() - t0:.2f} s)")
+        out.append((d / entry["file"]).as_posix())
+
+    if built:
+        (d / MANIFEST).write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    if built and prune:
+        for old in subset_dir.iterdir():
+            if old.is_dir() and old.name != digest:
+                shutil.rmtree(old)
+    return out
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Subset the fallback fonts to the active selections.")
+    parser.add_argument("--force", action="store_true", help="Rebuild every subset.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    font_paths = paths.font_paths()
+    if not font_paths:
+        raise SystemExit("No fonts found. Put Noto TTFs into miohalo-alpha/fonts/Noto_Sans/.")
+    codepoints = selection_codepoints()
+    if not codepoints:
+        raise SystemExit("No selection found. Run e8_family_rank_sample.py / select_cuneiform.py first.")
+
+    t0 = time.perf_counter()
+    subsets = ensure_subsets(font_paths, codepoints, force=args.force, verbose=True, prune=True)
+    size_in = sum(os.path.getsize(p) for p in font_paths)
+    size_out = sum(os.path.getsize(p) for p in subsets)
+    print(f"[ok] {len(subsets)} fonts for {len(codepoints)} code points: "
+          f"{size_in / 1024:.0f} KiB → {size_out / 1024:.1f} KiB in {time.perf_counter() - t0:.2f} s")
+    if not has_woff2():
+        print("[ok] brotli not installed: TTF/OTF only (pip install brotli for WOFF2)")
+    print(f"[ok] → {Path(subsets[0]).parent}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""Pre-rendered sprite atlas of the A–Z cuneiform signs for the homepage.
+
+``/cuneiform-map`` shows the 26 signs as text, which only works when the
+visitor has a cuneiform-capable font (the reason ``DISPLAY_SAFE_OVERRIDES``
+exists).  This stage renders every selected sign once, from the shared font
+chain (``paths.font_paths``), crops it to its ink and shelf-packs all of them
+into one atlas:
+
+* ``public/glyph-atlas/az-cuneiform.png`` — 8-bit coverage as alpha (grey +
+  alpha PNG, written directly with ``zlib`` so identical input gives identical
+  bytes); the page uses it as a CSS mask so the glyphs take the text colour;
+* ``public/glyph-atlas/az-cuneiform.svg`` — the same layout as vector outlines,
+  with a ``<view id="A">`` per letter (``az-cuneiform.svg#A`` shows one sign);
+* ``data/az_cuneiform_atlas.json`` — sprite rectangles keyed by letter, in
+  image pixels, plus ``scale`` (image px per CSS px) and the URLs.
+
+The map stores a ``source_hash`` over the selection, the fonts that actually
+provide a sign (picked from their cmaps, so unrelated system fonts do not
+make the hash machine-specific) and the layout parameters; when it matches,
+nothing is rendered (and matplotlib is never imported).  Letters that no font
+covers are listed under ``missing`` and keep the text rendering on the page.
+When no font covers any sign, no atlas is written at all and a previous one
+is removed: the page then shows every sign as text.
+
+Usage:
+  python miohalo-alpha/scripts/glyph_atlas.py            # rebuild only if selection/fonts changed
+  python miohalo-alpha/scripts/glyph_atlas.py --force
+  python miohalo-alpha/scripts/glyph_atlas.py --check    # exit 1 when the atlas is stale
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import struct
+import sys
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+import glyph_raster
+import paths
+
+ATLAS_VERSION = 1
+PX = 64                 # em size the signs are rendered at, in image pixels
+SCALE = 2               # image px per CSS px: 32 px glyphs, sharp on 2x screens
+PAD = 2                 # transparent gutter around each sprite, so scaled masks never bleed
+MAX_WIDTH = 512         # shelf width of the atlas
+
+NAME = "az-cuneiform"
+URL_PREFIX = "/glyph-atlas/"
+
+
+def _params() -> list:
+    return [ATLAS_VERSION, PX, SCALE, PAD, MAX_WIDTH]
+
+
+def load_selection(path: Path) -> list[dict]:
+    rows = json.loads(path.read_text(encoding="utf-8"))
+    return [r for r in rows if r.get("char")]
+
+
+def covering_fonts(rows: list[dict], font_files: list[str]) -> list[str]:
+    """The fonts, in chain order, that are first to cover at least one selected sign."""
+    from fontTools.ttLib import TTFont
+
+    cmaps = []
+    for fp in font_files:
+        collection = Path(fp).suffix.lower() in (".ttc", ".otc")
+        with TTFont(fp, fontNumber=0 if collection else -1, lazy=True) as font:
+            cmaps.append(set(font.getBestCmap() or ()))
+    used = {next((fp for fp, cmap in zip(font_files, cmaps) if ord(r["char"]) in cmap), None) for r in rows}
+    return [fp for fp in font_files if fp in used]
+
+
+def source_hash(rows: list[dict], font_files: list[str]) -> str:
+    """Digest of everything the atlas depends on: selected signs, covering font bytes, layout."""
+    h = hashlib.sha256(json.dumps(_params()).encode())
+    for r in rows:
+        h.update(f"{r['letter']}={r['char']};".encode())
+    for fp in font_files:
+        h.update(Path(fp).name.encode())
+        h.update(hashlib.sha256(Path(fp).read_bytes()).digest())
+    return h.hexdigest()
+
+
+def is_current(atlas_json: Path, out_dir: Path, digest: str) -> bool:
+    if not atlas_json.exists():
+        return False
+    atlas = json.loads(atlas_json.read_text(encoding="utf-8"))
+    if atlas.get("source_hash") != digest:
+        return False
+    urls = [atlas.get("image"), atlas.get("svg")]
+    return all((out_dir / url.split("?")[0].rsplit("/", 1)[-1]).exists() for url in urls if url)
+
+
+# ——— rendering ———
+
+def _crop(bitmap: np.ndarray) -> np.ndarray | None:
+    rows, cols = np.flatnonzero(bitmap.any(axis=1)), np.flatnonzero(bitmap.any(axis=0))
+    if not len(rows):
+        return None
+    return bitmap[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+
+
+def render_sprites(rows: list[dict], font_files: list[str]) -> tuple[list[dict], list[str]]:
+    """Cropped bitmaps for every covered sign; returns (sprites, missing letters)."""
+    faces = [glyph_raster.Face(fp, PX) for fp in font_files]
+    sprites, missing = [], []
+    for r in rows:
+        cp = ord(r["char"])
+        face = next((f for f in faces if cp in f.charmap), None)
+        bitmap = _crop(face.render(r["char"])[0]) if face else None
+        if bitmap is None:
+            missing.append(r["letter"])
+            continue
+        sprites.append({"row": r, "face": face, "bitmap": bitmap})
+    return sprites, missing
+
+
+def pack(sprites: list[dict]) -> tuple[int, int]:
+    """Shelf packing, tallest first; sets ``x``/``y``/``w``/``h`` and returns the atlas size."""
+    x = y = shelf_h = width = 0
+    for s in sorted(sprites, key=lambda s: (-s["bitmap"].shape[0], s["row"]["letter"])):
+        h, w = (n + 2 * PAD for n in s["bitmap"].shape)
+        if x and x + w > MAX_WIDTH:
+            x, y, shelf_h = 0, y + shelf_h, 0
+        s.update(x=x, y=y, w=w, h=h)
+        x += w
+        shelf_h = max(shelf_h, h)
+        width = max(width, x)
+    return width, y + shelf_h
+
+
+def compose(sprites: list[dict], width: int, height: int) -> np.ndarray:
+    alpha = np.zeros((height, width), dtype=np.uint8)
+    for s in sprites:
+        bh, bw = s["bitmap"].shape
+        alpha[s["y"] + PAD:s["y"] + PAD + bh, s["x"] + PAD:s["x"] + PAD + bw] = s["bitmap"]
+    return alpha
+
+
+def png_bytes(alpha: np.ndarray) -> bytes:
+    """Grey + alpha PNG (black ink, coverage as alpha); no metadata, so it is reproducible."""
+    height, width = alpha.shape
+    pixels = np.zeros((height, width * 2 + 1), dtype=np.uint8)   # filter byte 0 + (grey, alpha) pairs
+    pixels[:, 2::2] = alpha
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 4, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(pixels.tobytes(), 9)) + chunk(b"IEND", b""))
+
+
+def _svg_path(s: dict) -> str:
+    """Outline of the sprite's sign, centred in its rectangle (y flipped to SVG's y-down)."""
+    from matplotlib.font_manager import FontProperties
+    from matplotlib.path import Path as MplPath
+    from matplotlib.textpath import TextPath
+    from matplotlib.transforms import Affine2D
+
+    outline = TextPath((0, 0), s["row"]["char"], size=PX, prop=FontProperties(fname=s["face"].path))
+    (x0, y0), (x1, y1) = outline.get_extents().get_points()
+    cx, cy = s["x"] + s["w"] / 2, s["y"] + s["h"] / 2
+    outline = outline.transformed(Affine2D().translate(-(x0 + x1) / 2, -(y0 + y1) / 2).scale(1, -1).translate(cx, cy))
+    ops = {MplPath.MOVETO: "M", MplPath.LINETO: "L", MplPath.CURVE3: "Q", MplPath.CURVE4: "C"}
+    d = []
+    for vertices, code in outline.iter_segments(simplify=False):
+        if code == MplPath.CLOSEPOLY:
+            d.append("Z")
+        else:
+            d.append(ops[code] + " ".join(f"{v:.2f}".rstrip("0").rstrip(".") for v in vertices))
+    return "".join(d)
+
+
+def svg_text(sprites: list[dict], width: int, height: int) -> str:
+    lines = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+             f'viewBox="0 0 {width} {height}">']
+    for s in sorted(sprites, key=lambda s: s["row"]["letter"]):
+        letter = s["row"]["letter"]
+        lines.append(f'<view id="{letter}" viewBox="{s["x"]} {s["y"]} {s["w"]} {s["h"]}"/>')
+        lines.append(f'<path id="glyph-{letter}" d="{_svg_path(s)}"/>')
+    lines.append("</svg>")
+    return "\n".join(lines) + "\n"
+
+
+# ——— stage ———
+
+def outputs(out_dir: Path, atlas_json: Path) -> list[Path]:
+    return [out_dir / f"{NAME}.png", out_dir / f"{NAME}.svg", atlas_json]
+
+
+def build(rows: list[dict], font_files: list[str], digest: str, out_dir: Path, atlas_json: Path) -> dict | None:
+    """Render and write the atlas; ``None`` (and no files) when no sign could be rendered."""
+    sprites, missing = render_sprites(rows, font_files) if font_files else ([], [r["letter"] for r in rows])
+    png, svg, _ = outputs(out_dir, atlas_json)
+    if not sprites:
+        # Nothing renderable: drop a previous atlas so the page never masks with stale sprites.
+        for stale in outputs(out_dir, atlas_json):
+            stale.unlink(missing_ok=True)
+        return None
+    width, height = pack(sprites)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    png.write_bytes(png_bytes(compose(sprites, width, height)))
+    svg.write_text(svg_text(sprites, width, height), encoding="utf-8")
+    version = digest[:12]
+    atlas = {"source_hash": digest, "scale": SCALE,
+             "image": f"{URL_PREFIX}{png.name}?v={version}", "svg": f"{URL_PREFIX}{svg.name}?v={version}",
+             "width": width, "height": height, "glyphs": {}, "missing": missing}
+    for s in sorted(sprites, key=lambda s: s["row"]["letter"]):
+        r = s["row"]
+        atlas["glyphs"][r["letter"]] = {
+            "char": r["char"], "codepoint": r["codepoint"],
+            "x": s["x"], "y": s["y"], "w": s["w"], "h": s["h"],
+            "font": Path(s["face"].path).name,
+        }
+    atlas_json.parent.mkdir(parents=True, exist_ok=True)
+    atlas_json.write_text(json.dumps(atlas, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return atlas
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Render the A–Z cuneiform signs into a sprite atlas.")
+    parser.add_argument("--selection", type=Path, default=paths.HOMEPAGE_SELECTION_JSON)
+    parser.add_argument("--out-dir", type=Path, default=paths.GLYPH_ATLAS_DIR)
+    parser.add_argument("--atlas-json", type=Path, default=paths.GLYPH_ATLAS_JSON)
+    parser.add_argument("--force", action="store_true", help="Rebuild even when the source hash matches.")
+    parser.add_argument("--check", action="store_true", help="Only report; exit 1 when the atlas is stale.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if not args.selection.exists():
+        raise SystemExit(f"Selection not found: {args.selection}")
+    rows = load_selection(args.selection)
+    font_files = covering_fonts(rows, paths.font_paths())
+    digest = source_hash(rows, font_files)
+
+    if not font_files:
+        stale = [p for p in outputs(args.out_dir, args.atlas_json) if p.exists()]
+        if args.check and stale:
+            print("[stale] no font covers the selection but an atlas exists; run glyph_atlas.py")
+            return 1
+        for p in stale:
+            p.unlink()
+        print("⚠️ no font covers any selected sign: no atlas (page shows text). "
+              "Put NotoSansCuneiform-Regular.ttf into miohalo-alpha/fonts/Noto_Sans/.")
+        return 0
+    if is_current(args.atlas_json, args.out_dir, digest) and not args.force:
+        print(f"[ok] atlas up to date ({digest[:12]}) → {args.atlas_json}")
+        return 0
+    if args.check:
+        print(f"[stale] atlas does not match selection/fonts ({digest[:12]}); run glyph_atlas.py")
+        return 1
+
+    atlas = build(rows, font_files, digest, args.out_dir, args.atlas_json)
+    if atlas is None:
+        print(f"⚠️ the covering fonts rendered no ink for any sign: no atlas ({digest[:12]})")
+        return 0
+    print(f"[ok] {len(atlas['glyphs'])}/{len(rows)} signs → {atlas['width']}×{atlas['height']} atlas ({digest[:12]})")
+    for name in (f"{NAME}.png", f"{NAME}.svg"):
+        print(f"[ok] {args.out_dir / name} ({(args.out_dir / name).stat().st_size} bytes)")
+    if atlas["missing"]:
+        print(f"⚠️ no font covers: {' '.join(atlas['missing'])} (page keeps text for these). "
+              "Put NotoSansCuneiform-Regular.ttf into miohalo-alpha/fonts/Noto_Sans/.")
+    print(f"[ok] map → {args.atlas_json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""Shape features measured on rendered glyph bitmaps (E8 ranker ``--raster``).
+
+``letter_features`` in the ranker guesses symmetry, ascenders, descenders and
+loops from fixed letter sets; that is wrong for most turned/hooked/extended
+letters and meaningless for cuneiform.  Here every glyph is rendered once with
+FreeType (matplotlib's ``FT2Font``) and centred into a fixed canvas, and the
+whole inventory is measured as one ``(N, H, W)`` NumPy batch:
+
+* ``v_sym`` / ``h_sym`` — cosine correlation of the bitmap with its left–right /
+  top–bottom mirror (best of a ±1 px shift, so odd widths are not penalised);
+* ``asc`` / ``des``     — ink above the reference height (x-height for lower
+  case, cap height for upper case) / below the baseline, from glyph metrics;
+* ``holes``             — enclosed background regions, by min-label propagation
+  over the whole batch at once (4-connected background);
+* ``density``           — ink coverage of the glyph's own bounding box.
+
+Letters with a canonical decomposition are measured on their base (``é`` → ``e``):
+diacritics are already scored by ``dia_count``.  Results are cached per glyph
+in ``data/cache/glyph_raster.json``, keyed by font file, size and mtime.
+
+Usage:
+  python miohalo-alpha/scripts/glyph_raster.py show b d p q ɐ ʇ 𒀀
+  python miohalo-alpha/scripts/glyph_raster.py build                # every letter in latin_all.json
+  python miohalo-alpha/scripts/glyph_raster.py build --source az    # the A–Z cuneiform signs
+  python miohalo-alpha/scripts/e8_family_rank_sample.py --raster
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import time
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+
+import paths
+
+CACHE_VERSION = 1
+SIZE_PX = 32            # em size the glyphs are rendered at (72 dpi → 1 pt = 1 px)
+CANVAS = 48             # bitmaps are centred into CANVAS × CANVAS
+INK = 128               # 8-bit coverage counted as ink
+MIN_HOLE_PX = 3         # smaller enclosed regions are antialiasing specks
+ASC_MARGIN = 0.12       # ink this far (× reference height) above it is an ascender
+DES_MARGIN = 0.10       # ... and this far below the baseline a descender
+
+CACHE_JSON = paths.ALPHA_ROOT / "data" / "cache" / "glyph_raster.json"
+
+
+def measured_char(ch: str) -> str:
+    """The glyph whose shape stands for ``ch``: its NFD base when it decomposes."""
+    nfd = unicodedata.normalize("NFD", ch)
+    base = "".join(c for c in nfd if unicodedata.category(c) != "Mn")
+    return base[:1] if base and base != ch else ch
+
+
+class Face:
+    """One font at the working size, with its charmap and reference heights."""
+
+    def __init__(self, path: str, size: int = SIZE_PX) -> None:
+        from matplotlib.ft2font import FT2Font, LoadFlags
+
+        self.path = path
+        self.key = f"{Path(path).name}:{size}:{os.stat(path).st_mtime_ns}"
+        self.flags = LoadFlags.NO_HINTING
+        self.font = FT2Font(path)
+        self.font.set_size(size, 72)
+        self.charmap = set(self.font.get_charmap())
+        self.x_height = self._top("x") or size * 0.5
+        self.cap_height = self._top("H") or size * 0.7
+
+    def _top(self, ch: str) -> float | None:
+        if ord(ch) not in self.charmap:
+            return None
+        return self.font.load_char(ord(ch), flags=self.flags).bbox[3] / 64
+
+    def render(self, ch: str) -> tuple[np.ndarray, tuple[float, float]]:
+        """Antialiased bitmap of ``ch`` plus its (top, bottom) in px relative to the baseline."""
+        font = self.font
+        font.clear()
+        font.set_text(ch, 0.0, flags=self.flags)
+        font.draw_glyphs_to_bitmap(antialiased=True)
+        bitmap = np.asarray(font.get_image())
+        bbox = font.load_char(ord(ch), flags=self.flags).bbox
+        return bitmap, (bbox[3] / 64, bbox[1] / 64)
+
+
+def _place(bitmap: np.ndarray, canvas: np.ndarray) -> None:
+    """Centre the inked part of ``bitmap`` into ``canvas`` (strided down if it does not fit)."""
+    rows, cols = np.flatnonzero(bitmap.any(axis=1)), np.flatnonzero(bitmap.any(axis=0))
+    if not len(rows):
+        return
+    bitmap = bitmap[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+    h, w = bitmap.shape
+    step = max(1, math.ceil(max(h, w) / CANVAS))
+    if step > 1:
+        bitmap = bitmap[::step, ::step]
+        h, w = bitmap.shape
+    top, left = (CANVAS - h) // 2, (CANVAS - w) // 2
+    canvas[top:top + h, left:left + w] = bitmap
+
+
+def _mirror_score(a: np.ndarray, b: np.ndarray, axis: int) -> np.ndarray:
+    """Max cosine correlation of ``a`` with ``b`` shifted by -1/0/+1 px along ``axis``."""
+    na = np.sqrt((a * a).sum(axis=(1, 2)))
+    best = np.zeros(len(a), dtype=np.float32)
+    for shift in (-1, 0, 1):
+        s = np.roll(b, shift, axis=axis)
+        dot = (a * s).sum(axis=(1, 2))
+        denom = na * np.sqrt((s * s).sum(axis=(1, 2)))
+        best = np.maximum(best, np.divide(dot, denom, out=np.zeros_like(dot), where=denom > 0))
+    return best
+
+
+def count_holes(ink: np.ndarray) -> np.ndarray:
+    """Enclosed background regions per bitmap of a ``(N, H, W)`` boolean ink batch.
+
+    Every background pixel starts with a unique label, border background with 0;
+    labels then flow to the 4-neighbour minimum until nothing changes.  Regions
+    still carrying a non-zero label never touched the border: they are holes.
+    """
+    n, h, w = ink.shape
+    background = ~ink
+    big = np.iinfo(np.int32).max
+    labels = np.arange(1, n * h * w + 1, dtype=np.int32).reshape(n, h, w)
+    labels[:, 0, :] = labels[:, -1, :] = labels[:, :, 0] = labels[:, :, -1] = 0
+    labels[ink] = big
+
+    while True:
+        nxt = labels.copy()
+        np.minimum(nxt[:, 1:, :], labels[:, :-1, :], out=nxt[:, 1:, :])
+        np.minimum(nxt[:, :-1, :], labels[:, 1:, :], out=nxt[:, :-1, :])
+        np.minimum(nxt[:, :, 1:], labels[:, :, :-1], out=nxt[:, :, 1:])
+        np.minimum(nxt[:, :, :-1], labels[:, :, 1:], out=nxt[:, :, :-1])
+        nxt[ink] = big
+        if np.array_equal(nxt, labels):
+            break
+        labels = nxt
+
+    inside = background & (labels > 0)
+    regions, sizes = np.unique(labels[inside], return_counts=True)
+    owner = (regions - 1) // (h * w)                # a label is the flat index of its seed pixel
+    return np.bincount(owner[sizes >= MIN_HOLE_PX], minlength=n)
+
+
+def measure(bitmaps: np.ndarray, extents: np.ndarray, ref_heights: np.ndarray) -> list[dict]:
+    """Batch features for ``(N, CANVAS, CANVAS)`` uint8 bitmaps."""
+    a = bitmaps.astype(np.float32) / 255.0
+    v_sym = _mirror_score(a, a[:, :, ::-1], axis=2)
+    h_sym = _mirror_score(a, a[:, ::-1, :], axis=1)
+
+    ink = bitmaps >= INK
+    rows, cols = ink.any(axis=2), ink.any(axis=1)
+    height = np.where(rows.any(axis=1), CANVAS - rows[:, ::-1].argmax(axis=1) - rows.argmax(axis=1), 0)
+    width = np.where(cols.any(axis=1), CANVAS - cols[:, ::-1].argmax(axis=1) - cols.argmax(axis=1), 0)
+    area = height * width
+    density = np.divide(ink.sum(axis=(1, 2)), area, out=np.zeros(len(ink)), where=area > 0)
+    holes = count_holes(ink)
+
+    top, bottom = extents[:, 0], extents[:, 1]
+    asc = top > ref_heights * (1 + ASC_MARGIN)
+    des = bottom < -ref_heights * DES_MARGIN
+
+    return [
+        {
+            "v_sym": round(float(v_sym[i]), 4),
+            "h_sym": round(float(h_sym[i]), 4),
+            "asc": int(asc[i]),
+            "des": int(des[i]),
+            "holes": int(holes[i]),
+            "density": round(float(density[i]), 4),
+        }
+        for i in range(len(bitmaps))
+    ]
+
+
+def _params() -> list:
+    """Everything that changes a measurement; a mismatch drops the whole cache."""
+    return [CACHE_VERSION, SIZE_PX, CANVAS, INK, MIN_HOLE_PX, ASC_MARGIN, DES_MARGIN]
+
+
+class RasterCache:
+    """Per-glyph feature cache, invalidated per font when the file or size changes.
+
+    ``path=None`` keeps it in memory only.
+    """
+
+    def __init__(self, path: Path | None = CACHE_JSON) -> None:
+        self.path = path
+        self.data: dict[str, dict[str, dict]] = {}
+        if path is not None and path.exists():
+            blob = json.loads(path.read_text(encoding="utf-8"))
+            if blob.get("params") == _params():
+                self.data = blob["fonts"]
+        self.dirty = False
+
+    def get(self, face_key: str, ch: str) -> dict | None:
+        return self.data.get(face_key, {}).get(ch)
+
+    def put(self, face_key: str, ch: str, features: dict) -> None:
+        self.data.setdefault(face_key, {})[ch] = features
+        self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty or self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        blob = {"params": _params(), "fonts": self.data}
+        self.path.write_text(json.dumps(blob, ensure_ascii=False), encoding="utf-8")
+        self.dirty = False
+
+
+def raster_features(chars, cache: RasterCache | None = None) -> dict[str, dict]:
+    """Features for every char some font covers; uncovered chars are left out."""
+    cache = RasterCache() if cache is None else cache
+    faces = [Face(p) for p in paths.font_paths()]
+    out: dict[str, dict] = {}
+    todo: dict[str, list[tuple[str, str]]] = {}        # face key -> [(char, measured char)]
+    by_key = {f.key: f for f in faces}
+
+    for ch in dict.fromkeys(chars):
+        m = measured_char(ch)
+        face = next((f for f in faces if ord(m) in f.charmap), None)
+        if face is None:
+            continue
+        hit = cache.get(face.key, m)
+        if hit is not None:
+            out[ch] = hit
+        else:
+            todo.setdefault(face.key, []).append((ch, m))
+
+    for key, items in todo.items():
+        face = by_key[key]
+        measured = list(dict.fromkeys(m for _, m in items))
+        bitmaps = np.zeros((len(measured), CANVAS, CANVAS), dtype=np.uint8)
+        extents = np.zeros((len(measured), 2), dtype=np.float32)
+        refs = np.zeros(len(measured), dtype=np.float32)
+        for i, m in enumerate(measured):
+            bitmap, extents[i] = face.render(m)
+            _place(bitmap, bitmaps[i])
+            refs[i] = face.cap_height if m.isupper() else face.x_height
+        for m, feats in zip(measured, measure(bitmaps, extents, refs)):
+            cache.put(key, m, feats)
+        for ch, m in items:
+            out[ch] = cache.get(key, m)
+
+    cache.save()
+    return out
+
+
+def _source_chars(source: str) -> list[str]:
+    if source == "latin":
+        if not paths.LATIN_ALL_JSON.exists():
+            raise SystemExit("latin_all.json missing. Run scripts/collect_latin.py first.")
+        return [e["char"] for e in json.loads(paths.LATIN_ALL_JSON.read_text(encoding="utf-8"))]
+    rows = json.loads(paths.AZ_SELECTION_JSON.read_text(encoding="utf-8"))
+    return [r["char"] for r in rows if r.get("char")]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Raster shape features for glyphs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("show", help="Print the features of a few characters.")
+    p.add_argument("chars", nargs="+")
+    p = sub.add_parser("build", help="Measure (and cache) a whole inventory.")
+    p.add_argument("--source", choices=("latin", "az"), default="latin")
+    p.add_argument("--no-cache", action="store_true", help="Ignore and do not update the cache.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    if not paths.font_paths():
+        raise SystemExit("No fonts found. Put Noto TTFs into miohalo-alpha/fonts/Noto_Sans/.")
+
+    if args.command == "show":
+        chars = [c for text in args.chars for c in text]
+        feats = raster_features(chars)
+        for ch in chars:
+            f = feats.get(ch)
+            print(f"{ch}  U+{ord(ch):04X}  " + (json.dumps(f) if f else "(no font covers it)"))
+        return
+
+    chars = _source_chars(args.source)
+    cache = RasterCache(None if args.no_cache else CACHE_JSON)
+    t0 = time.perf_counter()
+    feats = raster_features(chars, cache)
+    took = time.perf_counter() - t0
+    print(f"[ok] {len(feats)}/{len(chars)} glyphs measured in {took:.2f} s ({len(feats) / took:.0f} glyphs/s)")
+    if feats:
+        n = len(feats)
+        summary = {k: round(sum(f[k] for f in feats.values()) / n, 3) for k in ("v_sym", "h_sym", "asc", "des", "density")}
+        summary["with_holes"] = sum(1 for f in feats.values() if f["holes"])
+        print("[ok] means:", json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""Per-run instrumentation shared by the pipeline scripts.
+
+Records nested timing spans, item counters, bytes read/written and cache hit
+rates, and writes them as one JSON file per run::
+
+    with instrument.run("group"):
+        with instrument.span("load"):
+            latin = json.loads(path.read_text(encoding="utf-8"))
+            instrument.file_read("latin_all.json", path)
+        instrument.count("letters", len(latin))
+        instrument.watch_cache("u_name", u_name)      # anything with cache_info()
+
+Switched on by ``MIOHALO_METRICS`` (``1`` → ``data/metrics/<run>-<time>.json``,
+a directory, or a ``.json`` path) or by ``miohalo.py <stage> --metrics``.
+``MIOHALO_PROFILE=1`` additionally captures a cProfile (``.prof`` next to the
+JSON, top functions inlined); on its own it implies ``MIOHALO_METRICS=1``.
+When disabled every call hits a shared no-op recorder: one function call, no
+clock reads, no allocation.
+
+A ``run`` opened while another is active becomes a span of the outer run, so a
+stage script run through the CLI reports into the CLI's metrics file.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import paths
+
+ENV_METRICS = "MIOHALO_METRICS"
+ENV_PROFILE = "MIOHALO_PROFILE"
+PROFILE_TOP = 25
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullRecorder:
+    """Disabled instrumentation: every method is a no-op."""
+
+    enabled = False
+
+    def span(self, name: str):
+        return _NULL_SPAN
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+    def file_read(self, name: str, path: Path) -> None:
+        pass
+
+    def file_written(self, name: str, path: Path) -> None:
+        pass
+
+    def watch_cache(self, name: str, cached) -> None:
+        pass
+
+
+class Recorder:
+    enabled = True
+
+    def __init__(self, run: str) -> None:
+        self.run = run
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        self._stack: list[str] = []
+        self.spans: dict[str, list[float]] = {}          # path -> [count, total_s, max_s]
+        self.counters: dict[str, int] = {}
+        self.read: dict[str, int] = {}
+        self.written: dict[str, int] = {}
+        self._caches: dict[str, object] = {}
+
+    @contextmanager
+    def span(self, name: str):
+        self._stack.append(name)
+        key = "/".join(self._stack)
+        t0 = time.perf_counter()
+        try:
+            yield self
+        finally:
+            dt = time.perf_counter() - t0
+            self._stack.pop()
+            s = self.spans.get(key)
+            if s is None:
+                self.spans[key] = [1, dt, dt]
+            else:
+                s[0] += 1
+                s[1] += dt
+                if dt > s[2]:
+                    s[2] = dt
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def file_read(self, name: str, path: Path) -> None:
+        self.read[name] = self.read.get(name, 0) + _size(path)
+
+    def file_written(self, name: str, path: Path) -> None:
+        self.written[name] = self.written.get(name, 0) + _size(path)
+
+    def watch_cache(self, name: str, cached) -> None:
+        """Snapshot ``cached.cache_info()`` when the run finishes."""
+        self._caches[name] = cached
+
+    def caches(self) -> dict[str, dict]:
+        out = {}
+        for name, cached in self._caches.items():
+            info = cached.cache_info()
+            lookups = info.hits + info.misses
+            out[name] = {
+                "hits": info.hits,
+                "misses": info.misses,
+                "hit_rate": round(info.hits / lookups, 4) if lookups else None,
+                "maxsize": info.maxsize,
+                "currsize": info.currsize,
+            }
+        return out
+
+    def report(self) -> dict:
+        return {
+            "run": self.run,
+            "argv": sys.argv,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "wall_s": round(time.perf_counter() - self._t0, 6),
+            "cpu_s": round(time.process_time() - self._cpu0, 6),
+            "max_rss_kb": _max_rss_kb(),
+            "spans": {
+                k: {"count": int(c), "total_s": round(t, 6), "max_s": round(m, 6)}
+                for k, (c, t, m) in self.spans.items()
+            },
+            "counters": self.counters,
+            "bytes": {"read": self.read, "written": self.written},
+            "caches": self.caches(),
+        }
+
+
+def _size(path: Path) -> int:
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
+
+def _max_rss_kb() -> int | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+_current: NullRecorder | Recorder = NullRecorder()
+
+
+def enabled() -> bool:
+    return _current.enabled
+
+
+def span(name: str):
+    return _current.span(name)
+
+
+def count(name: str, n: int = 1) -> None:
+    _current.count(name, n)
+
+
+def file_read(name: str, path: Path) -> None:
+    _current.file_read(name, path)
+
+
+def file_written(name: str, path: Path) -> None:
+    _current.file_written(name, path)
+
+
+def watch_cache(name: str, cached) -> None:
+    _current.watch_cache(name, cached)
+
+
+def metrics_path(run_name: str, setting: str) -> Path:
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    if setting in ("1", "true", "yes", "on"):
+        return paths.METRICS / f"{run_name}-{stamp}.json"
+    target = Path(setting)
+    if target.suffix == ".json":
+        return target
+    return target / f"{run_name}-{stamp}.json"
+
+
+def _profile_top(profiler, limit: int = PROFILE_TOP) -> list[dict]:
+    import pstats
+
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (file, line, func), (cc, nc, tt, ct, _) in stats.stats.items():
+        rows.append({"function": f"{Path(file).name}:{line}({func})", "calls": nc,
+                     "tottime_s": round(tt, 6), "cumtime_s": round(ct, 6)})
+    rows.sort(key=lambda r: r["cumtime_s"], reverse=True)
+    return rows[:limit]
+
+
+@contextmanager
+def run(name: str):
+    """Scope one instrumented run; nested inside an active run it is just a span."""
+    global _current
+    if _current.enabled:
+        with _current.span(name):
+            yield _current
+        return
+
+    setting = os.environ.get(ENV_METRICS, "").strip()
+    profile = os.environ.get(ENV_PROFILE, "").strip() not in ("", "0")
+    if setting in ("", "0"):
+        if not profile:
+            yield _current
+            return
+        setting = "1"          # a profile is written next to its metrics file
+
+    recorder = _current = Recorder(name)
+    profiler = None
+    if profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield recorder
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        _current = NullRecorder()
+        report = recorder.report()
+        out = metrics_path(name, setting)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        if profiler is not None:
+            prof = out.with_suffix(".prof")
+            profiler.dump_stats(str(prof))
+            report["profile"] = {"file": str(prof), "top": _profile_top(profiler)}
+        out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[ok] metrics → {out}", file=sys.stderr)
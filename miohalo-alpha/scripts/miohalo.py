@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""Single entry point for the Miohalo pipeline stages.
+
+Usage:
+  python miohalo-alpha/scripts/miohalo.py status
+  python miohalo-alpha/scripts/miohalo.py collect|group|rank|audit|preview [--force] [--metrics [PATH]] [--profile]
+  python miohalo-alpha/scripts/miohalo.py select-cuneiform [-- --build-library --select]
+  python miohalo-alpha/scripts/miohalo.py catalog missing --feature HOOK --font NotoSans-Regular.ttf
+  python miohalo-alpha/scripts/miohalo.py startup-budget [--runs 9] [--budget-ms 60]
+
+Each stage script is only loaded (via ``runpy``) when its subcommand runs, so
+matplotlib/FreeType are never imported for ``status``, ``--help`` or a stage
+that is skipped because its outputs are already newer than its inputs.
+Keep this module's top-level imports to the standard-library basics.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import paths
+
+# Modules that must never be loaded by quick queries; checked by ``startup-budget``.
+HEAVY_MODULES = ("matplotlib", "numpy", "fontTools")
+
+
+class Stage:
+    # A plain class rather than a dataclass: ``dataclasses`` pulls in ``inspect``,
+    # which alone costs more than the rest of the CLI's imports.
+    __slots__ = ("script", "help", "inputs", "outputs", "default_args", "catalog_args")
+
+    def __init__(
+        self,
+        script: Path,
+        help: str,
+        inputs: tuple[Path, ...] = (),
+        outputs: tuple[Path, ...] = (),
+        default_args: tuple[str, ...] = (),
+        catalog_args: tuple[str, ...] = (),
+    ) -> None:
+        self.script = script
+        self.help = help
+        self.inputs = inputs
+        self.outputs = outputs
+        self.default_args = default_args
+        self.catalog_args = catalog_args      # appended unless --no-catalog
+
+
+STAGES: dict[str, Stage] = {
+    "collect": Stage(
+        script=paths.SCRIPTS / "collect_latin.py",
+        help="Scan Unicode for Latin letters → data/raw/latin_all.{json,csv}.",
+        outputs=(paths.LATIN_ALL_JSON, paths.RAW / "latin_all.csv"),
+    ),
+    "group": Stage(
+        script=paths.SCRIPTS / "e8_family_grouper.py",
+        help="Group letters into base/feature families.",
+        inputs=(paths.LATIN_ALL_JSON,),
+        # Only char_list.txt is the grouper's alone: the ranker rewrites families.json and the
+        # preview char_groups.csv, which would make this stage look fresh.
+        outputs=(paths.OUT / "char_list.txt",),
+    ),
+    "rank": Stage(
+        script=paths.SCRIPTS / "e8_family_rank_sample.py",
+        help="Score families and write selection_suggestion.json.",
+        inputs=(paths.LATIN_ALL_JSON,),
+        outputs=(paths.OUT / "ranked_candidates.csv", paths.SELECTION_JSON),
+    ),
+    "select-cuneiform": Stage(
+        script=paths.CUNEIFORM_SCRIPTS / "select_cuneiform.py",
+        help="Select the A-Z cuneiform alphabet (pass script flags after --).",
+        inputs=(paths.CUNEIFORM_LIBRARY_JSON,),
+        outputs=(paths.AZ_SELECTION_JSON,),
+        default_args=("--select",),
+    ),
+    "audit": Stage(
+        script=paths.SCRIPTS / "audit_font_coverage.py",
+        help="Audit font coverage of the current selection.",
+        inputs=(paths.SELECTION_JSON, paths.FONTS_DIR),
+        outputs=(paths.OUT / "font_coverage_report.txt", paths.OUT / "missing_glyphs.csv"),
+        catalog_args=("--catalog",),
+    ),
+    "preview": Stage(
+        script=paths.SCRIPTS / "preview_miohalo_selection.py",
+        help="Render the selection preview sheet (matplotlib).",
+        inputs=(paths.SELECTION_JSON, paths.REJECT_TXT, paths.FONTS_DIR),
+        outputs=(paths.PREVIEW_PNG,),
+    ),
+}
+
+
+# Standalone tools: always run, arguments are passed through untouched.
+TOOLS: dict[str, tuple[Path, str]] = {
+    "atlas": (paths.SCRIPTS / "glyph_atlas.py", "Render the A-Z signs into the homepage sprite atlas."),
+    "bench": (paths.SCRIPTS / "bench_pipeline.py", "Benchmark hot paths against JSON baselines."),
+    "catalog": (paths.SCRIPTS / "catalog.py", "Query/ingest the SQLite catalog."),
+    "cjk": (paths.SCRIPTS / "cjk_mapper.py", "Map CJK/Kana text onto Miohalo glyph classes."),
+    "drift": (paths.SCRIPTS / "drift_analytics.py", "Bounded-memory drift analytics over relay logs."),
+    "family-graph": (paths.SCRIPTS / "family_graph.py", "Build decomposition/case families."),
+    "grammar": (paths.SCRIPTS / "mutation_grammar.py", "Compile/apply the Phase B mutation grammar."),
+    "raster": (paths.SCRIPTS / "glyph_raster.py", "Measure glyph shape features from rendered bitmaps."),
+    "search": (paths.CUNEIFORM_SCRIPTS / "cuneiform_search.py", "Fuzzy search cuneiform sign names."),
+    "sweep": (paths.CUNEIFORM_SCRIPTS / "selection_sweep.py", "Evaluate A-Z selector variants in parallel."),
+    "subset": (paths.SCRIPTS / "font_subset.py", "Subset fallback fonts to the active selections."),
+    "structure": (paths.CUNEIFORM_SCRIPTS / "sign_structure.py", "Parse/query composite sign structure."),
+    "syllabary": (paths.CUNEIFORM_SCRIPTS / "syllabary.py", "Build/use the syllabic compression alphabet."),
+    "spell": (paths.SCRIPTS / "spell_packet.py", "Show/benchmark spell packet codecs."),
+    "relay": (paths.SCRIPTS / "spell_relay.py", "Simulate agents passing spell packets."),
+    "translit": (paths.SCRIPTS / "transliterate.py", "Stream Latin <-> cuneiform A-Z text."),
+}
+
+
+def _mtime(path: Path) -> float | None:
+    """Newest mtime under ``path`` (files or one directory level); None if absent."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    newest = st.st_mtime
+    if path.is_dir():
+        with os.scandir(path) as it:
+            for entry in it:
+                newest = max(newest, entry.stat().st_mtime)
+    return newest
+
+
+def stage_state(stage: Stage) -> str:
+    """``missing`` | ``stale`` | ``fresh`` from stat() calls alone (no file reads)."""
+    out_times = [_mtime(p) for p in stage.outputs]
+    if not out_times or any(t is None for t in out_times):
+        return "missing"
+    in_times = [t for t in (_mtime(p) for p in (*stage.inputs, stage.script)) if t is not None]
+    if in_times and max(in_times) > min(out_times):
+        return "stale"
+    return "fresh"
+
+
+def run_script(script: Path, argv: list[str]) -> None:
+    import runpy
+
+    saved_argv, saved_path = sys.argv, list(sys.path)
+    sys.argv = [str(script), *argv]
+    sys.path.insert(0, str(script.parent))
+    try:
+        runpy.run_path(str(script), run_name="__main__")
+    finally:
+        sys.argv, sys.path[:] = saved_argv, saved_path
+
+
+def cmd_stage(name: str, args: argparse.Namespace) -> int:
+    stage = STAGES[name]
+    extra = list(args.script_args or ())
+    if extra and extra[0] == "--":
+        extra = extra[1:]
+    if not extra and not args.force:
+        state = stage_state(stage)
+        if state == "fresh":
+            print(f"[skip] {name}: outputs up to date (use --force to rerun)")
+            return 0
+    if args.metrics:
+        os.environ["MIOHALO_METRICS"] = args.metrics
+    if args.profile:
+        os.environ["MIOHALO_PROFILE"] = "1"
+    import instrument
+
+    with instrument.run(name):
+        with instrument.span("script"):
+            script_args = extra or list(stage.default_args)
+            if not args.no_catalog:
+                script_args += [a for a in stage.catalog_args if a not in script_args]
+            run_script(stage.script, script_args)
+        if not args.no_catalog:
+            import catalog
+
+            conn = catalog.connect()
+            try:
+                with instrument.span("catalog"):
+                    n = catalog.ingest_stage(conn, name)
+                instrument.count("catalog_rows", n)
+            except ValueError as e:
+                raise SystemExit(f"[error] catalog: {e}")
+            finally:
+                conn.close()
+            if n:
+                print(f"[ok] catalog: {n} rows from {name}")
+    return 0
+
+
+def cmd_tool(name: str, extra: list[str]) -> int:
+    script, _ = TOOLS[name]
+    try:
+        run_script(script, extra)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    return 0
+
+
+def cmd_status(args: argparse.Namespace) -> int:
+    for name, stage in STAGES.items():
+        print(f"{name:<17} {stage_state(stage):<8} {stage.help}")
+        if args.verbose:
+            for p in stage.outputs:
+                t = _mtime(p)
+                size = p.stat().st_size if t is not None and p.is_file() else 0
+                print(f"    {'ok ' if t else '-- '} {p.relative_to(paths.REPO_ROOT)}  {size} B")
+    return 0
+
+
+def cmd_startup_budget(args: argparse.Namespace) -> int:
+    import statistics
+    import subprocess
+    import time
+
+    me = str(Path(__file__).resolve())
+    probes = {
+        "--help": [sys.executable, me, "--help"],
+        "status": [sys.executable, me, "status"],
+        "bare python": [sys.executable, "-c", "pass"],
+    }
+    results = {}
+    for label, cmd in probes.items():
+        samples = []
+        for _ in range(args.runs):
+            t0 = time.perf_counter()
+            subprocess.run(cmd, stdout=subprocess.DEVNULL, check=True)
+            samples.append((time.perf_counter() - t0) * 1000)
+        results[label] = statistics.median(samples)
+        print(f"{label:<12} median {results[label]:7.1f} ms over {args.runs} runs")
+
+    leak_check = (
+        f"import sys; sys.path.insert(0, {str(paths.SCRIPTS)!r}); sys.argv=['miohalo','status'];"
+        "import io, contextlib, miohalo\n"
+        "with contextlib.redirect_stdout(io.StringIO()): miohalo.main()\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    leaked = subprocess.run([sys.executable, "-c", leak_check], capture_output=True, text=True, check=True).stdout.strip()
+
+    # The budget covers what the CLI adds on top of the bare interpreter, so the
+    # check means the same thing on fast and slow machines.
+    ok = True
+    overhead = max(results["--help"], results["status"]) - results["bare python"]
+    if overhead > args.budget_ms:
+        print(f"[fail] CLI overhead {overhead:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+        ok = False
+    if leaked:
+        print(f"[fail] quick query imported heavy modules: {leaked}")
+        ok = False
+    if ok:
+        print(f"[ok] CLI overhead {overhead:.1f} ms within {args.budget_ms:.0f} ms budget, no heavy imports")
+    return 0 if ok else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="miohalo", description="Miohalo pipeline CLI.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for name, stage in STAGES.items():
+        p = sub.add_parser(name, help=stage.help)
+        p.add_argument("--force", action="store_true", help="Run even if outputs are up to date.")
+        p.add_argument("--no-catalog", action="store_true", help="Do not upsert outputs into the catalog.")
+        p.add_argument("--metrics", nargs="?", const="1", metavar="PATH",
+                       help="Write run metrics JSON (default data/metrics/; or a dir / .json path).")
+        p.add_argument("--profile", action="store_true", help="Also capture a cProfile (implies --metrics).")
+        p.add_argument("script_args", nargs=argparse.REMAINDER, help="Extra flags passed to the script.")
+
+    for name, (_, help_text) in TOOLS.items():
+        p = sub.add_parser(name, help=help_text, add_help=False)
+        p.add_argument("script_args", nargs=argparse.REMAINDER, help="Arguments passed to the tool.")
+
+    p = sub.add_parser("status", help="Show which stage outputs are missing/stale/fresh.")
+    p.add_argument("-v", "--verbose", action="store_true", help="List output files and sizes.")
+
+    p = sub.add_parser("startup-budget", help="Measure CLI cold start against a budget.")
+    p.add_argument("--runs", type=int, default=9)
+    p.add_argument("--budget-ms", type=float, default=60.0,
+                   help="Allowed cold-start overhead above `python -c pass` (ms).")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in TOOLS:
+        # Dispatch before argparse so tool flags (including --help) pass through verbatim.
+        return cmd_tool(argv[0], argv[1:])
+    args = build_parser().parse_args(argv)
+    if args.command in STAGES:
+        return cmd_stage(args.command, args)
+    if args.command == "status":
+        return cmd_status(args)
+    return cmd_startup_budget(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,670 @@
+#!/usr/bin/env python3
+"""Phase B mutation grammar: source script → glyph class → operational token.
+
+A grammar is a text file of layers, applied in order, each a list of rewrite
+rules::
+
+    %passthrough default          # whitespace, digits, ASCII punctuation (or: any, or literal chars)
+
+    [class]                       # layer 1: source text → glyph classes
+    ɐ  -> {A.TURNED.L}
+    ng -> {N.NONE.L}{G.NONE.L}
+
+    [token]                       # later layers: one symbol (class or char) per rule
+    {A.TURNED.L} -> 𒀀\\u{FE07}
+
+``{name}`` is a glyph class: an internal symbol that must be rewritten by a
+later layer before it reaches the output.  ``\\u{XXXX}`` escapes any code point
+and ``\\<c>`` a literal character (space, ``#``, ``{``, ``\\``); ``#`` after
+whitespace starts a comment.  Only the first layer may match sequences, so the
+whole stack composes exactly into one rule table at compile time.
+
+Matching is leftmost-longest.  When every left-hand side is a single character
+the transducer is one ``str.translate`` pass; otherwise it is a trie-shaped
+regular expression, so each position looks at most ``max_lhs`` characters
+ahead.  Characters that match no rule and are not passthrough raise
+``UnmappedCharacter``.  Streams are processed in chunks; a rule that could
+still grow across a chunk boundary is carried over to the next read.
+Invalid UTF-8 is reported with its byte offset, and ``-o`` is only replaced
+once the whole input has gone through.
+
+The compiler checks reversibility (distinct, prefix-free outputs that never use
+a passthrough character); reversible grammars also get the inverse transducer.
+Compiled grammars are cached as plain JSON under ``data/cache/grammar/`` by the
+SHA-256 of their source (never pickled: loading a cache entry cannot run code),
+so repeated runs skip compilation.
+
+``seed`` writes a grammar from the E8 families (``e8_family_grouper``) and the
+A–Z cuneiform selection: every Latin letter becomes a class named after its
+base letter, primary feature and case, and every class becomes its base
+letter's sign plus a variation selector.  Selectors are default-ignorable, so
+the output shows only the sign while still decoding to the original letter.
+
+Usage:
+  python miohalo-alpha/scripts/mutation_grammar.py seed                       # → data/out/mutation_grammar.txt
+  python miohalo-alpha/scripts/mutation_grammar.py check --require-reversible
+  python miohalo-alpha/scripts/mutation_grammar.py encode -i notes.txt -o notes.cun
+  python miohalo-alpha/scripts/mutation_grammar.py decode -i notes.cun
+  python miohalo-alpha/scripts/mutation_grammar.py bench --mb 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import json
+import random
+import re
+import string
+import sys
+import time
+import unicodedata
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TextIO
+
+import paths
+from transliterate import DEFAULT_PASSTHROUGH, InvalidUtf8, UnmappedCharacter, open_in
+
+COMPILER_VERSION = 2
+CHUNK_CHARS = 1 << 16
+DEFAULT_GRAMMAR = paths.OUT / "mutation_grammar.txt"
+CACHE_DIR = paths.ALPHA_ROOT / "data" / "cache" / "grammar"
+
+CLASS_BASE = 0xF0000          # classes are interned into Supplementary Private Use Area-A
+PASSTHROUGH_SETS = {
+    "default": DEFAULT_PASSTHROUGH,
+    "whitespace": string.whitespace,
+    "digits": string.digits,
+    "punctuation": string.punctuation,
+}
+
+_COMMENT = re.compile(r"(?:^|\s)#.*$")
+_RULE = re.compile(r"(\S+)\s+->\s+(\S+)")
+_SYMBOL = re.compile(r"\{([^{}]+)\}|\\u\{([0-9A-Fa-f]{1,6})\}|\\(.)|(.)")
+
+
+class GrammarError(ValueError):
+    def __init__(self, message: str, line: int | None = None) -> None:
+        super().__init__(f"line {line}: {message}" if line else message)
+        self.line = line
+
+
+# ——— parsing ———
+
+@dataclass
+class Layer:
+    name: str
+    rules: dict[str, str] = field(default_factory=dict)
+    lines: dict[str, int] = field(default_factory=dict)      # lhs -> source line
+
+
+class _Parser:
+    def __init__(self) -> None:
+        self.classes: dict[str, str] = {}                    # class name -> interned code point
+        self.layers: list[Layer] = []
+        self.passthrough: str | None = None
+        self.passthrough_set = False
+
+    def intern(self, name: str, line: int) -> str:
+        sym = self.classes.get(name)
+        if sym is None:
+            if len(self.classes) >= 0xFFFE:
+                raise GrammarError("too many glyph classes", line)
+            sym = self.classes[name] = chr(CLASS_BASE + len(self.classes))
+        return sym
+
+    def symbols(self, text: str, line: int) -> str:
+        out = []
+        for m in _SYMBOL.finditer(text):
+            cls, code, escaped, literal = m.groups()
+            if cls is not None:
+                out.append(self.intern(cls, line))
+            elif code is not None:
+                cp = int(code, 16)
+                if cp > 0x10FFFF:
+                    raise GrammarError(f"code point out of range: {m.group()}", line)
+                out.append(chr(cp))
+            else:
+                out.append(escaped if escaped is not None else literal)
+        return "".join(out)
+
+    def directive(self, text: str, line: int) -> None:
+        name, _, value = text.partition(" ")
+        if name != "%passthrough":
+            raise GrammarError(f"unknown directive {name}", line)
+        if self.passthrough_set:
+            raise GrammarError("%passthrough given twice", line)
+        self.passthrough_set = True
+        items = value.split()
+        if items == ["any"]:
+            self.passthrough = None
+            return
+        chars = []
+        for item in items:
+            chars.append(PASSTHROUGH_SETS.get(item) or self.symbols(item, line))
+        self.passthrough = "".join(dict.fromkeys("".join(chars)))
+
+    def rule(self, text: str, line: int) -> None:
+        if not self.layers:
+            raise GrammarError("rule outside of a [layer] section", line)
+        m = _RULE.fullmatch(text)
+        if not m:
+            raise GrammarError(f"expected 'lhs -> rhs', got {text!r}", line)
+        layer = self.layers[-1]
+        lhs, rhs = self.symbols(m.group(1), line), self.symbols(m.group(2), line)
+        if len(self.layers) == 1 and any(_is_class(c) for c in lhs):
+            raise GrammarError("glyph classes cannot be matched in the first layer", line)
+        if len(self.layers) > 1 and len(lhs) != 1:
+            raise GrammarError(f"layer [{layer.name}] rules must match exactly one symbol", line)
+        if lhs in layer.rules:
+            raise GrammarError(f"duplicate rule for {m.group(1)} (first on line {layer.lines[lhs]})", line)
+        layer.rules[lhs] = rhs
+        layer.lines[lhs] = line
+
+    def parse(self, source: str) -> None:
+        self.passthrough = DEFAULT_PASSTHROUGH
+        for no, raw in enumerate(source.splitlines(), 1):
+            text = _COMMENT.sub("", raw).strip()
+            if not text:
+                continue
+            if text.startswith("%"):
+                self.directive(text, no)
+            elif text.startswith("[") and text.endswith("]"):
+                name = text[1:-1].strip()
+                if not name or any(l.name == name for l in self.layers):
+                    raise GrammarError(f"bad or repeated layer name [{name}]", no)
+                self.layers.append(Layer(name))
+            else:
+                self.rule(text, no)
+        if not self.layers or not any(l.rules for l in self.layers):
+            raise GrammarError("grammar has no rules")
+
+
+def _is_class(ch: str) -> bool:
+    return CLASS_BASE <= ord(ch) < CLASS_BASE + 0xFFFE
+
+
+def compose(layers: list[Layer]) -> dict[str, str]:
+    """Fold the layers into one leftmost-longest rule table.
+
+    Later layers only rewrite single symbols, so applying them to each earlier
+    right-hand side (and adding their rules for characters the earlier layers
+    leave untouched) gives exactly the result of running the layers in turn.
+    """
+    rules = dict(layers[0].rules)
+    for layer in layers[1:]:
+        step = {ord(k): v for k, v in layer.rules.items()}
+        rules = {lhs: rhs.translate(step) for lhs, rhs in rules.items()}
+        for lhs, rhs in layer.rules.items():
+            if lhs not in rules and not _is_class(lhs):
+                rules[lhs] = rhs
+    return rules
+
+
+# ——— reversibility ———
+
+@dataclass
+class Reversibility:
+    collisions: dict[str, list[str]]           # output -> inputs producing it
+    prefixes: list[tuple[str, str]]            # (output, longer output it is a prefix of)
+    clashes: str                               # passthrough characters used in outputs
+    passthrough_any: bool
+
+    @property
+    def ok(self) -> bool:
+        return not (self.collisions or self.prefixes or self.clashes or self.passthrough_any)
+
+    def lines(self, limit: int = 5) -> list[str]:
+        out = []
+        if self.passthrough_any:
+            out.append("%passthrough any: any output character may also be passthrough text")
+        for rhs, lhs in list(self.collisions.items())[:limit]:
+            out.append(f"{_show(rhs)} is produced by {', '.join(map(_show, lhs))}")
+        for short, long in self.prefixes[:limit]:
+            out.append(f"{_show(short)} is a prefix of {_show(long)}")
+        if self.clashes:
+            out.append(f"outputs use passthrough characters {_show(self.clashes)}")
+        hidden = max(0, len(self.collisions) - limit) + max(0, len(self.prefixes) - limit)
+        if hidden:
+            out.append(f"... and {hidden} more")
+        return out
+
+
+def check_reversible(rules: dict[str, str], passthrough: str | None) -> Reversibility:
+    by_rhs: dict[str, list[str]] = {}
+    for lhs, rhs in rules.items():
+        by_rhs.setdefault(rhs, []).append(lhs)
+    collisions = {rhs: lhs for rhs, lhs in by_rhs.items() if len(lhs) > 1}
+    # In sorted order every string that has a prefix in the set sorts right after one.
+    outputs = sorted(by_rhs)
+    prefixes = [(a, b) for a, b in zip(outputs, outputs[1:]) if b.startswith(a)]
+    used = set("".join(outputs))
+    clashes = "" if passthrough is None else "".join(sorted(used & set(passthrough)))
+    return Reversibility(collisions, prefixes, clashes, passthrough is None)
+
+
+def _show(s: str) -> str:
+    return " ".join(f"U+{ord(c):04X}" if not c.isprintable() or unicodedata.category(c) in ("Mn", "Cf") else c
+                    for c in s)
+
+
+# ——— transducer ———
+
+def _char_class(chars, negate: bool = False) -> str:
+    return "[" + ("^" if negate else "") + "".join(re.escape(c) for c in chars) + "]"
+
+
+def _trie_pattern(keys) -> str:
+    """Alternation shaped like a trie of ``keys``; longer matches are tried first."""
+    trie: dict = {}
+    for key in keys:
+        node = trie
+        for c in key:
+            node = node.setdefault(c, {})
+        node[""] = True
+
+    def alternation(node: dict) -> str:
+        leaves, branches = [], []
+        for c in sorted(k for k in node if k):
+            child = node[c]
+            if child.keys() == {""}:
+                leaves.append(c)
+                continue
+            rest = alternation({k: v for k, v in child.items() if k})
+            branches.append(re.escape(c) + (f"(?:{rest})?" if "" in child else f"(?:{rest})"))
+        if leaves:
+            branches.append(_char_class(leaves) if len(leaves) > 1 else re.escape(leaves[0]))
+        return "|".join(branches)
+
+    return alternation(trie)
+
+
+def _translate_table(rules: dict[str, str]) -> list | dict:
+    """Flat list indexed by code point, like ``transliterate.Alphabet``; dict for sparse astral keys."""
+    top = max(map(ord, rules))
+    if top < 1 << 17:
+        table = [chr(i) for i in range(top + 1)]
+        for k, v in rules.items():
+            table[ord(k)] = v
+        return table
+    return {ord(k): v for k, v in rules.items()}
+
+
+class Transducer:
+    """Compiled leftmost-longest rewriter for one rule table."""
+
+    def __init__(self, rules: dict[str, str], passthrough: str | None) -> None:
+        self.rules = rules
+        self.passthrough = passthrough
+        self.max_lhs = max(map(len, rules), default=1)
+        self.table = None
+        self.pattern = None
+        self.unmapped = None
+        if self.max_lhs == 1:
+            self.table = _translate_table(rules)
+            if passthrough is not None:
+                self.unmapped = re.compile(_char_class(list(rules) + list(passthrough), negate=True))
+        else:
+            trie = _trie_pattern(rules)
+            if passthrough is not None:
+                # Anything that is neither a rule nor passthrough matches the last branch and is reported.
+                trie += "|" + (_char_class(passthrough, negate=True) if passthrough else ".")
+            self.pattern = re.compile(trie, re.DOTALL)
+
+    def state(self) -> dict:
+        """JSON-ready snapshot for the cache; the translate table is rebuilt from the rules."""
+        return {
+            "rules": self.rules,
+            "passthrough": self.passthrough,
+            "max_lhs": self.max_lhs,
+            "pattern": self.pattern.pattern if self.pattern is not None else None,
+            "unmapped": self.unmapped.pattern if self.unmapped is not None else None,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "Transducer":
+        self = cls.__new__(cls)
+        self.rules = state["rules"]
+        self.passthrough = state["passthrough"]
+        self.max_lhs = state["max_lhs"]
+        self.table = _translate_table(self.rules) if self.max_lhs == 1 else None
+        self.pattern = re.compile(state["pattern"], re.DOTALL) if state["pattern"] is not None else None
+        self.unmapped = re.compile(state["unmapped"]) if state["unmapped"] is not None else None
+        return self
+
+    def feed(self, buf: str, offset: int = 0, final: bool = True) -> tuple[str, int]:
+        """Rewrite ``buf``; returns (output, chars consumed).  Unconsumed input must be fed again."""
+        if self.table is not None:
+            if self.unmapped is not None:
+                bad = self.unmapped.search(buf)
+                if bad:
+                    raise UnmappedCharacter(bad.group(), offset + bad.start())
+            return buf.translate(self.table), len(buf)
+
+        # A match starting at or after ``stop`` might still grow with the next chunk.
+        stop = len(buf) if final else len(buf) - self.max_lhs + 1
+        rules = self.rules
+        pieces = []
+        pos = 0
+        for m in self.pattern.finditer(buf):
+            start = m.start()
+            if start >= stop:
+                break
+            rep = rules.get(m[0])
+            if rep is None:
+                raise UnmappedCharacter(m[0], offset + start)
+            pieces.append(buf[pos:start])
+            pieces.append(rep)
+            pos = m.end()
+        end = max(pos, stop)
+        pieces.append(buf[pos:end])
+        return "".join(pieces), end
+
+    def convert(self, text: str, offset: int = 0) -> str:
+        return self.feed(text, offset)[0]
+
+    def inverse(self) -> "Transducer":
+        return Transducer({rhs: lhs for lhs, rhs in self.rules.items()}, self.passthrough)
+
+
+def transduce_stream(src: TextIO, dst: TextIO, transducer: Transducer,
+                     chunk_chars: int = CHUNK_CHARS) -> tuple[int, int]:
+    """Rewrite ``src`` into ``dst`` chunk by chunk; returns (chars in, chars out)."""
+    carry = ""
+    n_in = n_out = 0
+    while True:
+        chunk = src.read(chunk_chars)
+        buf = carry + chunk if carry else chunk
+        out, used = transducer.feed(buf, n_in, final=not chunk)
+        dst.write(out)
+        n_in += used
+        n_out += len(out)
+        carry = buf[used:]
+        if not chunk:
+            return n_in, n_out
+
+
+# ——— compile + cache ———
+
+@dataclass
+class Grammar:
+    sha: str
+    layers: list[tuple[str, int]]                # (layer name, rule count)
+    classes: int
+    forward: Transducer
+    backward: Transducer | None
+    reversibility: Reversibility
+
+    @property
+    def reversible(self) -> bool:
+        return self.reversibility.ok
+
+    def state(self) -> dict:
+        return {
+            "sha": self.sha,
+            "layers": self.layers,
+            "classes": self.classes,
+            "forward": self.forward.state(),
+            "backward": self.backward.state() if self.backward is not None else None,
+            "reversibility": asdict(self.reversibility),
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "Grammar":
+        rev = state["reversibility"]
+        return cls(
+            sha=state["sha"],
+            layers=[(name, n) for name, n in state["layers"]],
+            classes=state["classes"],
+            forward=Transducer.from_state(state["forward"]),
+            backward=Transducer.from_state(state["backward"]) if state["backward"] is not None else None,
+            reversibility=Reversibility(
+                collisions=rev["collisions"],
+                prefixes=[(short, long) for short, long in rev["prefixes"]],
+                clashes=rev["clashes"],
+                passthrough_any=rev["passthrough_any"],
+            ),
+        )
+
+
+def compile_source(source: str) -> Grammar:
+    parser = _Parser()
+    parser.parse(source)
+    rules = compose(parser.layers)
+    names = {sym: name for name, sym in parser.classes.items()}
+    for lhs, rhs in rules.items():
+        leaked = [names[c] for c in rhs if _is_class(c)]
+        if leaked:
+            line = parser.layers[0].lines.get(lhs)
+            raise GrammarError(f"class {{{leaked[0]}}} is never rewritten by a later layer", line)
+    report = check_reversible(rules, parser.passthrough)
+    forward = Transducer(rules, parser.passthrough)
+    return Grammar(
+        sha=_sha(source),
+        layers=[(l.name, len(l.rules)) for l in parser.layers],
+        classes=len(parser.classes),
+        forward=forward,
+        backward=forward.inverse() if report.ok else None,
+        reversibility=report,
+    )
+
+
+def _sha(source: str) -> str:
+    return hashlib.sha256(f"{COMPILER_VERSION}\n{source}".encode("utf-8")).hexdigest()
+
+
+def load_grammar(path: Path = DEFAULT_GRAMMAR, cache_dir: Path | None = CACHE_DIR) -> tuple[Grammar, bool]:
+    """Compiled grammar for ``path`` and whether it came from the cache."""
+    source = path.read_text(encoding="utf-8")
+    sha = _sha(source)
+    cached = None if cache_dir is None else cache_dir / f"{sha}.json"
+    if cached is not None and cached.exists():
+        try:
+            state = json.loads(cached.read_text(encoding="utf-8"))
+            if state["sha"] == sha:
+                return Grammar.from_state(state), True
+        except (OSError, ValueError, KeyError, TypeError, re.error):
+            pass  # stale, truncated or hand-edited: recompile below
+    grammar = compile_source(source)
+    if cached is not None:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_suffix(".tmp")
+        tmp.write_text(json.dumps(grammar.state()), encoding="utf-8")   # ASCII-escaped: lone surrogates survive
+        tmp.replace(cached)
+    return grammar, False
+
+
+# ——— seed ———
+
+def _selector(k: int) -> str:
+    """The k-th variation selector (VS1–VS16, then VS17–VS256)."""
+    if k < 16:
+        return chr(0xFE00 + k)
+    if k < 256:
+        return chr(0xE0100 + k - 16)
+    raise ValueError("more than 256 classes for one base letter")
+
+
+def _escape(s: str) -> str:
+    out = []
+    for c in s:
+        if c in " \\{}#" or not c.isprintable() or unicodedata.category(c) in ("Mn", "Me", "Cf"):
+            out.append(f"\\u{{{ord(c):04X}}}")
+        else:
+            out.append(c)
+    return "".join(out)
+
+
+def seed_source(latin: list[dict], az_rows: list[dict]) -> tuple[str, int, int]:
+    """Grammar text from the E8 families and the A–Z signs; returns (text, letters, skipped)."""
+    import e8_family_grouper as grouper
+
+    signs = {r["letter"]: r["char"] for r in az_rows if r.get("status") == "selected" and r.get("char")}
+    families = grouper.group_letters(latin)
+    classes, tokens = [], []
+    skipped = 0
+    for base in sorted(families):
+        sign = signs.get(base)
+        if sign is None:
+            skipped += sum(len(m) for m in families[base].values())
+            continue
+        k = 0
+        for feature, members in sorted(families[base].items()):
+            seen = Counter()
+            for m in members:
+                seen[m["case"]] += 1
+                name = f"{base}.{feature.replace(' ', '_')}.{m['case']}"
+                if seen[m["case"]] > 1:
+                    name += f"#{seen[m['case']]}"
+                classes.append(f"{_escape(m['char'])} -> {{{name}}}    # {m['name']}")
+                tokens.append(f"{{{name}}} -> {_escape(sign + _selector(k))}")
+                k += 1
+    header = [
+        "# Miohalo mutation grammar, seeded by mutation_grammar.py seed",
+        "# from the E8 families (base.FEATURE.case) and az_cuneiform_selection.json.",
+        "# Tokens are the base letter's sign plus a variation selector naming the class.",
+        "",
+        "%passthrough default",
+        "",
+        "[class]",
+    ]
+    text = "\n".join(header + classes + ["", "[token]"] + tokens) + "\n"
+    return text, len(classes), skipped
+
+
+# ——— CLI ———
+
+def bench(grammar: Grammar, megabytes: float) -> dict:
+    letters = [lhs for lhs in grammar.forward.rules if len(lhs) == 1]
+    rng = random.Random(13)
+    words = ["".join(rng.choice(letters) for _ in range(rng.randint(2, 10))) for _ in range(2000)]
+    block = " ".join(rng.choice(words) + rng.choice(("", "", ",", ".")) for _ in range(20000)) + "\n"
+    text = block * max(1, int(megabytes * 1e6 / len(block.encode("utf-8"))))
+    text_mb = len(text.encode("utf-8")) / 1e6
+
+    dst = io.StringIO()
+    t0 = time.perf_counter()
+    transduce_stream(io.StringIO(text), dst, grammar.forward)
+    t1 = time.perf_counter()
+    encoded = dst.getvalue()
+    encoded_mb = len(encoded.encode("utf-8")) / 1e6
+    result = {
+        "text_mb": round(text_mb, 2),
+        "encoded_mb": round(encoded_mb, 2),
+        "encode_mb_per_s": round(text_mb / (t1 - t0), 1),
+        "encode_path": "translate" if grammar.forward.table is not None else "trie",
+    }
+    if grammar.backward is not None:
+        dst = io.StringIO()
+        t2 = time.perf_counter()
+        transduce_stream(io.StringIO(encoded), dst, grammar.backward)
+        t3 = time.perf_counter()
+        assert dst.getvalue() == text, "round trip mismatch"
+        result["decode_mb_per_s"] = round(encoded_mb / (t3 - t2), 1)
+        result["decode_path"] = "translate" if grammar.backward.table is not None else "trie"
+    return result
+
+
+def _open_out(path: Path | None) -> TextIO:
+    if path is None:
+        return io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="", write_through=False)
+    return path.open("w", encoding="utf-8", newline="")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compile and apply Miohalo mutation grammars.")
+    parser.add_argument("-g", "--grammar", type=Path, default=DEFAULT_GRAMMAR)
+    parser.add_argument("--no-cache", action="store_true", help="Always recompile; do not write the cache.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("seed", help="Write a grammar from the E8 families and the A-Z signs.")
+    p.add_argument("-o", "--output", type=Path, default=None, help="Default: the --grammar path.")
+    p = sub.add_parser("check", help="Compile the grammar and report reversibility.")
+    p.add_argument("--require-reversible", action="store_true", help="Exit 1 unless the grammar is reversible.")
+    for name in ("encode", "decode"):
+        p = sub.add_parser(name, help=f"{name.title()} a file or stdin.")
+        p.add_argument("-i", "--input", type=Path, help="Input file (default stdin).")
+        p.add_argument("-o", "--output", type=Path, help="Output file (default stdout).")
+        p.add_argument("--chunk", type=int, default=CHUNK_CHARS, help="Characters per read.")
+    p = sub.add_parser("bench", help="Measure MB/s in both directions.")
+    p.add_argument("--mb", type=float, default=16.0, help="Size of the synthetic corpus.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.command == "seed":
+        if not paths.LATIN_ALL_JSON.exists():
+            raise SystemExit("latin_all.json missing. Run scripts/collect_latin.py first.")
+        latin = json.loads(paths.LATIN_ALL_JSON.read_text(encoding="utf-8"))
+        az_rows = json.loads(paths.AZ_SELECTION_JSON.read_text(encoding="utf-8"))
+        text, n, skipped = seed_source(latin, az_rows)
+        out = args.output or args.grammar
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(text, encoding="utf-8")
+        print(f"[ok] {n} letters seeded ({skipped} skipped: base letter outside A-Z) → {out}")
+        return 0
+
+    if not args.grammar.exists():
+        raise SystemExit(f"No grammar at {args.grammar}. Run `mutation_grammar.py seed` first.")
+    t0 = time.perf_counter()
+    try:
+        grammar, hit = load_grammar(args.grammar, None if args.no_cache else CACHE_DIR)
+    except GrammarError as e:
+        print(f"[error] {args.grammar}: {e}", file=sys.stderr)
+        return 1
+    took_ms = (time.perf_counter() - t0) * 1000
+
+    if args.command == "check":
+        layers = ", ".join(f"[{name}] {n}" for name, n in grammar.layers)
+        how = "loaded from cache" if hit else "compiled"
+        print(f"[ok] {how} in {took_ms:.1f} ms: {layers}; {grammar.classes} classes, "
+              f"{len(grammar.forward.rules)} composed rules (max lhs {grammar.forward.max_lhs})")
+        if grammar.reversible:
+            print("[ok] reversible")
+            return 0
+        print("[warn] not reversible:")
+        for line in grammar.reversibility.lines():
+            print(f"  - {line}")
+        return 1 if args.require_reversible else 0
+
+    if args.command == "bench":
+        print(json.dumps(bench(grammar, args.mb), indent=2))
+        return 0
+
+    transducer = grammar.forward if args.command == "encode" else grammar.backward
+    if transducer is None:
+        print("[error] grammar is not reversible; run `check` for details", file=sys.stderr)
+        return 1
+    if args.input is not None and not args.input.is_file():
+        raise SystemExit(f"No input at {args.input}")
+    src = open_in(args.input)
+    try:
+        if args.output is None:
+            dst = _open_out(None)
+            try:
+                transduce_stream(src, dst, transducer, args.chunk)
+            finally:
+                dst.flush()
+        else:
+            # Written next to the target and renamed only once the whole input went through.
+            tmp = args.output.with_name(args.output.name + ".tmp")
+            try:
+                with _open_out(tmp) as dst:
+                    transduce_stream(src, dst, transducer, args.chunk)
+                tmp.replace(args.output)
+            finally:
+                tmp.unlink(missing_ok=True)
+    except (UnmappedCharacter, InvalidUtf8) as e:
+        print(f"[error] {e}", file=sys.stderr)
+        return 1
+    finally:
+        if args.input is not None:
+            src.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
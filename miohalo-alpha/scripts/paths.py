@@ -0,0 +1,70 @@
+"""Project layout shared by the miohalo-alpha scripts and the ``miohalo`` CLI.
+
+``pathlib`` constants: importing this module must stay free of I/O so the CLI
+can resolve every stage's inputs/outputs without touching the disk.  The one
+function, ``font_paths()``, checks the disk only when called.
+"""
+
+from __future__ import annotations
+
+import os
+import pathlib
+
+SCRIPTS = pathlib.Path(__file__).resolve().parent
+ALPHA_ROOT = SCRIPTS.parent
+REPO_ROOT = ALPHA_ROOT.parent
+
+RAW = ALPHA_ROOT / "data" / "raw"
+OUT = ALPHA_ROOT / "data" / "out"
+FONTS_DIR = ALPHA_ROOT / "fonts" / "Noto_Sans"
+REJECT_TXT = ALPHA_ROOT / "data" / "reject.txt"
+
+LATIN_ALL_JSON = RAW / "latin_all.json"
+SELECTION_JSON = OUT / "selection_suggestion.json"
+FAMILIES_JSON = OUT / "families.json"
+PREVIEW_PNG = ALPHA_ROOT / "preview.png"
+CATALOG_DB = ALPHA_ROOT / "data" / "catalog.sqlite3"
+BENCH = ALPHA_ROOT / "data" / "bench"
+METRICS = ALPHA_ROOT / "data" / "metrics"
+
+CUNEIFORM_ROOT = REPO_ROOT / "cuneiform-alphabet-table"
+CUNEIFORM_SCRIPTS = CUNEIFORM_ROOT / "scripts"
+CUNEIFORM_LIBRARY_JSON = CUNEIFORM_ROOT / "data" / "raw" / "cuneiform_unicode_library.json"
+AZ_SELECTION_JSON = CUNEIFORM_ROOT / "data" / "processed" / "az_cuneiform_selection.json"
+
+HOMEPAGE = REPO_ROOT / "miohalo-homepage"
+HOMEPAGE_SELECTION_JSON = HOMEPAGE / "data" / "az_cuneiform_selection.json"
+GLYPH_ATLAS_DIR = HOMEPAGE / "public" / "glyph-atlas"
+GLYPH_ATLAS_JSON = HOMEPAGE / "data" / "az_cuneiform_atlas.json"
+
+# The fallback font chain of the audit, preview, raster features, sprite atlas and
+# subsets: project fonts (drop more TTFs into fonts/Noto_Sans/) first, then system
+# guesses.  Earlier fonts win when several cover a character.
+FONT_NAMES = (
+    "NotoSans-Regular.ttf",
+    "NotoSansDisplay-Regular.ttf",
+    "NotoSansSymbols2-Regular.ttf",
+    "NotoSansCuneiform-Regular.ttf",
+    "NotoSansSC-Regular.otf",
+    "NotoSans-VariableFont_wdth,wght.ttf",
+    "NotoSans-Italic-VariableFont_wdth,wght.ttf",
+)
+SYSTEM_FONTS = (
+    "/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf",
+    r"C:\Windows\Fonts\NotoSans-Regular.ttf",
+    r"C:\Windows\Fonts\NotoSansDisplay-Regular.ttf",
+    r"C:\Windows\Fonts\seguisym.ttf",
+    r"C:\Windows\Fonts\segoeui.ttf",
+    r"C:\Windows\Fonts\msyh.ttc",
+    "/System/Library/Fonts/Supplemental/NotoSans.ttc",
+    "/System/Library/Fonts/Supplemental/AppleSymbols.ttf",
+    "/System/Library/Fonts/PingFang.ttc",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+)
+
+
+def font_paths() -> list[str]:
+    """The font chain's files that exist here, in chain order."""
+    found = [(FONTS_DIR / n).as_posix() for n in FONT_NAMES if (FONTS_DIR / n).exists()]
+    found += [p for p in SYSTEM_FONTS if os.path.exists(p)]
+    return list(dict.fromkeys(found))
@@ -6,22 +6,20 @@
 # ─────────────────────────────────────────────────────────────────────────────
 # 用法：
 #   python scripts/preview_miohalo_selection.py
+#   python scripts/preview_miohalo_selection.py --subsets   # 用 font_subset.py 裁好的小字体
 # 说明：
 #   - 自动扫描 fonts/Noto_Sans/ 下的 ttf/otf，逐字选择“真支持该字符”的字体绘制，杜绝方块。
 #   - 只画大字形，无任何编码/网格背景；更高 DPI 与更合理行距。
 #   - 建议放入：NotoSans-Regular.ttf、NotoSansDisplay-Regular.ttf、
 #               NotoSansSymbols2-Regular.ttf、NotoSansSC-Regular.otf（或 CJK 变体）
 
-import os, sys, json, pathlib, unicodedata as ud, re
-import matplotlib
-matplotlib.use("Agg")  # 哥哥：我们只生成图片，不弹出窗口。
-from matplotlib import font_manager
-import matplotlib.pyplot as plt
-from matplotlib.ft2font import FT2Font
-from matplotlib.font_manager import FontProperties
+import argparse, sys, json, pathlib, unicodedata as ud, re
 from functools import lru_cache
 from collections import defaultdict
 
+import instrument
+import paths
+
 # ───────────────── 路径
 # 妹妹：这些是约定的项目结构，跟着用就好。
 ROOT = pathlib.Path(__file__).resolve().parent.parent
@@ -29,7 +27,6 @@ SELECTION  = ROOT / "data" / "out" / "selection_suggestion.json"
 OUTTXT     = ROOT / "data" / "out" / "char_list.txt"
 OUTCSV     = ROOT / "data" / "out" / "char_groups.csv"
 OUTPNG     = ROOT / "preview.png"
-FONTS_DIR  = ROOT / "fonts" / "Noto_Sans"
 REJECT_TXT = ROOT / "data" / "reject.txt"
 
 # ───────────────── 画面参数 / 行为开关
@@ -46,91 +43,52 @@ MARGIN_L    = 0.04
 MARGIN_R    = 0.96
 
 # ───────────────── 读取候选集
-if not SELECTION.exists():
-    print("⚠️ 未找到 data/out/selection_suggestion.json（先跑 scripts/e8_family_rank_sample.py）")
-    sys.exit(1)
-
 # 妹妹：候选既支持 ["字", ...] 也支持 [{"char":"字"}, ...]。
-raw = json.loads(SELECTION.read_text(encoding="utf-8"))
-if not raw:
-    print("⚠️ 候选集为空"); sys.exit(1)
-
-chars = []
-for it in raw:
-    ch = it.get("char", "") if isinstance(it, dict) else str(it)
-    if ch:
-        chars.append(ch)
+def selection_chars(raw) -> list[str]:
+    chars = []
+    for it in raw:
+        ch = it.get("char", "") if isinstance(it, dict) else str(it)
+        if ch:
+            chars.append(ch)
+    return chars
 
 # ───────────────── 黑名单过滤（data/reject.txt）
 # 哥哥：不想要的字直接写进 reject.txt（每行一个），这里自动剔除。
-REJECT = set()
-if REJECT_TXT.exists():
-    REJECT = set(REJECT_TXT.read_text(encoding="utf-8").split())
-if REJECT:
-    before = len(chars)
-    chars = [ch for ch in chars if ch not in REJECT]
-    print(f"• 黑名单过滤：移除 {before - len(chars)} 个字符")
-
-# ───────────────── 收集字体文件
-# 妹妹：优先项目内 fonts/Noto_Sans/，其次系统路径兜底。
-CANDIDATE_NAMES = [
-    "NotoSans-Regular.ttf",
-    "NotoSansDisplay-Regular.ttf",
-    "NotoSansSymbols2-Regular.ttf",
-    "NotoSansSC-Regular.otf",                # CJK（如有）
-    "NotoSans-VariableFont_wdth,wght.ttf",
-    "NotoSans-Italic-VariableFont_wdth,wght.ttf",
-]
-font_paths = []
-if FONTS_DIR.exists():
-    for name in CANDIDATE_NAMES:
-        fp = (FONTS_DIR / name)
-        if fp.exists():
-            font_paths.append(fp.as_posix())
-
-# 系统猜测（可按平台增减）
-system_guess = [
-    r"C:\Windows\Fonts\NotoSans-Regular.ttf",
-    r"C:\Windows\Fonts\NotoSansDisplay-Regular.ttf",
-    r"C:\Windows\Fonts\seguisym.ttf",
-    r"C:\Windows\Fonts\segoeui.ttf",
-    r"C:\Windows\Fonts\msyh.ttc",
-    "/System/Library/Fonts/Supplemental/NotoSans.ttc",
-    "/System/Library/Fonts/Supplemental/AppleSymbols.ttf",
-    "/System/Library/Fonts/PingFang.ttc",
-    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-]
-for p in system_guess:
-    if os.path.exists(p):
-        font_paths.append(p)
-
-# 去重，保持顺序
-seen = set()
-font_paths = [p for p in font_paths if (p not in seen and not seen.add(p))]
-if not font_paths:
-    print("⚠️ 没找到任何字体文件。请把 Noto 的 ttf 放到 fonts/Noto_Sans/ 再试。")
-    sys.exit(1)
-
-# 妹妹：注册给 matplotlib，以便按 fname 精确指定。
-for p in font_paths:
-    try:
-        font_manager.fontManager.addfont(p)
-    except Exception:
-        pass
+def apply_reject(chars: list[str], reject_txt: pathlib.Path = REJECT_TXT) -> list[str]:
+    REJECT = set()
+    if reject_txt.exists():
+        REJECT = set(reject_txt.read_text(encoding="utf-8").split())
+    if REJECT:
+        before = len(chars)
+        chars = [ch for ch in chars if ch not in REJECT]
+        print(f"• 黑名单过滤：移除 {before - len(chars)} 个字符")
+    return chars
 
 # ───────────────── 建立“字符覆盖”与选字函数
 # 哥哥：我们读取每个字体的 charmap，真正能覆盖才用，避免画出方块。
 cover_maps = []
-for p in font_paths:
-    try:
-        f = FT2Font(p)
-        cmap = set(f.get_charmap().keys())
-        if cmap:
-            cover_maps.append((p, cmap))
-        else:
-            print(f"• 跳过（无 charmap）：{p}")
-    except Exception as e:
-        print(f"• 跳过（读取失败）：{p}  —— {e.__class__.__name__}")
+
+def load_cover_maps(font_paths: list[str]) -> list[tuple[str, set]]:
+    # 哥哥：matplotlib 很重，等候选集和字体都确认存在后再导入。
+    from matplotlib.ft2font import FT2Font
+
+    maps = []
+    for p in font_paths:
+        try:
+            f = FT2Font(p)
+            cmap = set(f.get_charmap().keys())
+            if cmap:
+                maps.append((p, cmap))
+            else:
+                print(f"• 跳过（无 charmap）：{p}")
+        except Exception as e:
+            print(f"• 跳过（读取失败）：{p}  —— {e.__class__.__name__}")
+    return maps
+
+def use_cover_maps(maps) -> None:
+    # 妹妹：换了字体表，选字缓存也要一起清掉。
+    cover_maps[:] = maps
+    font_path_for_text.cache_clear()
 
 # 控制码与变体选择器（不计入覆盖判断）
 IGNORES   = {0x200D, 0x200C, 0x200B, 0x2060}  # ZWJ/ZWNJ/ZWSP/WJ
@@ -152,11 +110,11 @@ def supports_sequence(cmap: set, s: str) -> bool:
     return all(cp in cmap for cp in cps)
 
 @lru_cache(maxsize=4096)
-def pick_font_for_text(s: str):
+def font_path_for_text(s: str):
     # 妹妹：逐个尝试字体，谁能“真覆盖”就用谁。
     for path, cmap in cover_maps:
         if supports_sequence(cmap, s):
-            return FontProperties(fname=path)
+            return path
     return None  # 真缺失：不画
 
 # ───────────────── 自适应相似归类（零写死）
@@ -196,7 +154,7 @@ def sort_key(ch: str):
         ch                       # 字符本身
     )
 
-if GROUP_BY_SKELETON:
+def group_by_skeleton(chars: list[str], verbose: bool = True) -> list[str]:
     # 哥哥：分桶、桶内排序、A–Z 顺序展开。
     buckets = defaultdict(list)
     for ch in chars:
@@ -207,67 +165,151 @@ if GROUP_BY_SKELETON:
                    [k for k in buckets if k not in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"]
 
     grouped_chars = []
-    print("\n── 分组预览（骨架 → 成员示例）")
+    if verbose:
+        print("\n── 分组预览（骨架 → 成员示例）")
     for k in ordered_keys:
         members = buckets[k]
         grouped_chars.extend(members)
-        preview = " ".join(members[:12])
-        print(f"[{k}] x{len(members)} : {preview}{' …' if len(members)>12 else ''}")
-    chars = grouped_chars
-
-# ───────────────── 画布尺寸
-N = len(chars)
-COLS = max(1, int(COLS))
-ROWS = (N + COLS - 1) // COLS
-# 妹妹：高度根据字号与行距推导，防止过密或过稀。
-FIG_W = COLS * 1.0
-FIG_H = max(1.0, ROWS * (GLYPH_FSIZE / 72.0) * LINE_PAD)
-
-fig = plt.figure(figsize=(FIG_W, FIG_H))
-plt.axis('off')
-fig.subplots_adjust(top=MARGIN_T, bottom=MARGIN_B, left=MARGIN_L, right=MARGIN_R)
-
-# ───────────────── 输出清单并绘制
-OUTTXT.parent.mkdir(parents=True, exist_ok=True)
-with OUTTXT.open("w", encoding="utf-8") as ftxt, OUTCSV.open("w", encoding="utf-8") as fcsv:
-    fcsv.write("index,char,codepoint,name,group\n")
+        if verbose:
+            preview = " ".join(members[:12])
+            print(f"[{k}] x{len(members)} : {preview}{' …' if len(members)>12 else ''}")
+    return grouped_chars
+
+# ───────────────── 绘制
+def render_preview(chars: list[str], font_paths: list[str], out_png=OUTPNG, out_txt=OUTTXT,
+                   out_csv=OUTCSV, verbose: bool = True) -> list[str]:
+    """画字魂墙并写清单；返回所有候选字体都覆盖不了的字符。"""
+    import matplotlib
+    matplotlib.use("Agg")  # 哥哥：我们只生成图片，不弹出窗口。
+    from matplotlib import font_manager
+    import matplotlib.pyplot as plt
+    from matplotlib.font_manager import FontProperties
+
+    # 妹妹：注册给 matplotlib，以便按 fname 精确指定。
+    with instrument.span("fonts.register"):
+        for p in font_paths:
+            try:
+                font_manager.fontManager.addfont(p)
+            except Exception:
+                pass
+
+    # ───────────────── 画布尺寸
+    N = len(chars)
+    cols = max(1, int(COLS))
+    ROWS = (N + cols - 1) // cols
+    # 妹妹：高度根据字号与行距推导，防止过密或过稀。
+    FIG_W = cols * 1.0
+    FIG_H = max(1.0, ROWS * (GLYPH_FSIZE / 72.0) * LINE_PAD)
+
+    fig = plt.figure(figsize=(FIG_W, FIG_H))
+    plt.axis('off')
+    fig.subplots_adjust(top=MARGIN_T, bottom=MARGIN_B, left=MARGIN_L, right=MARGIN_R)
+
+    # ───────────────── 输出清单并绘制
+    out_txt.parent.mkdir(parents=True, exist_ok=True)
     missing = []
-
-    for idx, ch in enumerate(chars):
-        r = idx // COLS
-        c = idx % COLS
-        x = (c + 0.5) / COLS
-        y = 1.0 - ((r + 0.5) / max(1, ROWS))
-
-        fp = pick_font_for_text(ch)
-        if fp is None:
-            # 哥哥：极少数字符所有候选字体都不支持，就报告并跳过。
-            missing.append(ch)
-            continue
-
-        code  = f"U+{ord(ch):04X}"
-        name  = ud.name(ch, "<unknown>")
-        group = get_base(ch) if GROUP_BY_SKELETON else ""
-
-        # 控制台打印（便于定位删除/调整）
-        print(f"[{idx}] {ch}  {code}  {name}  [{group}]")
-
-        # 清单文件
-        ftxt.write(f"[{idx}] {ch}  {code}  {name}  [{group}]\n")
-        fcsv.write(f"{idx},{ch},{code},{name},{group}\n")
-
-        # 绘制大字形
-        plt.text(x, y + Y_SHIFT, ch,
-                 ha='center', va='center',
-                 fontsize=GLYPH_FSIZE,
-                 fontproperties=fp)
-
-# 妹妹：标题里会自动显示 n=当前数量。
-plt.suptitle(f"Miohalo · E8 Resonant Selection  (n={N})", fontsize=14)
-plt.savefig(OUTPNG.as_posix(), dpi=DPI)
-print(f"\n✓ 纯字形预览已生成：{OUTPNG}")
-print(f"✓ 清单已写出：{OUTTXT}")
-print(f"✓ 分组明细：{OUTCSV}")
-if 'missing' in locals() and missing:
-    sample = "".join(missing[:40])
-    print(f"⚠️ {len(missing)} 个字符在候选字体中找不到，已跳过。示例：{sample}")
+    props = {}
+    with instrument.span("draw"), out_txt.open("w", encoding="utf-8") as ftxt, \
+            out_csv.open("w", encoding="utf-8") as fcsv:
+        fcsv.write("index,char,codepoint,name,group\n")
+
+        for idx, ch in enumerate(chars):
+            r = idx // cols
+            c = idx % cols
+            x = (c + 0.5) / cols
+            y = 1.0 - ((r + 0.5) / max(1, ROWS))
+
+            path = font_path_for_text(ch)
+            if path is None:
+                # 哥哥：极少数字符所有候选字体都不支持，就报告并跳过。
+                missing.append(ch)
+                continue
+            if path not in props:
+                props[path] = FontProperties(fname=path)
+
+            code  = f"U+{ord(ch):04X}"
+            name  = ud.name(ch, "<unknown>")
+            group = get_base(ch) if GROUP_BY_SKELETON else ""
+
+            # 控制台打印（便于定位删除/调整）
+            if verbose:
+                print(f"[{idx}] {ch}  {code}  {name}  [{group}]")
+
+            # 清单文件
+            ftxt.write(f"[{idx}] {ch}  {code}  {name}  [{group}]\n")
+            fcsv.write(f"{idx},{ch},{code},{name},{group}\n")
+
+            # 绘制大字形
+            plt.text(x, y + Y_SHIFT, ch,
+                     ha='center', va='center',
+                     fontsize=GLYPH_FSIZE,
+                     fontproperties=props[path])
+
+    # 妹妹：标题里会自动显示 n=当前数量。
+    plt.suptitle(f"Miohalo · E8 Resonant Selection  (n={N})", fontsize=14)
+    with instrument.span("savefig"):
+        plt.savefig(out_png.as_posix(), dpi=DPI)
+    plt.close(fig)
+    instrument.count("drawn", N - len(missing))
+    instrument.count("missing", len(missing))
+    for p in (out_png, out_txt, out_csv):
+        instrument.file_written(p.name, p)
+    return missing
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Render the Miohalo selection preview sheet.")
+    parser.add_argument("--subsets", action="store_true",
+                        help="Draw with per-selection font subsets (font_subset.py) instead of full fonts.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    with instrument.run("preview"):
+        _main(subsets=args.subsets)
+
+
+def _main(subsets: bool = False) -> None:
+    if not SELECTION.exists():
+        print("⚠️ 未找到 data/out/selection_suggestion.json（先跑 scripts/e8_family_rank_sample.py）")
+        sys.exit(1)
+
+    with instrument.span("load"):
+        raw = json.loads(SELECTION.read_text(encoding="utf-8"))
+    instrument.file_read("selection_suggestion.json", SELECTION)
+    if not raw:
+        print("⚠️ 候选集为空"); sys.exit(1)
+    chars = apply_reject(selection_chars(raw))
+
+    font_paths = paths.font_paths()
+    if not font_paths:
+        print("⚠️ 没找到任何字体文件。请把 Noto 的 ttf 放到 fonts/Noto_Sans/ 再试。")
+        sys.exit(1)
+    if subsets:
+        # 妹妹：换成只含选集字形的子集字体，读 charmap 和注册字体都轻得多；子集按选集哈希缓存。
+        import font_subset
+        with instrument.span("fonts.subset"):
+            font_paths = font_subset.ensure_subsets(font_paths)
+    with instrument.span("fonts.charmap"):
+        use_cover_maps(load_cover_maps(font_paths))
+    for p in font_paths:
+        instrument.file_read("fonts", pathlib.Path(p))
+    instrument.watch_cache("font_path_for_text", font_path_for_text)
+
+    if GROUP_BY_SKELETON:
+        with instrument.span("group"):
+            chars = group_by_skeleton(chars)
+
+    with instrument.span("render"):
+        missing = render_preview(chars, font_paths)
+    print(f"\n✓ 纯字形预览已生成：{OUTPNG}")
+    print(f"✓ 清单已写出：{OUTTXT}")
+    print(f"✓ 分组明细：{OUTCSV}")
+    if missing:
+        sample = "".join(missing[:40])
+        print(f"⚠️ {len(missing)} 个字符在候选字体中找不到，已跳过。示例：{sample}")
+
+
+if __name__ == "__main__":
+    main()
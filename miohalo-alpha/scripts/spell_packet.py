@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""Spell packets (roadmap Phase C): binary and cuneiform-glyph codecs.
+
+A packet is ``verb source → target #seq [symbols...]`` with the verb drawn from
+``invoke | bind | transform | seal | handoff``.  Two wire forms:
+
+* **binary** — one length-prefixed frame per packet::
+
+      varint  frame length
+      u8      (VERSION << 5) | verb opcode
+      varint  seq
+      ref     source, target
+      varint  symbol count, then one ref per symbol
+
+  A ``ref`` is ``varint(index << 1)`` for a string already in the codec's
+  symbol dictionary, else ``varint(len << 1 | 1)`` + UTF-8 bytes (and the
+  string joins the dictionary on both sides).  Encoder and decoder therefore
+  stay in sync as long as they see the same packets in the same order.
+  Decoding walks a ``memoryview``; dictionary hits never touch the payload.
+  Every read is bounded by the frame, and a frame that is truncated or
+  malformed raises ``ValueError`` without changing the dictionary.
+
+* **glyph** — a human-readable line written in the A–Z cuneiform alphabet from
+  ``az_cuneiform_selection.json`` (via ``transliterate.Alphabet``).  Letters are
+  case-folded (decoding yields upper case), digits and ``-_.`` pass through,
+  anything else is rejected.
+
+Usage:
+  python miohalo-alpha/scripts/spell_packet.py show invoke ALPHA BETA --seq 7 --symbols FIRE WATER
+  python miohalo-alpha/scripts/spell_packet.py bench --count 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import paths
+from transliterate import Alphabet
+
+VERBS = ("invoke", "bind", "transform", "seal", "handoff")
+OPCODES = {verb: i for i, verb in enumerate(VERBS)}
+VERSION = 1
+MAX_DICTIONARY = 4096
+
+FIELD_SEP = " "
+SYMBOL_SEP = "·"
+PASSTHROUGH = "0123456789-_."
+
+
+@dataclass(frozen=True, slots=True)
+class SpellPacket:
+    verb: str
+    source: str
+    target: str
+    seq: int = 0
+    symbols: tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        if self.verb not in OPCODES:
+            raise ValueError(f"unknown verb {self.verb!r}; expected one of {', '.join(VERBS)}")
+        if self.seq < 0:
+            raise ValueError("seq must be non-negative")
+
+
+# ——— varints ———
+
+def write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(buf: memoryview, pos: int) -> tuple[int, int]:
+    byte = buf[pos]
+    if byte < 0x80:
+        return byte, pos + 1
+    value, shift = byte & 0x7F, 7
+    while True:
+        pos += 1
+        byte = buf[pos]
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos + 1
+        shift += 7
+
+
+class SymbolDictionary:
+    """Append-only string table shared (by replay) between an encoder and a decoder."""
+
+    def __init__(self, seed: tuple[str, ...] = (), limit: int = MAX_DICTIONARY) -> None:
+        self.limit = limit
+        self.strings: list[str] = []
+        self.index: dict[str, int] = {}
+        for s in seed:
+            self.add(s)
+
+    def add(self, s: str) -> None:
+        if len(self.strings) < self.limit and s not in self.index:
+            self.index[s] = len(self.strings)
+            self.strings.append(s)
+
+    def truncate(self, n: int) -> None:
+        """Forget every string added after the first ``n`` (undo a frame that failed to decode)."""
+        for s in self.strings[n:]:
+            del self.index[s]
+        del self.strings[n:]
+
+
+class BinaryCodec:
+    """Stateful binary codec; use one instance per direction of a stream."""
+
+    def __init__(self, seed: tuple[str, ...] = (), limit: int = MAX_DICTIONARY) -> None:
+        self.dictionary = SymbolDictionary(seed, limit)
+
+    def _write_ref(self, out: bytearray, s: str) -> None:
+        idx = self.dictionary.index.get(s)
+        if idx is not None:
+            write_varint(out, idx << 1)
+            return
+        raw = s.encode("utf-8")
+        write_varint(out, (len(raw) << 1) | 1)
+        out += raw
+        self.dictionary.add(s)
+
+    def _read_ref(self, buf: memoryview, pos: int) -> tuple[str, int]:
+        ref, pos = read_varint(buf, pos)
+        if not ref & 1:
+            return self.dictionary.strings[ref >> 1], pos
+        end = pos + (ref >> 1)
+        if end > len(buf):
+            raise ValueError(f"literal at offset {pos} runs past the end of its frame")
+        s = str(buf[pos:end], "utf-8")
+        self.dictionary.add(s)
+        return s, end
+
+    def encode_into(self, out: bytearray, packet: SpellPacket) -> None:
+        body = bytearray()
+        body.append((VERSION << 5) | OPCODES[packet.verb])
+        write_varint(body, packet.seq)
+        self._write_ref(body, packet.source)
+        self._write_ref(body, packet.target)
+        write_varint(body, len(packet.symbols))
+        for sym in packet.symbols:
+            self._write_ref(body, sym)
+        write_varint(out, len(body))
+        out += body
+
+    def encode(self, packet: SpellPacket) -> bytes:
+        out = bytearray()
+        self.encode_into(out, packet)
+        return bytes(out)
+
+    def decode_from(self, buf: memoryview, pos: int = 0) -> tuple[SpellPacket, int]:
+        """Decode the frame starting at ``pos``; returns the packet and the next offset.
+
+        Malformed or truncated frames raise ``ValueError`` and leave the symbol
+        dictionary as it was before the frame.
+        """
+        start, mark = pos, len(self.dictionary.strings)
+        try:
+            length, pos = read_varint(buf, pos)
+            end = pos + length
+            if end > len(buf):
+                raise ValueError(f"truncated frame at offset {start}: {end - len(buf)} bytes missing")
+            return self._decode_frame(buf[:end], pos), end
+        except (IndexError, ValueError) as e:
+            self.dictionary.truncate(mark)
+            if isinstance(e, IndexError):
+                raise ValueError(f"malformed frame at offset {start}: field past the frame end "
+                                 "or unknown dictionary index") from None
+            raise
+
+    def _decode_frame(self, buf: memoryview, pos: int) -> SpellPacket:
+        """Body of one frame; ``buf`` ends exactly at the frame end."""
+        end = len(buf)
+        header = buf[pos]
+        opcode = header & 0x1F
+        if header >> 5 != VERSION or opcode >= len(VERBS):
+            raise ValueError(f"bad packet header 0x{header:02x} at offset {pos}")
+        seq, pos = read_varint(buf, pos + 1)
+        source, pos = self._read_ref(buf, pos)
+        target, pos = self._read_ref(buf, pos)
+        count, pos = read_varint(buf, pos)
+        symbols = []
+        strings = self.dictionary.strings
+        for _ in range(count):
+            ref = buf[pos]
+            if ref < 0x80 and not ref & 1:  # one-byte dictionary hit: the common case
+                symbols.append(strings[ref >> 1])
+                pos += 1
+            else:
+                sym, pos = self._read_ref(buf, pos)
+                symbols.append(sym)
+        if pos != end:
+            raise ValueError(f"frame length mismatch at offset {pos} (expected {end})")
+        return SpellPacket(VERBS[opcode], source, target, seq, tuple(symbols))
+
+    def decode(self, data: bytes | bytearray | memoryview) -> SpellPacket:
+        return self.decode_from(memoryview(data))[0]
+
+    def iter_decode(self, data: bytes | bytearray | memoryview):
+        buf = memoryview(data)
+        pos, n = 0, len(buf)
+        while pos < n:
+            packet, pos = self.decode_from(buf, pos)
+            yield packet
+
+
+# ——— glyph form ———
+
+def load_alphabet(path: Path = paths.AZ_SELECTION_JSON) -> Alphabet:
+    return Alphabet.from_selection(path, passthrough=PASSTHROUGH + SYMBOL_SEP)
+
+
+class GlyphCodec:
+    """Stateless text form: one packet per line, letters written as cuneiform signs."""
+
+    def __init__(self, alphabet: Alphabet) -> None:
+        self.alphabet = alphabet
+
+    def _spell(self, text: str) -> str:
+        if not text or SYMBOL_SEP in text:
+            raise ValueError(f"field {text!r} is empty or contains {SYMBOL_SEP!r}")
+        return self.alphabet.encode(text)
+
+    def encode(self, packet: SpellPacket) -> str:
+        fields = [self._spell(packet.verb), str(packet.seq), self._spell(packet.source), self._spell(packet.target)]
+        if packet.symbols:
+            fields.append(SYMBOL_SEP.join(self._spell(sym) for sym in packet.symbols))
+        return FIELD_SEP.join(fields)
+
+    def decode(self, line: str) -> SpellPacket:
+        fields = line.strip().split(FIELD_SEP)
+        if len(fields) not in (4, 5):
+            raise ValueError(f"expected 4 or 5 fields, got {len(fields)}: {line!r}")
+        if not (fields[1].isascii() and fields[1].isdigit()):
+            raise ValueError(f"seq field {fields[1]!r} is not a decimal number: {line!r}")
+        read = self.alphabet.decode
+        symbols = tuple(read(fields[4]).split(SYMBOL_SEP)) if len(fields) == 5 else ()
+        return SpellPacket(read(fields[0]).lower(), read(fields[2]), read(fields[3]), int(fields[1]), symbols)
+
+
+# ——— benchmark ———
+
+def synthetic_packets(count: int, agents: int = 32, vocabulary: int = 512, seed: int = 7) -> list[SpellPacket]:
+    """Upper-case packets with a skewed symbol distribution (repeats dominate, like real chains)."""
+    rng = random.Random(seed)
+    names = [f"AGENT-{i}" for i in range(agents)]
+    words = ["".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(rng.randint(3, 9)))
+             for _ in range(vocabulary)]
+    weights = [1 / (i + 1) for i in range(vocabulary)]
+    return [
+        SpellPacket(
+            verb=rng.choice(VERBS),
+            source=rng.choice(names),
+            target=rng.choice(names),
+            seq=i,
+            symbols=tuple(rng.choices(words, weights, k=rng.randint(0, 4))),
+        )
+        for i in range(count)
+    ]
+
+
+def bench(count: int) -> dict:
+    packets = synthetic_packets(count)
+    glyph = GlyphCodec(load_alphabet())
+    report = {"packets": count}
+
+    t0 = time.perf_counter()
+    enc = BinaryCodec()
+    stream = bytearray()
+    for p in packets:
+        enc.encode_into(stream, p)
+    t1 = time.perf_counter()
+    decoded = list(BinaryCodec().iter_decode(stream))
+    t2 = time.perf_counter()
+    assert decoded == packets, "binary round trip mismatch"
+    report["binary"] = {
+        "encode_pps": round(count / (t1 - t0)),
+        "decode_pps": round(count / (t2 - t1)),
+        "bytes_per_packet": round(len(stream) / count, 2),
+    }
+
+    t0 = time.perf_counter()
+    lines = [glyph.encode(p) for p in packets]
+    t1 = time.perf_counter()
+    back = [glyph.decode(line) for line in lines]
+    t2 = time.perf_counter()
+    assert back == packets, "glyph round trip mismatch"
+    report["glyph"] = {
+        "encode_pps": round(count / (t1 - t0)),
+        "decode_pps": round(count / (t2 - t1)),
+        "bytes_per_packet": round(sum(len(line.encode("utf-8")) + 1 for line in lines) / count, 2),
+    }
+
+    as_json = [json.dumps([p.verb, p.seq, p.source, p.target, list(p.symbols)]) for p in packets]
+    report["json_bytes_per_packet"] = round(sum(len(s) + 1 for s in as_json) / count, 2)
+    return report
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Spell packet codecs (binary + cuneiform glyph form).")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("show", help="Print one packet in both wire forms.")
+    p.add_argument("verb", choices=VERBS)
+    p.add_argument("source")
+    p.add_argument("target")
+    p.add_argument("--seq", type=int, default=0)
+    p.add_argument("--symbols", nargs="*", default=[])
+
+    p = sub.add_parser("bench", help="Packets per second for both forms.")
+    p.add_argument("--count", type=int, default=100_000)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    if args.command == "show":
+        packet = SpellPacket(args.verb, args.source, args.target, args.seq, tuple(args.symbols))
+        print("glyph :", GlyphCodec(load_alphabet()).encode(packet))
+        print("binary:", BinaryCodec().encode(packet).hex(" "))
+        return
+    print(json.dumps(bench(args.count), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""Phase D spell relay: agents as asyncio coroutines passing spell packets.
+
+Every agent owns a bounded ``asyncio.Queue`` inbox and one task that pulls a
+packet, awaits its handler and routes whatever the handler returns.  Routing is
+decided by the packet verb (``ROUTES``):
+
+* ``direct``    — to the agent named by ``target``;
+* ``broadcast`` — fan out to every member of the group named by ``target``;
+* ``balance``   — to one member of the group (round robin), used by ``handoff``;
+* ``sink``      — ``seal`` ends the chain and records its end-to-end latency.
+
+Full inboxes apply backpressure, except on ``handoff``: a handoff waits at most
+``handoff_timeout`` seconds for room and is dropped (and counted) otherwise.
+The whole run can be bounded with a deadline; agent tasks are cancelled on
+shutdown either way.
+
+On the wire, packets are glyph lines (``spell_packet.GlyphCodec``, i.e. the A–Z
+cuneiform alphabet from ``az_cuneiform_selection.json``): encoded once per send,
+decoded by each receiver.  ``--wire object`` passes the dataclasses instead, to
+measure the codec's share of the cost.
+
+``LocalAgent`` is a deterministic stand-in for a real agent: stage 0 fans out
+with ``bind``, later stages ``handoff`` along the pipeline, the last one
+``seal``s; ``--drift`` makes it occasionally swap a symbol.
+
+Usage:
+  python miohalo-alpha/scripts/spell_relay.py simulate --agents 4000 --stages 4 --fanout 4 --packets 20000
+  python miohalo-alpha/scripts/spell_relay.py simulate --agents 200 --queue 2 --handoff-timeout 0.001 --delay-ms 1
+  python miohalo-alpha/scripts/spell_relay.py simulate --packets 5000 --drift 0.05 --log data/out/relay.log
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Awaitable, Callable, Iterable, TextIO
+
+from spell_packet import GlyphCodec, SpellPacket, load_alphabet
+
+ROUTES = {
+    "invoke": "direct",
+    "bind": "broadcast",
+    "transform": "direct",
+    "handoff": "balance",
+    "seal": "sink",
+}
+
+QUEUE_SIZE = 64
+HANDOFF_TIMEOUT = 0.5
+
+Handler = Callable[[SpellPacket], Awaitable[Iterable[SpellPacket]]]
+
+
+class LatencyStats:
+    """Raw samples in a float array; percentiles are computed once, at report time."""
+
+    def __init__(self) -> None:
+        self.samples = array("d")
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def summary(self) -> dict:
+        n = len(self.samples)
+        if not n:
+            return {"count": 0}
+        s = sorted(self.samples)
+        ms = lambda q: round(s[min(n - 1, int(q * n))] * 1000, 3)  # noqa: E731
+        return {
+            "count": n,
+            "mean_ms": round(sum(s) / n * 1000, 3),
+            "p50_ms": ms(0.50),
+            "p95_ms": ms(0.95),
+            "p99_ms": ms(0.99),
+            "max_ms": round(s[-1] * 1000, 3),
+        }
+
+
+class RelayStats:
+    def __init__(self) -> None:
+        self.hops: dict[int, LatencyStats] = {}
+        self.end_to_end = LatencyStats()
+        self.depths = array("I")                       # inbox depth seen by every delivery
+        self.max_depth: dict[str, int] = {}
+        self.sent = self.delivered = self.sealed = 0
+        self.timeouts = self.unroutable = self.errors = 0
+
+    def hop(self, index: int) -> LatencyStats:
+        stats = self.hops.get(index)
+        if stats is None:
+            stats = self.hops[index] = LatencyStats()
+        return stats
+
+    def report(self, elapsed: float) -> dict:
+        depths = sorted(self.depths)
+        n = len(depths)
+        hottest = sorted(self.max_depth.items(), key=lambda kv: (-kv[1], kv[0]))[:5]
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "sent": self.sent,
+            "delivered": self.delivered,
+            "sealed": self.sealed,
+            "deliveries_per_s": round(self.delivered / elapsed) if elapsed else 0,
+            "handoff_timeouts": self.timeouts,
+            "unroutable": self.unroutable,
+            "handler_errors": self.errors,
+            "hop_latency": {str(h): self.hops[h].summary() for h in sorted(self.hops)},
+            "end_to_end": self.end_to_end.summary(),
+            "queue_depth": {
+                "mean": round(sum(depths) / n, 2) if n else 0,
+                "p99": depths[min(n - 1, int(0.99 * n))] if n else 0,
+                "max": depths[-1] if n else 0,
+                "hottest": dict(hottest),
+            },
+        }
+
+
+class Agent:
+    __slots__ = ("name", "handler", "inbox", "task")
+
+    def __init__(self, name: str, handler: Handler, queue_size: int) -> None:
+        self.name = name
+        self.handler = handler
+        self.inbox: asyncio.Queue = asyncio.Queue(queue_size)
+        self.task: asyncio.Task | None = None
+
+
+class Relay:
+    """Owns the agents, their inboxes and the routing table.
+
+    Queue items are ``(sent_at, origin_at, hop, payload)`` tuples; ``payload`` is
+    a glyph line for ``wire="glyph"``, else the ``SpellPacket`` itself.  The codec
+    is also used for ``log`` and may be None only for an unlogged object wire.
+    """
+
+    def __init__(
+        self,
+        codec: GlyphCodec | None,
+        wire: str = "glyph",
+        queue_size: int = QUEUE_SIZE,
+        handoff_timeout: float = HANDOFF_TIMEOUT,
+        routes: dict[str, str] = ROUTES,
+        log: TextIO | None = None,
+    ) -> None:
+        if codec is None and (wire == "glyph" or log is not None):
+            raise ValueError("a glyph wire or log needs a codec")
+        self.codec = codec
+        self.glyph_wire = wire == "glyph"
+        self.queue_size = queue_size
+        self.handoff_timeout = handoff_timeout
+        self.routes = routes
+        self.log = log
+        self.agents: dict[str, Agent] = {}
+        self.groups: dict[str, list[Agent]] = {}
+        self._cursor: dict[str, int] = {}
+        self.stats = RelayStats()
+        self._outstanding = 0
+        self._idle: asyncio.Event | None = None
+
+    def add_agent(self, name: str, handler: Handler, group: str | None = None) -> Agent:
+        if name in self.agents:
+            raise ValueError(f"duplicate agent {name!r}")
+        agent = self.agents[name] = Agent(name, handler, self.queue_size)
+        if group is not None:
+            self.groups.setdefault(group, []).append(agent)
+            self._cursor.setdefault(group, 0)
+        return agent
+
+    # ——— routing ———
+
+    def _targets(self, packet: SpellPacket) -> list[Agent]:
+        mode = self.routes[packet.verb]
+        if mode == "direct":
+            agent = self.agents.get(packet.target)
+            return [agent] if agent else []
+        members = self.groups.get(packet.target)
+        if not members:
+            agent = self.agents.get(packet.target)  # a single agent is a group of one
+            return [agent] if agent else []
+        if mode == "broadcast":
+            return members
+        i = self._cursor[packet.target]
+        self._cursor[packet.target] = i + 1
+        return [members[i % len(members)]]
+
+    async def send(self, packet: SpellPacket, origin: float | None = None, hop: int = 0) -> None:
+        stats = self.stats
+        stats.sent += 1
+        line = self.codec.encode(packet) if self.glyph_wire or self.log is not None else None
+        if self.log is not None:
+            self.log.write(line + "\n")
+        payload = line if self.glyph_wire else packet
+        now = time.perf_counter()
+        if origin is None:
+            origin = now
+
+        if self.routes[packet.verb] == "sink":
+            stats.sealed += 1
+            stats.end_to_end.add(now - origin)
+            return
+
+        targets = self._targets(packet)
+        if not targets:
+            stats.unroutable += 1
+            return
+        item = (now, origin, hop, payload)
+        handoff = packet.verb == "handoff"
+        for agent in targets:
+            inbox = agent.inbox
+            try:
+                inbox.put_nowait(item)
+            except asyncio.QueueFull:
+                if handoff:
+                    try:
+                        await asyncio.wait_for(inbox.put(item), self.handoff_timeout)
+                    except asyncio.TimeoutError:
+                        stats.timeouts += 1
+                        continue
+                else:
+                    await inbox.put(item)
+            self._outstanding += 1
+            depth = inbox.qsize()
+            stats.depths.append(depth)
+            if depth > stats.max_depth.get(agent.name, 0):
+                stats.max_depth[agent.name] = depth
+
+    async def _run_agent(self, agent: Agent) -> None:
+        inbox, stats, decode = agent.inbox, self.stats, self.codec.decode if self.glyph_wire else None
+        while True:
+            sent_at, origin, hop, payload = await inbox.get()
+            stats.hop(hop).add(time.perf_counter() - sent_at)
+            stats.delivered += 1
+            try:
+                packet = decode(payload) if decode else payload
+                for out in await agent.handler(packet):
+                    await self.send(out, origin, hop + 1)
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # a broken agent must not take the relay down
+                stats.errors += 1
+            finally:
+                self._outstanding -= 1
+                if not self._outstanding:
+                    self._idle.set()
+
+    # ——— lifecycle ———
+
+    def start(self) -> None:
+        self._idle = asyncio.Event()
+        for agent in self.agents.values():
+            agent.task = asyncio.create_task(self._run_agent(agent), name=agent.name)
+
+    async def drain(self) -> None:
+        """Wait until no packet is queued or being handled."""
+        if self._outstanding:
+            self._idle.clear()
+            await self._idle.wait()
+
+    async def stop(self) -> int:
+        """Cancel every agent task; returns how many packets were still in flight."""
+        tasks = [a.task for a in self.agents.values() if a.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return self._outstanding
+
+
+# ——— stand-in agent + simulation ———
+
+class LocalAgent:
+    """Deterministic stand-in for a remote agent (no I/O unless ``delay`` is set)."""
+
+    def __init__(self, name: str, next_group: str | None, vocabulary: list[str],
+                 drift: float = 0.0, delay: float = 0.0, seed: int | str = 0) -> None:
+        self.name = name
+        self.next_group = next_group
+        self.vocabulary = vocabulary
+        self.drift = drift
+        self.delay = delay
+        self.rng = random.Random(seed)
+
+    async def __call__(self, packet: SpellPacket) -> tuple[SpellPacket, ...]:
+        if self.delay:
+            await asyncio.sleep(self.rng.expovariate(1 / self.delay))  # bursty service times
+        symbols = packet.symbols
+        if self.drift and symbols and self.rng.random() < self.drift:
+            i = self.rng.randrange(len(symbols))
+            symbols = symbols[:i] + (self.rng.choice(self.vocabulary),) + symbols[i + 1:]
+        if self.next_group is None:
+            return (SpellPacket("seal", self.name, "SINK", packet.seq, symbols),)
+        verb = "bind" if packet.verb == "invoke" else "handoff"
+        return (SpellPacket(verb, self.name, self.next_group, packet.seq, symbols),)
+
+
+def build_pipelines(relay: Relay, agents: int, stages: int, fanout: int, vocabulary: list[str],
+                    drift: float, delay: float, seed: int) -> list[str]:
+    """Chains of ``stages`` groups of ``fanout`` agents; returns the stage-0 agent names."""
+    chains = max(1, agents // (stages * fanout))
+    entry = []
+    for c in range(chains):
+        for s in range(stages):
+            group = f"S{s}-C{c}"
+            next_group = f"S{s + 1}-C{c}" if s + 1 < stages else None
+            for m in range(fanout):
+                name = f"{group}-A{m}"
+                handler = LocalAgent(name, next_group, vocabulary, drift, delay, seed=f"{seed}:{name}")
+                relay.add_agent(name, handler, group=group)
+                if s == 0:
+                    entry.append(name)
+    return entry
+
+
+def make_vocabulary(size: int, rng: random.Random) -> list[str]:
+    return ["".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(rng.randint(3, 8)))
+            for _ in range(size)]
+
+
+async def simulate(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    codec = GlyphCodec(load_alphabet()) if args.wire == "glyph" or args.log else None
+    log = args.log.open("w", encoding="utf-8") if args.log else None
+
+    relay = Relay(codec, args.wire, args.queue, args.handoff_timeout, log=log)
+    vocabulary = make_vocabulary(args.vocabulary, rng)
+    weights = [1 / (i + 1) for i in range(len(vocabulary))]
+    entry = build_pipelines(relay, args.agents, args.stages, args.fanout, vocabulary,
+                            args.drift, args.delay_ms / 1000, args.seed)
+    relay.start()
+
+    async def drive() -> None:
+        for seq in range(args.packets):
+            symbols = tuple(rng.choices(vocabulary, weights, k=rng.randint(1, 4)))
+            await relay.send(SpellPacket("invoke", "DRIVER", entry[seq % len(entry)], seq, symbols))
+            if seq % args.burst == args.burst - 1:
+                await asyncio.sleep(0)  # let the agents run between bursts
+        await relay.drain()
+
+    t0 = time.perf_counter()
+    try:
+        await asyncio.wait_for(drive(), args.deadline)
+        drained = True
+    except asyncio.TimeoutError:
+        drained = False
+    finally:
+        in_flight = await relay.stop()
+        if log is not None:
+            log.close()
+    elapsed = time.perf_counter() - t0
+
+    report = {
+        "agents": len(relay.agents),
+        "stages": args.stages,
+        "fanout": args.fanout,
+        "wire": args.wire,
+        "injected": args.packets,
+        "drained": drained,
+        "cancelled_in_flight": in_flight,
+    }
+    report.update(relay.stats.report(elapsed))
+    return report
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Asyncio spell relay runtime (Phase D).")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("simulate", help="Run stand-in agents in fan-out pipelines and report stats.")
+    p.add_argument("--agents", type=int, default=1000, help="Approximate agent count.")
+    p.add_argument("--stages", type=int, default=4, help="Pipeline length.")
+    p.add_argument("--fanout", type=int, default=4, help="Agents per stage group (bind fans out to all).")
+    p.add_argument("--packets", type=int, default=10_000, help="invoke packets to inject.")
+    p.add_argument("--burst", type=int, default=64, help="Packets injected between yields to the loop.")
+    p.add_argument("--queue", type=int, default=QUEUE_SIZE, help="Inbox capacity per agent.")
+    p.add_argument("--handoff-timeout", type=float, default=HANDOFF_TIMEOUT, help="Seconds.")
+    p.add_argument("--deadline", type=float, default=None, help="Cancel the run after N seconds.")
+    p.add_argument("--delay-ms", type=float, default=0.0, help="Mean simulated per-packet work.")
+    p.add_argument("--drift", type=float, default=0.0, help="Chance an agent swaps one symbol.")
+    p.add_argument("--vocabulary", type=int, default=256)
+    p.add_argument("--wire", choices=("glyph", "object"), default="glyph")
+    p.add_argument("--log", type=Path, help="Write every sent packet as a glyph line.")
+    p.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.stages < 1 or args.fanout < 1:
+        raise SystemExit("--stages and --fanout must be >= 1")
+    report = asyncio.run(simulate(args))
+    print(json.dumps(report, indent=2))
+    return 0 if report["drained"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
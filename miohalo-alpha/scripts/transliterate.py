@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""Streaming Latin ↔ cuneiform transliteration with the A–Z selection.
+
+``Alphabet`` compiles ``az_cuneiform_selection.json`` once into ``str.translate``
+tables (A–Z and a–z fold onto the same sign; the reverse table yields upper
+case) plus a precompiled "unmapped character" pattern, so every chunk is one C
+pass for translation and one for validation.  Streams are read in fixed-size
+text chunks through Python's incremental UTF-8 decoder, so memory stays bounded
+and a 4-byte cuneiform sign split across a read boundary is never mangled.
+
+Characters that are neither letters of the alphabet nor in the passthrough set
+(whitespace, digits, ASCII punctuation by default) raise ``UnmappedCharacter``
+with their absolute offset, before anything past that chunk is written.
+Invalid UTF-8 raises ``InvalidUtf8`` with its absolute byte offset.  ``-o`` is
+written to ``<output>.tmp`` and only renamed over the target on success.
+
+Usage:
+  python miohalo-alpha/scripts/transliterate.py encode -i transcript.txt -o transcript.cun
+  echo "HELLO WORLD" | python miohalo-alpha/scripts/transliterate.py encode
+  python miohalo-alpha/scripts/transliterate.py decode -i transcript.cun
+  python miohalo-alpha/scripts/transliterate.py bench --mb 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import codecs
+import io
+import json
+import random
+import re
+import string
+import sys
+import time
+from pathlib import Path
+from typing import BinaryIO, TextIO
+
+import paths
+
+CHUNK_CHARS = 1 << 16
+DEFAULT_PASSTHROUGH = string.whitespace + string.digits + string.punctuation
+_POISON = "\uffff"  # noncharacter: never a passthrough, so it always fails validation
+
+
+class UnmappedCharacter(ValueError):
+    def __init__(self, char: str, offset: int) -> None:
+        super().__init__(f"unmapped character {char!r} (U+{ord(char):04X}) at offset {offset}")
+        self.char = char
+        self.offset = offset
+
+
+class InvalidUtf8(ValueError):
+    def __init__(self, offset: int, reason: str) -> None:
+        super().__init__(f"invalid UTF-8 at byte {offset} ({reason})")
+        self.offset = offset
+
+
+class Utf8Reader:
+    """``read()`` over a binary stream through the incremental UTF-8 decoder, counting bytes.
+
+    Unlike ``TextIOWrapper``, whose ``UnicodeDecodeError`` positions are relative
+    to its internal buffer, a bad byte raises ``InvalidUtf8`` at its offset in
+    the whole stream.  ``read(n)`` reads ``n`` bytes, so returns at most ``n``
+    characters, and ``""`` only at the end.
+    """
+
+    def __init__(self, raw: BinaryIO) -> None:
+        self.raw = raw
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.fed = 0        # bytes handed to the decoder so far
+
+    def read(self, size: int) -> str:
+        while True:
+            data = self.raw.read(size)
+            pending = len(self.decoder.getstate()[0])   # bytes of a character split by the last read
+            try:
+                text = self.decoder.decode(data, final=not data)
+            except UnicodeDecodeError as e:
+                raise InvalidUtf8(self.fed - pending + e.start, e.reason) from None
+            self.fed += len(data)
+            if text or not data:
+                return text
+
+    def close(self) -> None:
+        self.raw.close()
+
+
+class Alphabet:
+    """Compiled forward/reverse tables for one A–Z selection."""
+
+    def __init__(self, letters: dict[str, str], passthrough: str = DEFAULT_PASSTHROUGH) -> None:
+        if sorted(letters) != list(string.ascii_uppercase):
+            raise ValueError("alphabet must map exactly A-Z")
+        glyphs = list(letters.values())
+        if len(set(glyphs)) != 26 or any(len(g) != 1 for g in glyphs):
+            raise ValueError("alphabet needs 26 distinct single-codepoint signs")
+        overlap = set(glyphs) & set(passthrough)
+        if overlap:
+            raise ValueError(f"signs collide with passthrough characters: {''.join(overlap)!r}")
+
+        self.letters = dict(letters)
+        self.reverse = {g: l for l, g in letters.items()}
+
+        # Tables are flat lists indexed by code point (identity by default): ``str.translate``
+        # indexes a list faster than it hashes into a dict.  Code points past the end raise
+        # IndexError, which translate treats as "leave unchanged".
+        fwd = [chr(i) for i in range(128)]
+        for l, g in letters.items():
+            fwd[ord(l)] = fwd[ord(l.lower())] = g
+        self.forward_table = fwd
+
+        rev = [chr(i) for i in range(max(map(ord, glyphs)) + 1)]
+        for l in string.ascii_letters:
+            rev[ord(l)] = _POISON  # raw Latin inside cuneiform text is an error, caught below
+        for g, l in self.reverse.items():
+            rev[ord(g)] = l
+        self.reverse_table = rev
+
+        keep = re.escape(passthrough)
+        self._unmapped_latin = re.compile(f"[^A-Za-z{keep}]")
+        # Both directions map one code point to one code point, so the decoded text can be
+        # validated instead of the input: an ASCII-range class is far cheaper to scan than
+        # a class of astral signs.
+        self._unmapped_decoded = re.compile(f"[^A-Z{keep}]")
+
+    @classmethod
+    def from_selection(cls, path: Path = paths.AZ_SELECTION_JSON, **kwargs) -> "Alphabet":
+        rows = json.loads(path.read_text(encoding="utf-8"))
+        letters = {r["letter"]: r["char"] for r in rows if r.get("status") == "selected" and r.get("char")}
+        return cls(letters, **kwargs)
+
+    def encode(self, text: str, offset: int = 0) -> str:
+        bad = self._unmapped_latin.search(text)
+        if bad:
+            raise UnmappedCharacter(bad.group(), offset + bad.start())
+        return text.translate(self.forward_table)
+
+    def decode(self, text: str, offset: int = 0) -> str:
+        out = text.translate(self.reverse_table)
+        bad = self._unmapped_decoded.search(out)
+        if bad:
+            raise UnmappedCharacter(text[bad.start()], offset + bad.start())
+        return out
+
+
+def transliterate_stream(src: TextIO, dst: TextIO, convert, chunk_chars: int = CHUNK_CHARS) -> tuple[int, int]:
+    """Apply ``convert(text, offset)`` chunk by chunk; returns (chars in, chars out)."""
+    n_in = n_out = 0
+    while True:
+        chunk = src.read(chunk_chars)
+        if not chunk:
+            return n_in, n_out
+        out = convert(chunk, n_in)
+        dst.write(out)
+        n_in += len(chunk)
+        n_out += len(out)
+
+
+def open_in(path: Path | None) -> Utf8Reader:
+    return Utf8Reader(sys.stdin.buffer if path is None else path.open("rb"))
+
+
+def _open_out(path: Path | None) -> TextIO:
+    if path is None:
+        return io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="", write_through=False)
+    return path.open("w", encoding="utf-8", newline="")
+
+
+def bench(alphabet: Alphabet, megabytes: float) -> dict:
+    rng = random.Random(11)
+    words = ["".join(rng.choice(string.ascii_letters) for _ in range(rng.randint(2, 10))) for _ in range(2000)]
+    block = " ".join(rng.choice(words) + rng.choice(("", "", ",", ".")) for _ in range(20000)) + "\n"
+    reps = max(1, int(megabytes * 1e6 / len(block)))
+    latin = block * reps
+    latin_mb = len(latin.encode("utf-8")) / 1e6
+
+    src, dst = io.StringIO(latin), io.StringIO()
+    t0 = time.perf_counter()
+    transliterate_stream(src, dst, alphabet.encode)
+    t1 = time.perf_counter()
+    glyphs = dst.getvalue()
+    glyph_mb = len(glyphs.encode("utf-8")) / 1e6
+
+    src, dst = io.StringIO(glyphs), io.StringIO()
+    t2 = time.perf_counter()
+    transliterate_stream(src, dst, alphabet.decode)
+    t3 = time.perf_counter()
+    assert dst.getvalue() == latin.upper(), "round trip mismatch"
+
+    return {
+        "latin_mb": round(latin_mb, 2),
+        "glyph_mb": round(glyph_mb, 2),
+        "encode_mb_per_s": round(latin_mb / (t1 - t0), 1),
+        "decode_mb_per_s": round(glyph_mb / (t3 - t2), 1),
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Latin <-> cuneiform A-Z transliteration.")
+    parser.add_argument("--selection", type=Path, default=paths.AZ_SELECTION_JSON)
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("encode", "decode"):
+        p = sub.add_parser(name, help=f"{name.title()} a file or stdin.")
+        p.add_argument("-i", "--input", type=Path, help="Input file (default stdin).")
+        p.add_argument("-o", "--output", type=Path, help="Output file (default stdout).")
+        p.add_argument("--chunk", type=int, default=CHUNK_CHARS, help="Characters per read.")
+    p = sub.add_parser("bench", help="Measure MB/s in both directions.")
+    p.add_argument("--mb", type=float, default=16.0, help="Size of the synthetic Latin corpus.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    alphabet = Alphabet.from_selection(args.selection)
+    if args.command == "bench":
+        print(json.dumps(bench(alphabet, args.mb), indent=2))
+        return 0
+
+    convert = alphabet.encode if args.command == "encode" else alphabet.decode
+    if args.input is not None and not args.input.is_file():
+        raise SystemExit(f"No input at {args.input}")
+    src = open_in(args.input)
+    try:
+        if args.output is None:
+            dst = _open_out(None)
+            try:
+                transliterate_stream(src, dst, convert, args.chunk)
+            finally:
+                dst.flush()
+        else:
+            # Written next to the target and renamed only once the whole input converted,
+            # so a bad input never truncates an existing output (or itself, with -i x -o x).
+            tmp = args.output.with_name(args.output.name + ".tmp")
+            try:
+                with _open_out(tmp) as dst:
+                    transliterate_stream(src, dst, convert, args.chunk)
+                tmp.replace(args.output)
+            finally:
+                tmp.unlink(missing_ok=True)
+    except (UnmappedCharacter, InvalidUtf8) as e:
+        print(f"[error] {e}", file=sys.stderr)
+        return 1
+    finally:
+        if args.input is not None:
+            src.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
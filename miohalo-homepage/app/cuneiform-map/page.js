@@ -1,7 +1,42 @@
+import { readFileSync } from 'node:fs';
+import path from 'node:path';
 import mapping from '../../data/az_cuneiform_selection';
 
 const seedLetters = ['A', 'E', 'I', 'U', 'X'];
 
+// The sprite atlas map only exists once glyph_atlas.py had a cuneiform font to render
+// with, so it is read at build time instead of imported; without it every sign is text.
+function loadAtlas() {
+  try {
+    return JSON.parse(readFileSync(path.join(process.cwd(), 'data', 'az_cuneiform_atlas.json'), 'utf8'));
+  } catch {
+    return null;
+  }
+}
+
+const atlas = loadAtlas();
+
+// Signs come from one pre-rendered sprite atlas (miohalo-alpha/scripts/glyph_atlas.py),
+// so no cuneiform font is needed. Letters without a sprite, or whose sprite no longer
+// matches the selection, fall back to text.
+function Glyph({ item, className = '' }) {
+  const sprite = atlas?.glyphs?.[item.letter];
+  if (!item.char || !atlas?.image || !sprite || sprite.char !== item.char) {
+    return <span className={className}>{item.char || '-'}</span>;
+  }
+  const s = atlas.scale;
+  const mask = `url(${atlas.image}) ${-sprite.x / s}px ${-sprite.y / s}px / ${atlas.width / s}px ${atlas.height / s}px no-repeat`;
+  return (
+    <span
+      className={`${className} glyphSprite`.trim()}
+      role="img"
+      aria-label={item.char}
+      title={item.codepoint}
+      style={{ width: sprite.w / s, height: sprite.h / s, mask, WebkitMask: mask }}
+    />
+  );
+}
+
 export default function CuneiformMapPage() {
   const rows = mapping;
   const selected = rows.filter((item) => item.status === 'selected');
@@ -21,7 +56,7 @@ export default function CuneiformMapPage() {
             .filter((item) => seedSet.has(item.letter))
             .map((item) => (
               <div key={item.letter} className="glyphItem">
-                <span className="glyphSymbol">{item.char}</span>
+                <Glyph item={item} className="glyphSymbol" />
                 <span>{item.letter}</span>
               </div>
             ))}
@@ -49,7 +84,9 @@ export default function CuneiformMapPage() {
                   <td>
                     <span className={`status ${item.status}`}>{item.status}</span>
                   </td>
-                  <td className="glyphCell">{item.char || '-'}</td>
+                  <td className="glyphCell">
+                    <Glyph item={item} />
+                  </td>
                   <td>{item.codepoint || '-'}</td>
                   <td>{item.name || '-'}</td>
                   <td>{item.reason}</td>